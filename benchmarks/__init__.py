@@ -0,0 +1,6 @@
+"""Benchmarks for outta.
+
+Run the whole suite from the repository root with:
+
+    python -m benchmarks --help
+"""
@@ -0,0 +1,170 @@
+"""Run the benchmark suite over the synthetic corpora.
+
+For each corpus and chunk size this measures the throughput of ``Parser.feed``, the peak memory
+allocated while parsing (with tracemalloc), and the latency of each call to ``feed``. Results can be
+saved as JSON and compared with those from another commit:
+
+    python -m benchmarks --output before.json
+    ... change things ...
+    python -m benchmarks --compare before.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from outta.parser import Parser
+
+from .corpora import CORPORA
+
+#: The chunk sizes to feed the corpora in. None means the whole corpus at once.
+CHUNK_SIZES = (64, 4096, 65536, None)
+
+
+def _chunks(text, chunk_size):
+    if chunk_size is None:
+        return [text]
+    return [text[index : index + chunk_size] for index in range(0, len(text), chunk_size)]
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def measure_throughput(chunks, repeat):
+    """Parse the chunks ``repeat`` times with a fresh parser each time.
+
+    Returns:
+        The best total time, and the latencies of the calls to ``feed`` in the best run, in seconds.
+    """
+    clock = time.perf_counter
+    best_total, best_latencies = None, None
+    for _ in range(repeat):
+        parser = Parser()
+        latencies = []
+        for chunk in chunks:
+            started = clock()
+            for _ in parser.feed(chunk):
+                pass
+            latencies.append(clock() - started)
+        total = sum(latencies)
+        if best_total is None or total < best_total:
+            best_total, best_latencies = total, latencies
+    return best_total, best_latencies
+
+
+def measure_memory(chunks):
+    """Parse the chunks, discarding elements as they are produced.
+
+    Returns:
+        The peak number of bytes allocated while parsing, and the number of elements produced.
+    """
+    parser = Parser()
+    count = 0
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        for chunk in chunks:
+            for _ in parser.feed(chunk):
+                count += 1
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - start, count
+
+
+def run(corpora, chunk_sizes, size, repeat):
+    "Run the benchmarks and return a list of results, one for each corpus and chunk size."
+    results = []
+    for name in corpora:
+        text = CORPORA[name](size)
+        for chunk_size in chunk_sizes:
+            chunks = _chunks(text, chunk_size)
+            total, latencies = measure_throughput(chunks, repeat)
+            peak, count = measure_memory(chunks)
+            results.append(
+                {
+                    "corpus": name,
+                    "chunk_size": chunk_size,
+                    "characters": len(text),
+                    "elements": count,
+                    "seconds": total,
+                    "mb_per_s": len(text) / total / 1e6,
+                    "peak_bytes": peak,
+                    "latency_p50_us": _percentile(latencies, 0.5) * 1e6,
+                    "latency_p99_us": _percentile(latencies, 0.99) * 1e6,
+                    "latency_max_us": max(latencies) * 1e6,
+                }
+            )
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _key(result):
+    return result["corpus"], result["chunk_size"]
+
+
+def report(results, baseline=None, output=sys.stdout):
+    "Print a table of results, with throughput relative to ``baseline`` results if given."
+    baseline = {_key(result): result for result in baseline or ()}
+    output.write(
+        f"{'corpus':<14}{'chunk':>7}{'MB/s':>9}{'peak KB':>10}{'p50 us':>10}{'p99 us':>10}{'max us':>11}"
+        + ("   vs baseline" if baseline else "")
+        + "\n"
+    )
+    for result in results:
+        line = (
+            f"{result['corpus']:<14}{str(result['chunk_size'] or 'all'):>7}{result['mb_per_s']:>9.2f}"
+            f"{result['peak_bytes'] / 1024:>10.0f}{result['latency_p50_us']:>10.0f}"
+            f"{result['latency_p99_us']:>10.0f}{result['latency_max_us']:>11.0f}"
+        )
+        previous = baseline.get(_key(result))
+        if previous is not None:
+            line += f"   {result['mb_per_s'] / previous['mb_per_s']:>8.2f}x"
+        output.write(line + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", action="append", choices=sorted(CORPORA), help="Corpora to run (default: all).")
+    parser.add_argument("--size", type=int, default=1_000_000, help="Characters in each corpus.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each benchmark; the best is kept.")
+    parser.add_argument("--output", help="Save the results as JSON to this file.")
+    parser.add_argument("--compare", help="Compare with results saved by --output.")
+    args = parser.parse_args(argv)
+
+    results = run(args.corpus or list(CORPORA), CHUNK_SIZES, args.size, args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)["results"]
+    report(results, baseline)
+
+    if args.output:
+        document = {
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": args.size,
+            "results": results,
+        }
+        with open(args.output, "w") as handle:
+            json.dump(document, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compare summarizing many small files with a process for each and with ``outta batch``.
+
+The files are small session logs, a few KB of each corpus, so starting a process costs far more
+than parsing one.
+
+Run from the repository root:
+
+    python -m benchmarks.batch
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from .corpora import CORPORA
+
+#: The number of files.
+FILES = 200
+
+#: The approximate number of characters in each file.
+FILE_SIZE = 4000
+
+
+def write_files(directory):
+    generators = list(CORPORA.values())
+    for index in range(FILES):
+        text = generators[index % len(generators)](FILE_SIZE, seed=index)
+        with open(os.path.join(directory, f"{index:05}.log"), "wb") as handle:
+            handle.write(text.encode("utf-8"))
+
+
+def _outta(*args):
+    subprocess.run([sys.executable, "-m", "outta.cli", *args], check=True, stdout=subprocess.DEVNULL)
+
+
+def process_per_file(directory):
+    for name in sorted(os.listdir(directory)):
+        _outta("stats", os.path.join(directory, name))
+
+
+def batch(directory, jobs):
+    _outta("batch", "--quiet", "--jobs", str(jobs), directory)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        write_files(directory)
+        runs = [("process per file", lambda: process_per_file(directory))]
+        for jobs in sorted({1, os.cpu_count()}):
+            runs.append((f"batch, {jobs} jobs", lambda jobs=jobs: batch(directory, jobs)))
+
+        print(f"{FILES} files of about {FILE_SIZE} characters")
+        for name, function in runs:
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            print(f"{name:<18}{elapsed:>9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
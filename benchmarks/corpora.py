@@ -0,0 +1,158 @@
+"""Deterministic generators of synthetic terminal output.
+
+Each generator takes the approximate number of characters to produce and a random seed, and always
+produces the same text for the same arguments, so results can be compared between commits.
+"""
+
+import random
+
+
+def _generate(make_piece, size, seed):
+    rng = random.Random(seed)
+    pieces = []
+    length = 0
+    while length < size:
+        piece = make_piece(rng)
+        pieces.append(piece)
+        length += len(piece)
+    return "".join(pieces)
+
+
+_WORDS = ("foo", "bar", "baz", "main", "src", "build", "README.md", "setup.py", "test_parser.py", "x")
+
+_WIDE_WORDS = ("日本語", "表示", "→", "✓ passed", "✗ failed", "▶", "█▓▒░", "Ελληνικά", "русский", "😀")
+
+
+def sgr_heavy(size=1_000_000, seed=0):
+    "Colored, cursor-moving output where most tokens are short control sequences."
+
+    def piece(rng):
+        return "".join(
+            (
+                f"\x1b[{rng.randint(1, 50)};{rng.randint(1, 120)}H",
+                f"\x1b[{rng.choice((0, 1, 4, 7))};{rng.randint(30, 37)}m",
+                rng.choice(("foo", "bar", "baz", "x", "~/src")),
+                "\x1b[0m",
+                rng.choice(("", "\x1b[K", "\x1b[38;5;208m#", "\x1b[?25h")),
+                rng.choice(("", "\r\n")),
+            )
+        )
+
+    return _generate(piece, size, seed)
+
+
+def ls_color(size=1_000_000, seed=0):
+    "The output of ``ls --color``: short colored names separated by spaces."
+
+    def piece(rng):
+        names = []
+        for _ in range(rng.randint(1, 6)):
+            name = rng.choice(_WORDS)
+            color = rng.choice((None, "01;34", "01;32", "01;36", "40;33;01"))
+            names.append(name if color is None else f"\x1b[0m\x1b[{color}m{name}\x1b[0m")
+        return "  ".join(names) + "\r\n"
+
+    return _generate(piece, size, seed)
+
+
+def vim_redraw(size=1_000_000, seed=0):
+    "Full-screen editor redraws: cursor hidden, every row positioned, highlighted and cleared."
+
+    def piece(rng):
+        rows = ["\x1b[?25l"]
+        for row in range(1, 41):
+            code = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(0, 8)))
+            rows.append(
+                f"\x1b[{row};1H\x1b[38;5;{rng.randint(0, 255)}m{row:>4} \x1b[m"
+                f"\x1b[38;5;{rng.randint(0, 255)}m{code}\x1b[m\x1b[K"
+            )
+        rows.append(f"\x1b[{rng.randint(1, 40)};{rng.randint(1, 80)}H\x1b[?25h")
+        return "".join(rows)
+
+    return _generate(piece, size, seed)
+
+
+def htop_refresh(size=1_000_000, seed=0):
+    "Process monitor refreshes: meters, colored columns and inverse-video headers."
+
+    def piece(rng):
+        rows = ["\x1b[H"]
+        for cpu in range(4):
+            used = rng.randint(0, 40)
+            rows.append(
+                f"\x1b[{cpu + 1};3H\x1b[36m{cpu}\x1b[39m\x1b[1m[\x1b[32m{'|' * used}\x1b[90m{' ' * (40 - used)}"
+                f"\x1b[39m{rng.randint(0, 100)}.{rng.randint(0, 9)}%\x1b[1m]\x1b[m"
+            )
+        rows.append("\x1b[6;1H\x1b[30;42m  PID USER      PRI  NI  VIRT   RES CPU% MEM%   TIME+  Command\x1b[K\x1b[m")
+        for row in range(7, 40):
+            rows.append(
+                f"\x1b[{row};1H\x1b[m{rng.randint(1, 99999):>5} \x1b[36muser\x1b[39m     20   0 "
+                f"\x1b[1m{rng.randint(1, 999)}M\x1b[m {rng.randint(1, 999):>4}M "
+                f"\x1b[31m{rng.randint(0, 100):>4}\x1b[m {rng.choice(_WORDS)}\x1b[K"
+            )
+        return "".join(rows)
+
+    return _generate(piece, size, seed)
+
+
+def progress_bar(size=1_000_000, seed=0):
+    "A progress bar redrawn in place with carriage returns and line erasure."
+
+    def piece(rng):
+        done = rng.randint(0, 50)
+        return (
+            f"\r\x1b[K{2 * done:>3}% [\x1b[32m{'=' * done}>\x1b[0m{' ' * (50 - done)}] "
+            f"{rng.randint(1, 999)}.{rng.randint(0, 9)}MB/s eta 0:{rng.randint(0, 59):02}"
+        )
+
+    return _generate(piece, size, seed)
+
+
+def tmux_panes(size=1_000_000, seed=0):
+    "Split-pane redraws with box-drawing borders and text which isn't Latin-1, as in most TUIs."
+
+    def piece(rng):
+        rows = ["\x1b[H\x1b[32m┌" + "─" * 38 + "┬" + "─" * 39 + "┐\x1b[m"]
+        for row in range(2, 24):
+            left = " ".join(rng.choice(_WIDE_WORDS) for _ in range(rng.randint(0, 5)))
+            right = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(0, 6)))
+            rows.append(f"\x1b[{row};1H\x1b[32m│\x1b[m{left}\x1b[{row};40H\x1b[32m│\x1b[m{right}\x1b[K")
+        title = rng.choice(_WIDE_WORDS)
+        rows.append(f"\x1b[24;1H\x1b[30;42m[0] 0:zsh* 1:vim  “{title}” 12:{rng.randint(0, 59):02}\x1b[m")
+        return "".join(rows)
+
+    return _generate(piece, size, seed)
+
+
+def osc_titles(size=1_000_000, seed=0):
+    "Shell prompts which set long window titles before every command."
+
+    def piece(rng):
+        path = "/".join(rng.choice(_WORDS) for _ in range(rng.randint(10, 200)))
+        return f"\x1b]0;user@host: ~/{path}\x07\x1b[1;32muser@host\x1b[0m:\x1b[1;34m~\x1b[0m$ ls\r\n"
+
+    return _generate(piece, size, seed)
+
+
+def plain_log(size=1_000_000, seed=0):
+    "Log output with no control sequences other than newlines."
+
+    def piece(rng):
+        message = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(3, 20)))
+        level = rng.choice(("DEBUG", "INFO", "INFO", "WARNING", "ERROR"))
+        return f"2021-06-{rng.randint(1, 30):02}T12:{rng.randint(0, 59):02}:00.000Z {level} outta.parser: {message}\n"
+
+    return _generate(piece, size, seed)
+
+
+#: All corpus generators, by name.
+CORPORA = {
+    "sgr_heavy": sgr_heavy,
+    "ls_color": ls_color,
+    "vim_redraw": vim_redraw,
+    "htop_refresh": htop_refresh,
+    "tmux_panes": tmux_panes,
+    "progress_bar": progress_bar,
+    "osc_titles": osc_titles,
+    "plain_log": plain_log,
+}
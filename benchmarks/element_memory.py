@@ -0,0 +1,45 @@
+"""Measure the memory used per element produced by Parser.feed.
+
+Run from the repository root:
+
+    python -m benchmarks.element_memory
+"""
+
+import gc
+import tracemalloc
+
+from outta.parser import Parser
+
+SAMPLES = {
+    "text": "hello world\n",
+    "sgr": "\x1b[1;31m",
+    "cursor": "\x1b[12;40H",
+    "osc": "\x1b]2;title\x07",
+}
+
+
+def bytes_per_element(text, count=100_000):
+    """The average number of bytes allocated for each element parsed from ``count`` copies of ``text``.
+
+    The input text itself is not counted.
+    """
+    data = text * count
+    parser = Parser()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        elements = list(parser.feed(data))
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - before) / len(elements)
+
+
+def main():
+    for name, text in SAMPLES.items():
+        print(f"{name:>8}: {bytes_per_element(text):6.1f} bytes/element")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Measure how long it takes to import outta's modules, and check it against a budget.
+
+Each module is imported in a fresh interpreter with ``-X importtime``, several times, and the best
+cumulative time for it is reported, along with how many times longer that is than the interpreter
+takes to start up (``python -c pass``), measured in the same run. A budget in milliseconds would
+depend on the machine, but that ratio hardly does, so the budget is a ratio. With ``--budget``, this
+exits with status 1 if any of the modules is over it, or if importing one of them imports pyte, so
+CI can enforce it:
+
+    python -m benchmarks.import_time --budget 3
+
+Bytecode is written and used as normal (even with PYTHONDONTWRITEBYTECODE set), since compiling the
+source on every run isn't what an installed package does.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+#: The modules to measure: the parser, and the CLI, which is what starts up for ``outta``.
+MODULES = ("outta.parser", "outta.cli")
+
+# A line of -X importtime output: self time and cumulative time in microseconds, and the module.
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _environment():
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def startup_time():
+    "The time, in seconds, to start a fresh interpreter and do nothing."
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], env=_environment(), check=True)
+    return time.perf_counter() - started
+
+
+def import_times(module):
+    """Import a module in a fresh interpreter.
+
+    Returns:
+        The cumulative time, in seconds, to import the module, and a dict of the same for each
+        module it imports directly.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=_environment(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Imports are listed after everything they import, with the top level ones indented by a space
+    # and those they import directly by three.
+    children = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)) / 1e6, len(match.group(3)), match.group(4)
+        if indent == 3:
+            children[name] = cumulative
+        elif indent == 1:
+            if name == module:
+                return cumulative, children
+            children = {}
+    raise RuntimeError(f"no import time for {module}")
+
+
+def imports_pyte(module):
+    "Whether importing a module imports pyte."
+    completed = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print('pyte' in sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout.strip() == "True"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.import_time", description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Imports of each module; the best is kept.")
+    parser.add_argument(
+        "--budget", type=float, help="The most any module may take to import, as a multiple of the startup time."
+    )
+    args = parser.parse_args(argv)
+
+    # The first run writes the bytecode.
+    import_times(MODULES[0])
+    startup = min(startup_time() for _ in range(args.repeat))
+    print(f"startup {startup * 1e3:.1f}ms")
+
+    failed = False
+    print(f"{'module':<16}{'import':>10}{'ratio':>8}  slowest dependencies")
+    for module in MODULES:
+        cumulative, children = min((import_times(module) for _ in range(args.repeat)), key=lambda run: run[0])
+        ratio = cumulative / startup
+        slowest = sorted(children.items(), key=lambda item: -item[1])[:3]
+        print(
+            f"{module:<16}{cumulative * 1e3:>8.1f}ms{ratio:>7.1f}x  "
+            + ", ".join(f"{name} {child * 1e3:.1f}" for name, child in slowest)
+        )
+
+        if args.budget is not None and ratio > args.budget:
+            print(f"  over the budget of {args.budget:.1f}x the startup time")
+            failed = True
+        if imports_pyte(module):
+            print("  imports pyte")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
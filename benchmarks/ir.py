@@ -0,0 +1,46 @@
+"""Compare parsing each corpus with loading its elements from the IR format, and their sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.ir
+
+It fails if the IR of any corpus is larger than the corpus itself.
+"""
+
+import io
+import timeit
+
+from outta import ir
+from outta.parser import Parser
+
+from .corpora import CORPORA
+
+
+def measure(function, repeat=3):
+    "Best time, in seconds, to call ``function`` and consume the elements it returns."
+    return min(timeit.repeat(lambda: list(function()), number=1, repeat=repeat))
+
+
+def main():
+    print(f"{'corpus':<16}{'input':>10}{'IR':>10}{'ratio':>8}{'parse':>10}{'load':>10}{'speedup':>10}")
+    too_large = []
+    for name, make in CORPORA.items():
+        data = make().encode("utf-8")
+        stream = io.BytesIO()
+        ir.dump(Parser().feed_bytes(data), stream)
+        encoded = stream.getvalue()
+        parsed = measure(lambda: Parser().feed_bytes(data))
+        loaded = measure(lambda: ir.loads(encoded))
+        ratio = len(encoded) / len(data)
+        print(
+            f"{name:<16}{len(data):>10}{len(encoded):>10}{ratio:>8.2f}"
+            f"{parsed:>9.3f}s{loaded:>9.3f}s{parsed / loaded:>9.1f}x"
+        )
+        if ratio > 1:
+            too_large.append(name)
+    if too_large:
+        raise SystemExit(f"The IR is larger than the input for: {', '.join(too_large)}")
+
+
+if __name__ == "__main__":
+    main()
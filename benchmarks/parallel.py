@@ -0,0 +1,93 @@
+"""Compare parsing a file serially and with outta.parallel, and what each part costs to send back.
+
+For each corpus, a file is parsed with ``Parser.feed_bytes`` a chunk at a time, and with
+``parallel.parse_file`` using one worker per CPU, discarding the elements as they're produced. The time
+for each is reported, and then the peak memory allocated in this process, which is measured in a
+separate run since tracing allocations slows everything down. Then one part is parsed, and the
+time to pickle and unpickle it as a list of elements and as the ``columnar.Table`` the workers send is
+reported.
+
+Run from the repository root:
+
+    python -m benchmarks.parallel
+"""
+
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+
+from outta import parallel
+from outta.parser import Parser
+
+from .corpora import CORPORA
+
+#: The size of each file, in characters.
+FILE_SIZE = 4_000_000
+
+#: The size of the chunks for the serial parse, in bytes.
+CHUNK_SIZE = 64 * 1024
+
+
+def serial(filename):
+    parser = Parser()
+    with open(filename, "rb") as handle:
+        while True:
+            chunk = handle.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            for _ in parser.feed_bytes(chunk):
+                pass
+
+
+def in_parallel(filename):
+    for _ in parallel.parse_file(filename):
+        pass
+
+
+def measure(function, *args):
+    "The time taken, and the peak memory allocated in this process, in bytes."
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def round_trip(value):
+    "The time to pickle and unpickle a value, and the size of the pickle in bytes."
+    start = time.perf_counter()
+    pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    pickle.loads(pickled)
+    return time.perf_counter() - start, len(pickled)
+
+
+def main():
+    print(f"{os.cpu_count()} CPUs, {FILE_SIZE / 1e6:.0f}M characters per file, parts of {parallel.PART_SIZE} bytes")
+    print(f"{'corpus':<16}{'serial':>18}{'parallel':>18}{'pickle elements':>22}{'pickle table':>22}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, make in CORPORA.items():
+            filename = os.path.join(directory, name)
+            with open(filename, "wb") as handle:
+                handle.write(make(FILE_SIZE).encode("utf-8"))
+
+            results = [measure(function, filename) for function in (serial, in_parallel)]
+            table, text, _, _ = parallel._parse_file_range(filename, 0, parallel.PART_SIZE)
+            part = list(table.elements(text))
+            round_trips = [round_trip(part), round_trip((table, text))]
+            print(
+                f"{name:<16}"
+                + "".join(f"{elapsed:>8.2f}s {peak / 1e6:>6.1f} MB" for elapsed, peak in results)
+                + "".join(f"{elapsed:>11.3f}s {size / 1e6:>6.1f} MB" for elapsed, size in round_trips)
+            )
+
+
+if __name__ == "__main__":
+    main()
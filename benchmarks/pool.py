@@ -0,0 +1,62 @@
+"""Compare the memory and time of many idle sessions as separate Parsers and in a ParserPool.
+
+Each session is fed a short burst (a prompt, some colored output and half of a sequence), so it
+ends up idle part way through a sequence, as a real session often is.
+
+Run from the repository root:
+
+    python -m benchmarks.pool
+"""
+
+import time
+import tracemalloc
+
+from outta.parser import Parser
+from outta.pool import ParserPool
+
+#: The number of sessions.
+SESSIONS = 10000
+
+#: What each session is fed.
+BURST = ("user@host:~$ ls\r\n", "\x1b[01;34mdir\x1b[0m  file\r\n", "\x1b[01;32m")
+
+
+def separate_parsers():
+    parsers = {}
+    for session in range(SESSIONS):
+        parser = parsers[session] = Parser()
+        for chunk in BURST:
+            list(parser.feed(chunk))
+    return parsers
+
+
+def pool():
+    pool = ParserPool()
+    for session in range(SESSIONS):
+        for chunk in BURST:
+            pool.feed(session, chunk)
+    return pool
+
+
+def measure(function):
+    "The time taken, and the memory held afterwards per session in bytes."
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, held / SESSIONS
+
+
+def main():
+    print(f"{SESSIONS} sessions")
+    print(f"{'':<18}{'time':>10}{'per session':>14}")
+    for name, function in (("separate parsers", separate_parsers), ("ParserPool", pool)):
+        elapsed, per_session = measure(function)
+        print(f"{name:<18}{elapsed:>9.3f}s{per_session:>12.0f} B")
+
+
+if __name__ == "__main__":
+    main()
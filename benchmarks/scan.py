@@ -0,0 +1,60 @@
+"""Compare outta.scan.Scanner with Parser.feed over each corpus, fed in large buffers.
+
+Run from the repository root:
+
+    python -m benchmarks.scan
+
+The Scanner is measured with and without NumPy (if it's installed) to index the control characters.
+"""
+
+import timeit
+
+from outta.parser import Parser
+from outta.scan import HAVE_NUMPY, Scanner
+
+from .corpora import CORPORA
+
+#: The size of the buffers fed, in characters.
+BUFFER_SIZE = 1024 * 1024
+
+
+def _chunks(text):
+    return [text[index : index + BUFFER_SIZE] for index in range(0, len(text), BUFFER_SIZE)]
+
+
+def parse(chunks):
+    parser = Parser()
+    for chunk in chunks:
+        for _ in parser.feed(chunk):
+            pass
+
+
+def scan(chunks, use_numpy):
+    scanner = Scanner(use_numpy=use_numpy)
+    for chunk in chunks:
+        for _ in scanner.feed(chunk):
+            pass
+
+
+def measure(function, *args, repeat=5):
+    "Best time, in seconds, to call ``function``."
+    return min(timeit.repeat(lambda: function(*args), number=1, repeat=repeat))
+
+
+def main():
+    engines = [("regex index", False)] + ([("numpy index", True)] if HAVE_NUMPY else [])
+    print(f"{'corpus':<16}{'feed':>10}" + "".join(f"{name:>24}" for name, _ in engines))
+    for name, make in CORPORA.items():
+        chunks = _chunks(make(4_000_000))
+        baseline = measure(parse, chunks)
+        results = "".join(
+            f"{scanned:>14.3f}s ({baseline / scanned:>4.1f}x)"
+            for scanned in (measure(scan, chunks, use_numpy) for _, use_numpy in engines)
+        )
+        print(f"{name:<16}{baseline:>9.3f}s{results}")
+    if not HAVE_NUMPY:
+        print("\nNumPy isn't installed, so only the regular expression index was measured.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare keeping a live view of a screen with outta.screen and with pyte.
+
+Each corpus is fed a small update at a time, and after each update the view is refreshed: with
+``Screen.changes`` for outta, and by reading the whole display for pyte.
+
+Run from the repository root:
+
+    python -m benchmarks.screen
+"""
+
+import timeit
+
+import pyte
+from outta.parser import Parser
+from outta.screen import Screen
+
+from .corpora import htop_refresh, progress_bar, vim_redraw
+
+#: The number of characters in each update.
+UPDATE_SIZE = 256
+
+
+def _updates(text):
+    return [text[offset : offset + UPDATE_SIZE] for offset in range(0, len(text), UPDATE_SIZE)]
+
+
+def outta_view(updates):
+    parser = Parser()
+    screen = Screen(80, 24)
+    for update in updates:
+        screen.feed(parser.feed(update))
+        screen.changes()
+
+
+def pyte_view(updates):
+    screen = pyte.Screen(80, 24)
+    stream = pyte.Stream(screen)
+    for update in updates:
+        stream.feed(update)
+        screen.display
+
+
+def measure(function, updates, repeat=3):
+    "Best time, in seconds, to call ``function`` on ``updates``."
+    return min(timeit.repeat(lambda: function(updates), number=1, repeat=repeat))
+
+
+def main():
+    print(f"{'corpus':<16}{'pyte':>12}{'outta':>12}{'speedup':>10}")
+    for make in (htop_refresh, progress_bar, vim_redraw):
+        updates = _updates(make(size=200_000))
+        baseline = measure(pyte_view, updates)
+        viewed = measure(outta_view, updates)
+        print(f"{make.__name__:<16}{baseline:>11.3f}s{viewed:>11.3f}s{baseline / viewed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Compare Parser.feed with and without the whole-sequence scanner on SGR-heavy input.
+
+Run from the repository root:
+
+    python -m benchmarks.sgr
+"""
+
+import re
+import timeit
+
+from outta.parser import Parser
+
+from .corpora import sgr_heavy
+
+
+class FSMOnlyParser(Parser):
+    "A Parser which sends every control sequence through the coroutine FSM."
+    _sequence_pattern = re.compile("(?!)")
+
+
+def measure(parser_type, text, repeat=5):
+    "Best time, in seconds, to parse ``text`` with a fresh ``parser_type``."
+
+    def run():
+        for _ in parser_type().feed(text):
+            pass
+
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+
+def main():
+    text = sgr_heavy()
+    megabytes = len(text) / 1e6
+    baseline = measure(FSMOnlyParser, text)
+    scanner = measure(Parser, text)
+    print(f"input:   {megabytes:.1f} M characters")
+    print(f"fsm:     {baseline:.3f} s ({megabytes / baseline:.2f} MB/s)")
+    print(f"scanner: {scanner:.3f} s ({megabytes / scanner:.2f} MB/s)")
+    print(f"speedup: {baseline / scanner:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
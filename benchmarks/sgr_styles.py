@@ -0,0 +1,51 @@
+"""Compare decoding the SGR parameters of each element from scratch with the memoized ``SGRDecoder``.
+
+Run from the repository root:
+
+    python -m benchmarks.sgr_styles
+"""
+
+import timeit
+
+from outta import elements, sgr
+from outta.parser import Parser
+
+from .corpora import ls_color, sgr_heavy
+
+
+def decode_each(parameter_lists):
+    "Apply each list of parameters in turn, working out its effect every time."
+    style = sgr.DEFAULT
+    for parameters in parameter_lists:
+        keep, set_ = sgr.transform(parameters)
+        style = style & keep | set_
+    return style
+
+
+def decode_memoized(parameter_lists):
+    "Apply each list of parameters in turn with an ``SGRDecoder``."
+    apply = sgr.SGRDecoder().apply
+    for parameters in parameter_lists:
+        apply(parameters)
+
+
+def measure(function, parameter_lists, repeat=5):
+    "Best time, in seconds, to call ``function`` on ``parameter_lists``."
+    return min(timeit.repeat(lambda: function(parameter_lists), number=1, repeat=repeat))
+
+
+def main():
+    print(f"{'corpus':<12}{'SGRs':>10}{'scratch':>12}{'memoized':>12}{'speedup':>10}")
+    for make in (sgr_heavy, ls_color):
+        parser = Parser(types={elements.SelectGraphicRendition})
+        parameter_lists = [element.parameters for element in parser.feed(make())]
+        baseline = measure(decode_each, parameter_lists)
+        memoized = measure(decode_memoized, parameter_lists)
+        print(
+            f"{make.__name__:<12}{len(parameter_lists):>10}{baseline:>11.3f}s{memoized:>11.3f}s"
+            f"{baseline / memoized:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Compare outta.strip with joining the Text elements from Parser.feed, over each corpus.
+
+Run from the repository root:
+
+    python -m benchmarks.strip
+"""
+
+import timeit
+
+from outta import elements
+from outta.parser import Parser
+from outta.strip import strip
+
+from .corpora import CORPORA
+
+
+def feed_and_join(text):
+    "Strip ``text`` the long way round, by building every element."
+    return "".join(element.text for element in Parser().feed(text) if isinstance(element, elements.Text))
+
+
+def measure(function, text, repeat=5):
+    "Best time, in seconds, to call ``function`` on ``text``."
+    return min(timeit.repeat(lambda: function(text), number=1, repeat=repeat))
+
+
+def main():
+    print(f"{'corpus':<16}{'feed+join':>12}{'strip':>12}{'speedup':>10}")
+    for name, make in CORPORA.items():
+        text = make()
+        baseline = measure(feed_and_join, text)
+        stripped = measure(strip, text)
+        print(f"{name:<16}{baseline:>11.3f}s{stripped:>11.3f}s{baseline / stripped:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
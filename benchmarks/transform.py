@@ -0,0 +1,46 @@
+"""Compare outta.transform with rewriting by joining the text of Parser.feed's elements, over each corpus.
+
+The rewrite drops titles and device status reports, as for sharing a capture. Run from the repository
+root:
+
+    python -m benchmarks.transform
+"""
+
+import timeit
+
+from outta import elements
+from outta.parser import Parser
+from outta.transform import Transform
+
+from .corpora import CORPORA
+
+#: The element types dropped.
+DROPPED = (elements.SetTitle, elements.SetIconName, elements.ReportDeviceStatus)
+
+
+def feed_and_join(data):
+    "Rewrite ``data`` the long way round, by building every element."
+    text = "".join(element.text for element in Parser().feed_bytes(data) if not isinstance(element, DROPPED))
+    return text.encode("utf-8")
+
+
+def transform(data):
+    return Transform().drop(*DROPPED).feed_bytes(data)
+
+
+def measure(function, data, repeat=5):
+    "Best time, in seconds, to call ``function`` on ``data``."
+    return min(timeit.repeat(lambda: function(data), number=1, repeat=repeat))
+
+
+def main():
+    print(f"{'corpus':<16}{'feed+join':>12}{'transform':>12}{'speedup':>10}")
+    for name, make in CORPORA.items():
+        data = make().encode("utf-8")
+        baseline = measure(feed_and_join, data)
+        transformed = measure(transform, data)
+        print(f"{name:<16}{baseline:>11.3f}s{transformed:>11.3f}s{baseline / transformed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
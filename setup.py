@@ -23,16 +23,17 @@ setup(
     include_package_data=True,
     package_dir={"": "source"},
     # package_data={'outta': . . .},
-    install_requires=[
-        "pyte",
-    ],
+    install_requires=[],
     # List additional groups of dependencies here (e.g. development
     # dependencies). You can install these using the following syntax, for
     # example: $ pip install -e .[dev,test]
     extras_require={
         "dev": ["black", "bump2version", "flake8"],
         # 'doc': ['sphinx', 'cartouche'],
-        "test": ["pytest"],
+        # pyte is only used to check outta against.
+        "test": ["pytest", "pyte"],
+        # Speeds up outta.scan on large buffers.
+        "numpy": ["numpy"],
     },
     entry_points={
         'console_scripts': [
@@ -0,0 +1,89 @@
+"""Parse asynchronous byte streams, e.g. ptys or sockets, with asyncio.
+
+``AsyncParser`` wraps a ``Parser`` (so it produces exactly the same elements) and reads from its source only
+as fast as its consumer takes elements, so a slow consumer applies backpressure to the source.
+"""
+
+import asyncio
+from typing import AsyncIterator, List
+
+from . import elements
+from .parser import Parser
+
+#: The default maximum number of bytes to read from a source at a time.
+READ_SIZE = 64 * 1024
+
+#: The default number of elements to produce before giving other tasks a turn.
+YIELD_EVERY = 1000
+
+
+class AsyncParser:
+    """Parse an asynchronous stream of bytes into elements.
+
+    Iterate over it with ``async for`` to get elements, or use ``batches`` to get them a chunk at a time.
+
+    Reads are only made when the consumer wants more elements, so data waits in the source (and, for
+    a ``StreamReader``, its transport is paused once its buffer is full) while the consumer is busy.
+    Reading with ``StreamReader.read`` returns everything already buffered, so many small writes are
+    parsed together. While parsing a large chunk, other tasks get a turn every ``yield_every`` elements.
+
+    Args:
+        source: An ``asyncio.StreamReader``, anything else with an async ``read(n)`` method, or an
+            async iterable of bytes-like objects.
+        parser: The parser to use. If not provided, a new one is created.
+        read_size: The maximum number of bytes to read at a time.
+        yield_every: The number of elements to produce before giving other tasks a turn.
+    """
+
+    def __init__(self, source, parser: Parser = None, read_size: int = READ_SIZE, yield_every: int = YIELD_EVERY):
+        self.source = source
+        self.parser = parser or Parser()
+        self.read_size = read_size
+        self.yield_every = yield_every
+
+    def __aiter__(self) -> AsyncIterator[elements.Element]:
+        return self._elements()
+
+    async def batches(self) -> AsyncIterator[List[elements.Element]]:
+        """Produce the elements parsed from each chunk read from the source.
+
+        This has less overhead per element than iterating over the elements one at a time.
+
+        Returns:
+            An async iterable of lists of elements.
+        """
+        yield_every = self.yield_every
+        async for chunk in self._chunks():
+            batch = []
+            for element in self.parser.feed_bytes(chunk):
+                batch.append(element)
+                if len(batch) == yield_every:
+                    yield batch
+                    batch = []
+                    await asyncio.sleep(0)
+            if batch:
+                yield batch
+
+    async def _elements(self):
+        yield_every = self.yield_every
+        async for chunk in self._chunks():
+            count = 0
+            for element in self.parser.feed_bytes(chunk):
+                yield element
+                count += 1
+                if count == yield_every:
+                    count = 0
+                    await asyncio.sleep(0)
+
+    async def _chunks(self):
+        source = self.source
+        if hasattr(source, "read"):
+            read_size = self.read_size
+            while True:
+                chunk = await source.read(read_size)
+                if not chunk:
+                    break
+                yield chunk
+        else:
+            async for chunk in source:
+                yield chunk
@@ -0,0 +1,206 @@
+"""Parse many files in a pool of worker processes, e.g. a night's worth of session logs.
+
+Starting a process for each of many small files costs far more than parsing them. ``run`` instead
+hands the files out to a few long-lived workers, a batch at a time, and each worker keeps a single
+``Parser`` which it resets between files. Results come back in the order of the files, as soon as
+each is ready, and a file which can't be parsed gets a result with its error rather than stopping
+the rest.
+
+By default each file is summarized (see ``summarize``), and the summaries can be added up with
+``Totals``.
+"""
+
+import functools
+import glob
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+from .parser import Parser
+from .stats import Stats, TopCounter
+
+#: The default number of bytes to read from a file at a time.
+CHUNK_SIZE = 64 * 1024
+
+#: The default number of files to send to a worker at a time.
+BATCH_SIZE = 16
+
+# The parser of this process, and the state it's reset to for each file.
+_parser = None
+_initial_state = None
+
+
+class Summary:
+    """What ``summarize`` found in a file.
+
+    Args:
+        input_bytes: The size of the file.
+        counts: The number of elements of each element type.
+        lengths: The total length of the text of the elements of each element type.
+        sequences: The most frequent control sequences and their counts, most frequent first.
+    """
+
+    __slots__ = ("input_bytes", "counts", "lengths", "sequences")
+
+    def __init__(self, input_bytes: int, counts: Counter, lengths: Counter, sequences: List[Tuple[str, int]]):
+        self.input_bytes = input_bytes
+        self.counts = counts
+        self.lengths = lengths
+        self.sequences = sequences
+
+    def __reduce__(self):
+        return (Summary, (self.input_bytes, self.counts, self.lengths, self.sequences))
+
+
+class FileResult:
+    """The result of a job for one file.
+
+    Args:
+        filename: The file.
+        result: What the job returned, or None if it failed.
+        error: A description of why the job failed, or None if it didn't.
+    """
+
+    __slots__ = ("filename", "result", "error")
+
+    def __init__(self, filename: str, result: Any = None, error: str = None):
+        self.filename = filename
+        self.result = result
+        self.error = error
+
+    def __reduce__(self):
+        return (FileResult, (self.filename, self.result, self.error))
+
+    def __repr__(self):
+        outcome = f"error={self.error!r}" if self.error is not None else f"result={self.result!r}"
+        return f"FileResult({self.filename!r}, {outcome})"
+
+
+def summarize(parser: Parser, filename: str, chunk_size: int = CHUNK_SIZE, top: int = 10) -> Summary:
+    """Count the elements in a file. This is the default job for ``run``.
+
+    Args:
+        parser: The parser to use, in its initial state.
+        filename: The file.
+        chunk_size: The number of bytes to read at a time.
+        top: The number of most frequent sequences to keep.
+
+    Returns:
+        The summary.
+    """
+    stats = Stats(parser)
+    with open(filename, mode="rb") as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                break
+            stats.feed_bytes(chunk)
+    return Summary(stats.input_bytes, stats.counts, stats.lengths, stats.sequences.most_common(top))
+
+
+def _run_job(job, filename):
+    "Run a job with this process's parser, reset to its initial state."
+    global _parser, _initial_state
+    if _parser is None:
+        _parser = Parser()
+        _initial_state = _parser.snapshot()
+    else:
+        # The last job may have stopped part way through a feed, so start with a fresh FSM.
+        _parser._initialize_parser()
+        _parser.restore(_initial_state)
+
+    try:
+        return FileResult(filename, job(_parser, filename))
+    except Exception as error:
+        return FileResult(filename, error=f"{type(error).__name__}: {error}")
+
+
+def run(
+    filenames: Iterable[str],
+    job: Callable[[Parser, str], Any] = summarize,
+    workers: int = None,
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[FileResult]:
+    """Run a job for each of some files, in a pool of worker processes.
+
+    Args:
+        filenames: The files.
+        job: Called with a parser and a filename in a worker, and returns the result for the file,
+            which must be picklable. It must be picklable itself, e.g. a module-level function or a
+            ``functools.partial`` of one.
+        workers: The number of processes to use. Defaults to the number of CPUs. With 1, the jobs
+            are run in this process.
+        batch_size: The number of files to send to a worker at a time.
+
+    Returns:
+        An iterable of results, one for each file, in the same order.
+    """
+    run_job = functools.partial(_run_job, job)
+    if workers == 1:
+        yield from map(run_job, filenames)
+        return
+
+    with ProcessPoolExecutor(workers or os.cpu_count()) as executor:
+        yield from executor.map(run_job, filenames, chunksize=batch_size)
+
+
+class Totals:
+    """The totals of some ``Summary`` results.
+
+    Args:
+        top_capacity: The number of distinct sequences to keep counts for; see ``TopCounter``.
+
+    Attributes:
+        files: The number of files added.
+        failed: The number of those which failed.
+        input_bytes: The total size of the files which didn't fail.
+        counts: The number of elements of each element type.
+        lengths: The total length of the text of the elements of each element type.
+        sequences: The most frequent control sequences, from those of each file.
+    """
+
+    def __init__(self, top_capacity: int = 1000):
+        self.files = 0
+        self.failed = 0
+        self.input_bytes = 0
+        self.counts = Counter()
+        self.lengths = Counter()
+        self.sequences = TopCounter(top_capacity)
+
+    def add(self, file_result: FileResult):
+        "Add the result of ``summarize`` for a file."
+        self.files += 1
+        if file_result.error is not None:
+            self.failed += 1
+            return
+
+        summary = file_result.result
+        self.input_bytes += summary.input_bytes
+        self.counts.update(summary.counts)
+        self.lengths.update(summary.lengths)
+        for sequence, count in summary.sequences:
+            self.sequences.add(sequence, count)
+
+
+def find_files(patterns: Iterable[str]) -> List[str]:
+    """Find the files to parse.
+
+    Args:
+        patterns: Directories, whose files (and those of their subdirectories) are all found, or
+            glob patterns, e.g. "logs/**/*.log".
+
+    Returns:
+        The files, sorted for each pattern, without duplicates.
+    """
+    found = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = (
+                os.path.join(directory, name) for directory, _, names in os.walk(pattern) for name in names
+            )
+        else:
+            matches = (path for path in glob.iglob(pattern, recursive=True) if not os.path.isdir(path))
+        for path in sorted(matches):
+            found.setdefault(path, None)
+    return list(found)
@@ -0,0 +1,68 @@
+"""A cache of parsed control sequences.
+
+Terminal output tends to repeat the same few sequences (resetting attributes, showing the cursor, etc.)
+over and over. A ``Parser`` with a ``SequenceCache`` looks complete sequences up by their exact text and
+reuses the element it made for them last time, instead of parsing them again. This is safe because
+elements are immutable.
+"""
+
+from collections import OrderedDict
+from typing import Optional
+
+from . import elements
+
+
+class SequenceCache:
+    """A bounded, least-recently-used mapping from the text of a sequence to its element.
+
+    Args:
+        maxsize: The maximum number of sequences to keep.
+
+    Attributes:
+        hits: The number of lookups which found an element.
+        misses: The number of lookups which didn't.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._elements = OrderedDict()
+
+    def __len__(self):
+        return len(self._elements)
+
+    def get(self, text: str) -> Optional[elements.Element]:
+        """Look up the element for a sequence.
+
+        Args:
+            text: The text of the sequence.
+
+        Returns:
+            The element, or None if the sequence isn't in the cache.
+        """
+        try:
+            element = self._elements[text]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._elements.move_to_end(text)
+        self.hits += 1
+        return element
+
+    def put(self, text: str, element: elements.Element):
+        """Add the element for a sequence, evicting the least recently used one if the cache is full.
+
+        Args:
+            text: The text of the sequence.
+            element: Its element.
+        """
+        self._elements[text] = element
+        if len(self._elements) > self.maxsize:
+            self._elements.popitem(last=False)
+
+    def clear(self):
+        "Remove everything from the cache, and reset the counters."
+        self._elements.clear()
+        self.hits = 0
+        self.misses = 0
@@ -1,23 +1,289 @@
 import argparse
+import functools
+import os
+import sys
+import time
+
+from outta import elements
 from outta.parser import Parser
+from outta.stats import Stats
+from outta.strip import Stripper
+from outta.transform import Transform, downgrade_truecolor
+
+#: The default number of bytes to read from the input at a time.
+CHUNK_SIZE = 64 * 1024
+
+
+def read_chunks(filename, chunk_size=CHUNK_SIZE):
+    """Read a file in chunks of bytes.
+
+    Chunks are returned as soon as they're available, so this works well with pipes.
+
+    Args:
+        filename: The name of the file to read, or "-" to read stdin.
+        chunk_size: The maximum number of bytes in each chunk.
 
+    Returns:
+        An iterable of bytes.
+    """
+    if filename == "-":
+        yield from _read_chunks(sys.stdin.buffer, chunk_size)
+    else:
+        with open(filename, mode="rb") as handle:
+            yield from _read_chunks(handle, chunk_size)
 
-def explain(filename):
-    "Print explanation of elements in text."
-    with open(filename, mode="rt") as handle:
-        text = handle.read()
 
+def _read_chunks(handle, chunk_size):
+    read = handle.read1
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def parse_file(filename, chunk_size=CHUNK_SIZE):
+    """Parse a file into elements, a chunk at a time.
+
+    Args:
+        filename: The name of the file to read, or "-" to read stdin.
+        chunk_size: The maximum number of bytes to parse at a time.
+
+    Returns:
+        An iterable of Element's.
+    """
     parser = Parser()
-    elements = tuple(parser.feed(text))
-    for element in elements:
-        print(element)
+    for chunk in read_chunks(filename, chunk_size):
+        yield from parser.feed_bytes(chunk)
+
+
+def explain(filename, chunk_size=CHUNK_SIZE, output=None, jobs=1, cache=None):
+    """Print explanation of elements in text.
+
+    If ``cache`` is given, it's the directory to cache parsed files in, or "" for the default one.
+    """
+    write = (output or sys.stdout).write
+    # ``ir`` and ``parallel`` are slow to import, so they're only imported when they're used, to keep
+    # startup fast.
+    if cache is not None and filename != "-":
+        from outta import ir
+
+        parsed = ir.ParseCache(cache or ir.default_cache_directory()).parse_file(filename, chunk_size)
+    elif jobs > 1 and filename != "-":
+        from outta import parallel
+
+        parsed = parallel.parse_file(filename, workers=jobs)
+    else:
+        parsed = parse_file(filename, chunk_size)
+    for element in parsed:
+        write(f"{element}\n")
+
+
+def stats(filename, chunk_size=CHUNK_SIZE, top=10, output=None):
+    "Print statistics about the elements in text, and how fast it was parsed."
+    write = (output or sys.stdout).write
+    collected = Stats()
+    started = time.perf_counter()
+    for chunk in read_chunks(filename, chunk_size):
+        collected.feed_bytes(chunk)
+    elapsed = time.perf_counter() - started
+    _write_stats(write, collected, top, elapsed)
+
+
+def _write_stats(write, collected, top, elapsed):
+    "Write the statistics in a ``Stats`` or ``batch.Totals``."
+    text_length = collected.lengths[elements.Text]
+    total_length = sum(collected.lengths.values())
+    write(f"{'Element':<28}{'Count':>12}{'Chars':>14}\n")
+    for element_type, count in collected.counts.most_common():
+        write(f"{element_type.__name__:<28}{count:>12}{collected.lengths[element_type]:>14}\n")
+    write("\n")
+
+    if total_length:
+        text_share = 100 * text_length / total_length
+        write(f"Text: {text_share:.1f}% of characters, control sequences: {100 - text_share:.1f}%\n\n")
+
+    write(f"Top {top} sequences:\n")
+    for sequence, count in collected.sequences.most_common(top):
+        write(f"{count:>12}  {sequence!r}\n")
+    write("\n")
+
+    megabytes = collected.input_bytes / 1e6
+    throughput = megabytes / elapsed if elapsed else float("inf")
+    write(f"Parsed {megabytes:.2f} MB in {elapsed:.2f} s ({throughput:.2f} MB/s)\n")
+
+
+def batch(patterns, chunk_size=CHUNK_SIZE, top=10, jobs=None, quiet=False, output=None, errors=None):
+    """Print statistics about the elements in many files, parsed in a pool of processes.
+
+    A line is printed for each file as it's parsed, in order (unless ``quiet``), and then the totals
+    for all of them. Files which can't be read are reported to ``errors`` and skipped.
+
+    Args:
+        patterns: Directories or glob patterns; see ``batch.find_files``.
+        jobs: The number of processes. Defaults to the number of CPUs.
+
+    Returns:
+        The number of files which couldn't be parsed.
+    """
+    # ``outta.batch`` imports ``concurrent.futures``, which is slow to import.
+    from outta.batch import Totals, find_files, run, summarize
+
+    write = (output or sys.stdout).write
+    write_error = (errors or sys.stderr).write
+    job = functools.partial(summarize, chunk_size=chunk_size, top=top)
+    totals = Totals()
+    started = time.perf_counter()
+    for file_result in run(find_files(patterns), job, workers=jobs):
+        totals.add(file_result)
+        if file_result.error is not None:
+            write_error(f"{file_result.filename}: {file_result.error}\n")
+        elif not quiet:
+            summary = file_result.result
+            elements_count = sum(summary.counts.values())
+            write(f"{file_result.filename}: {summary.input_bytes} bytes, {elements_count} elements\n")
+    elapsed = time.perf_counter() - started
+
+    if not quiet:
+        write("\n")
+    write(f"{totals.files - totals.failed} files parsed, {totals.failed} failed\n\n")
+    _write_stats(write, totals, top, elapsed)
+    return totals.failed
+
+
+def strip(filename, chunk_size=CHUNK_SIZE, substitute="", output=None):
+    "Print text with its control sequences removed."
+    write = (output or sys.stdout).write
+    feed = Stripper(substitute=substitute).feed_bytes
+    for chunk in read_chunks(filename, chunk_size):
+        write(feed(chunk))
+
+
+def filter_(filename, chunk_size=CHUNK_SIZE, drop=(), truecolor=True, output=None):
+    """Print text with some control sequences removed or changed, and everything else as it is.
+
+    Args:
+        drop: Element types to remove.
+        truecolor: If false, 24-bit RGB colors are changed to the nearest of the 256 indexed colors.
+        output: A binary file object to write to. Defaults to stdout's. Bytes which aren't changed are
+            written exactly as they were read.
+    """
+    write = (output or sys.stdout.buffer).write
+    transform = Transform().drop(*drop)
+    if not truecolor:
+        transform.map(elements.SelectGraphicRendition, downgrade_truecolor)
+    feed = transform.feed_bytes
+    for chunk in read_chunks(filename, chunk_size):
+        write(feed(chunk))
+    write(transform.flush_bytes())
+
+
+def element_type(name):
+    "An element type, by its name, for the command line."
+    element_type = getattr(elements, name, None)
+    if not isinstance(element_type, type) or not issubclass(element_type, elements.Element):
+        raise argparse.ArgumentTypeError(f"no such element: {name}")
+    return element_type
+
+
+#: Subcommands, by name.
+COMMANDS = ("batch", "explain", "filter", "stats", "strip")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # "outta FILE" means "outta explain FILE".
+    if argv and argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv = ["explain"] + argv
+
+    parser = argparse.ArgumentParser(prog="outta")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("FILE", help="The file to read, or - for stdin.")
+    common.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE, help="The maximum number of bytes to parse at a time."
+    )
+
+    explain_parser = subparsers.add_parser("explain", parents=[common], help="Print the elements in a file.")
+    explain_parser.add_argument(
+        "--jobs", type=int, default=1, help="The number of processes to parse a file (but not stdin) with."
+    )
+    explain_parser.add_argument(
+        "--cache",
+        nargs="?",
+        const="",
+        help="Keep the elements parsed from a file (but not stdin) in this directory, and reuse them if the "
+        "same content is seen again. Defaults to $OUTTA_CACHE_DIR or ~/.cache/outta.",
+    )
+    stats_parser = subparsers.add_parser(
+        "stats", parents=[common], help="Print counts of the elements in a file, and the parsing throughput."
+    )
+    stats_parser.add_argument("--top", type=int, default=10, help="The number of most frequent sequences to show.")
+
+    strip_parser = subparsers.add_parser(
+        "strip", parents=[common], help="Print the text in a file without its control sequences."
+    )
+    strip_parser.add_argument(
+        "--substitute", default="", help="The text to print in place of a sequence cancelled by CAN or SUB."
+    )
+
+    filter_parser = subparsers.add_parser(
+        "filter",
+        parents=[common],
+        help="Print a file with some control sequences removed or changed, and everything else as it is.",
+    )
+    filter_parser.add_argument(
+        "--drop",
+        type=element_type,
+        action="append",
+        default=[],
+        metavar="ELEMENT",
+        help="Remove the sequences for an element, e.g. SetTitle. Can be given more than once.",
+    )
+    filter_parser.add_argument(
+        "--no-truecolor",
+        dest="truecolor",
+        action="store_false",
+        help="Change 24-bit RGB colors to the nearest of the 256 indexed colors.",
+    )
 
+    batch_parser = subparsers.add_parser(
+        "batch", help="Print counts of the elements in many files, parsed in a pool of processes."
+    )
+    batch_parser.add_argument(
+        "PATH", nargs="+", help="A directory, whose files are all read, or a glob pattern, e.g. 'logs/**/*.log'."
+    )
+    batch_parser.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE, help="The maximum number of bytes to parse at a time."
+    )
+    batch_parser.add_argument(
+        "--jobs", type=int, help="The number of processes to use. Defaults to the number of CPUs."
+    )
+    batch_parser.add_argument("--top", type=int, default=10, help="The number of most frequent sequences to show.")
+    batch_parser.add_argument("--quiet", action="store_true", help="Only print the totals, not a line for each file.")
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("FILE")
-    args = parser.parse_args()
-    explain(args.FILE)
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "batch":
+            if batch(args.PATH, args.chunk_size, args.top, args.jobs, args.quiet):
+                sys.stdout.flush()
+                sys.exit(1)
+        elif args.command == "filter":
+            filter_(args.FILE, args.chunk_size, args.drop, args.truecolor)
+        elif args.command == "stats":
+            stats(args.FILE, args.chunk_size, args.top)
+        elif args.command == "strip":
+            strip(args.FILE, args.chunk_size, args.substitute)
+        else:
+            explain(args.FILE, args.chunk_size, jobs=args.jobs, cache=args.cache)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Whoever was reading our output has gone away (e.g. we're piped into head). Point stdout at
+        # devnull so that Python doesn't complain when it flushes it at exit.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
 
 
 if __name__ == "__main__":
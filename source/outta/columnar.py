@@ -0,0 +1,163 @@
+"""Struct-of-arrays tables of parser output.
+
+``Parser.feed_columnar`` records what it parses in a ``Table`` rather than creating an ``Element`` for
+everything it finds. Each column is an ``array.array``, so it is compact and supports the buffer protocol
+(e.g. ``numpy.frombuffer`` can use it without copying).
+"""
+
+from array import array
+from typing import Iterator, Type
+
+from . import elements
+
+#: The element types which can appear in a table, in the order of their kind ids. These ids are
+#: stable, so tables from different runs can be compared; only ever add new types at the end.
+KINDS = (
+    elements.AlignmentDisplay,
+    elements.Backspace,
+    elements.Bell,
+    elements.CarriageReturn,
+    elements.ClearTabStop,
+    elements.CursorBack,
+    elements.CursorDown,
+    elements.CursorDown1,
+    elements.CursorForward,
+    elements.CursorPosition,
+    elements.CursorToColumn,
+    elements.CursorToLine,
+    elements.CursorUp,
+    elements.CursorUp1,
+    elements.Debug,
+    elements.DefineCharset,
+    elements.DeleteCharacters,
+    elements.DeleteLines,
+    elements.Draw,
+    elements.EraseCharacters,
+    elements.EraseInDisplay,
+    elements.EraseInLine,
+    elements.Index,
+    elements.InsertCharacters,
+    elements.InsertLines,
+    elements.LineFeed,
+    elements.ReportDeviceAttributes,
+    elements.ReportDeviceStatus,
+    elements.Reset,
+    elements.ResetMode,
+    elements.RestoreCursor,
+    elements.ReverseIndex,
+    elements.SaveCursor,
+    elements.SelectGraphicRendition,
+    elements.SetIconName,
+    elements.SetMargins,
+    elements.SetMode,
+    elements.SetTabStop,
+    elements.SetTitle,
+    elements.SetTitleAndIconName,
+    elements.ShiftIn,
+    elements.ShiftOut,
+    elements.Tab,
+    elements.EnableUTF8Mode,
+    elements.DisableUTF8Mode,
+    elements.Text,
+)
+
+#: Kind id for each element type in ``KINDS``.
+KIND_IDS = {kind: kind_id for kind_id, kind in enumerate(KINDS)}
+
+
+class Table:
+    """Columns describing a sequence of parsed elements.
+
+    Row ``i`` describes the ``i``-th element. Offsets count characters from the start of everything fed to
+    the parser.
+
+    Attributes:
+        kinds: The kind id (an index into ``KINDS``) of each row.
+        starts: The offset at which the text of each row starts.
+        ends: The offset at which the text of each row ends.
+        parameter_offsets: The parameters of row ``i`` are
+            ``parameters[parameter_offsets[i]:parameter_offsets[i + 1]]``. This has one more entry than
+            there are rows.
+        parameters: The integer parameters of all rows, one after the other.
+        keywords: Side table mapping row numbers to the keywords of the rows which have any, e.g. the
+            title of an OSC sequence.
+        other_parameters: Side table mapping row numbers to parameters which aren't integers.
+    """
+
+    def __init__(self):
+        self.kinds = array("B")
+        self.starts = array("Q")
+        self.ends = array("Q")
+        self.parameter_offsets = array("Q", [0])
+        self.parameters = array("q")
+        self.keywords = {}
+        self.other_parameters = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def kind(self, row: int) -> Type[elements.Element]:
+        "The element type of a row."
+        return KINDS[self.kinds[row]]
+
+    def element(self, row: int, source: str = None) -> elements.Element:
+        """Build the element for a row.
+
+        Args:
+            row: The row number.
+            source: Everything that was fed to the parser, or anything else which can be sliced with
+                the offsets in the table. If not provided, the element's text is empty.
+
+        Returns:
+            The Element.
+        """
+        if row in self.other_parameters:
+            parameters = self.other_parameters[row]
+        else:
+            parameters = tuple(self.parameters[self.parameter_offsets[row] : self.parameter_offsets[row + 1]])
+        text = "" if source is None else source[self.starts[row] : self.ends[row]]
+        return KINDS[self.kinds[row]](parameters, self.keywords.get(row), text)
+
+    def elements(self, source: str = None) -> Iterator[elements.Element]:
+        """Build the elements for all rows.
+
+        Args:
+            source: As for ``element``.
+
+        Returns:
+            An iterator over the Elements.
+        """
+        return (self.element(row, source) for row in range(len(self)))
+
+    def _append_tokens(self, tokens, position):
+        """Append tokens from ``Parser._tokens``.
+
+        Args:
+            tokens: The tokens.
+            position: The offset of the data the tokens were parsed from.
+        """
+        kind_ids = KIND_IDS
+        text_type = elements.Text
+        append_kind = self.kinds.append
+        append_start = self.starts.append
+        append_end = self.ends.append
+        append_parameter_offset = self.parameter_offsets.append
+        parameters = self.parameters
+        extend_parameters = parameters.extend
+        keyword_table = self.keywords
+        other_parameters = self.other_parameters
+        row = len(self.kinds)
+
+        for element_type, params, keywords, start, end, prefix in tokens:
+            append_kind(kind_ids[element_type])
+            append_start(position + start - len(prefix))
+            append_end(position + end)
+            if params:
+                if element_type is text_type:
+                    other_parameters[row] = tuple(params)
+                else:
+                    extend_parameters(params)
+            append_parameter_offset(len(parameters))
+            if keywords:
+                keyword_table[row] = dict(keywords)
+            row += 1
@@ -0,0 +1,163 @@
+"""Compact a stream of elements, without changing what it does or the text it covers.
+
+Parsing small chunks (e.g. a few bytes at a time from a pty) splits text runs into many ``Text``
+elements, and programs often repeat simple sequences. ``Compactor`` merges runs of elements which
+can be expressed as one:
+
+- adjacent ``Text`` elements become one;
+- consecutive cursor moves in the same direction become one move by the total distance;
+- consecutive ``SelectGraphicRendition`` elements become one, dropping any parameters before the
+  last reset, since it overrides them.
+
+The text of a merged element is the text of everything it replaces, so joining the ``text`` of the
+compacted elements still gives back the input.
+"""
+
+from typing import Iterable, Iterator
+
+from . import elements
+
+#: Cursor moves which can be folded together.
+MOVES = (elements.CursorUp, elements.CursorDown, elements.CursorForward, elements.CursorBack)
+
+#: The largest parameter the parser produces. Folded moves are kept within it.
+MAX_PARAMETER = 9999
+
+
+def _reset_offset(parameters):
+    """Find where the effective part of some SGR parameters starts.
+
+    Returns:
+        The offset of the last parameter which resets everything (or 0), or None if the
+        parameters end with an incomplete 38 or 48 color, which would change the meaning of any
+        parameters appended to them.
+    """
+    length = len(parameters)
+    index = start = 0
+    while index < length:
+        parameter = parameters[index]
+        index += 1
+        if parameter == 0:
+            start = index - 1
+        elif parameter == 38 or parameter == 48:
+            kind = parameters[index] if index < length else None
+            if kind == 5:
+                index += 2
+            elif kind == 2:
+                index += 4
+            else:
+                return None
+            if index > length:
+                return None
+    return start
+
+
+class Compactor:
+    """Compact elements as they arrive.
+
+    The last element fed may be merged with the ones which come after it, so it's held back until
+    something which can't be merged with it arrives, or until ``flush`` is called (e.g. at the end of
+    the input, or when it goes idle).
+    """
+
+    def __init__(self):
+        self._pending = []
+        # The total distance of the pending cursor moves.
+        self._distance = 0
+
+    def feed(self, items: Iterable[elements.Element]) -> Iterator[elements.Element]:
+        """Compact some elements.
+
+        Args:
+            items: An iterable of elements, e.g. from ``Parser.feed``.
+
+        Returns:
+            An iterable of compacted elements.
+        """
+        pending = self._pending
+        for element in items:
+            if pending and self._can_merge(pending[-1], element):
+                self._hold(element)
+                continue
+            if pending:
+                yield self._merge(pending)
+                pending.clear()
+                self._distance = 0
+            if self._can_merge_any(element):
+                self._hold(element)
+            else:
+                yield element
+
+    def flush(self) -> Iterator[elements.Element]:
+        """Produce the element being held back, if any.
+
+        Returns:
+            An iterable of compacted elements.
+        """
+        if self._pending:
+            yield self._merge(self._pending)
+            self._pending.clear()
+            self._distance = 0
+
+    def _hold(self, element):
+        self._pending.append(element)
+        if type(element) in MOVES:
+            self._distance += self._count(element)
+
+    @staticmethod
+    def _can_merge_any(element):
+        "Whether anything can be merged into an element."
+        element_type = type(element)
+        if element_type is elements.Text:
+            return not element.parameters
+        elif element_type in MOVES:
+            return not element.keywords and len(element.parameters) <= 1
+        elif element_type is elements.SelectGraphicRendition:
+            return not element.keywords
+        return False
+
+    def _can_merge(self, previous, element):
+        "Whether an element can be merged into the run ending with ``previous``."
+        element_type = type(element)
+        if element_type is not type(previous) or not self._can_merge_any(element):
+            return False
+        elif element_type in MOVES:
+            return self._distance + self._count(element) <= MAX_PARAMETER
+        elif element_type is elements.SelectGraphicRendition:
+            return _reset_offset(previous.parameters) is not None
+        return True
+
+    @staticmethod
+    def _count(element):
+        return (element.parameters[0] if element.parameters else 0) or 1
+
+    def _merge(self, run):
+        first = run[0]
+        if len(run) == 1:
+            return first
+
+        element_type = type(first)
+        text = "".join(element.text for element in run)
+        if element_type is elements.Text:
+            return elements.Text((), None, text)
+        elif element_type is elements.SelectGraphicRendition:
+            parameters = [parameter for element in run for parameter in element.parameters or (0,)]
+            # Only the last element's parameters can end with an incomplete color, in which case
+            # nothing is dropped.
+            parameters = parameters[_reset_offset(parameters) :]
+            return elements.SelectGraphicRendition(parameters, None, text)
+        return element_type((self._distance,), None, text)
+
+
+def compact(items: Iterable[elements.Element]) -> Iterator[elements.Element]:
+    """Compact a whole stream of elements.
+
+    Args:
+        items: An iterable of elements, e.g. from ``Parser.feed``.
+
+    Returns:
+        An iterable of compacted elements.
+    """
+    compactor = Compactor()
+    yield from compactor.feed(items)
+    yield from compactor.flush()
@@ -0,0 +1,61 @@
+"""Control characters, and the sequences which introduce control strings.
+
+These are the values of ``pyte.control``, which outta's parser was based on, kept here so that
+importing outta doesn't import pyte (and, with it, pyte's screen and its dependencies). They're copied
+rather than generated from pyte, since they're fixed by the standards; ``tests/parser/test_constants.py``
+checks that they still match.
+"""
+
+#: Space.
+SP = " "
+
+#: Null: does nothing.
+NUL = "\x00"
+
+#: Bell.
+BEL = "\x07"
+
+#: Backspace one column, but not past the beginning of the line.
+BS = "\x08"
+
+#: Horizontal tab: move to the next tab stop.
+HT = "\x09"
+
+#: Line feed, and the vertical tab and form feed which are treated the same.
+LF = "\n"
+VT = "\x0b"
+FF = "\x0c"
+
+#: Carriage return: move to the left margin.
+CR = "\r"
+
+#: Shift out: activate the G1 character set.
+SO = "\x0e"
+
+#: Shift in: activate the G0 character set.
+SI = "\x0f"
+
+#: Cancel, and substitute which is the same: abort the current sequence.
+CAN = "\x18"
+SUB = "\x1a"
+
+#: Escape: start an escape sequence.
+ESC = "\x1b"
+
+#: Delete: ignored.
+DEL = "\x7f"
+
+#: Control sequence introducer.
+CSI_C0 = ESC + "["
+CSI_C1 = "\x9b"
+CSI = CSI_C0
+
+#: String terminator.
+ST_C0 = ESC + "\\"
+ST_C1 = "\x9c"
+ST = ST_C0
+
+#: Operating system command.
+OSC_C0 = ESC + "]"
+OSC_C1 = "\x9d"
+OSC = OSC_C0
@@ -6,31 +6,70 @@ i.e. the intermediate representation. This module provides the classes that comp
 For each control sequence outta recognizes, this has a class which contains its parsed contents.
 """
 
-from typing import Iterable, Mapping, Any
+from types import MappingProxyType
+from typing import Iterable, Mapping, Any, Union
+
+# Most elements have no keywords, so they all share this. (The empty tuple is already shared.)
+_EMPTY_KEYWORDS = MappingProxyType({})
+
+
+class Span:
+    """A part of a buffer which is only copied out when it's needed.
+
+    Elements can hold one of these in place of their text, so that the text isn't copied out of the
+    parsed data unless it's read. This keeps the buffer alive for as long as the element refers to it.
+
+    Args:
+        buffer: The text containing the span.
+        start: The offset in ``buffer`` at which the span starts.
+        end: The offset in ``buffer`` at which the span ends.
+    """
+
+    __slots__ = ("buffer", "start", "end")
+
+    def __init__(self, buffer: str, start: int, end: int):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+
+    def __str__(self):
+        return self.buffer[self.start : self.end]
+
+    def __repr__(self):
+        return f"Span({self.start}, {self.end})"
 
 
 class Element:
     """Base class for all control code intermediate representations.
 
+    Elements are immutable and use ``__slots__``, since a large input can produce a great many of
+    them. Subclasses need to declare ``__slots__`` as well.
+
     Args:
         parameters: Iterable of positional arguments to the Element.
         keywords: Dict-like of keyword arguments to the Element.
-        text: The text parsed to create the Element (i.e. the control sequence).
+        text: The text parsed to create the Element (i.e. the control sequence), or a ``Span`` of it.
     """
 
-    def __init__(self, parameters: Iterable[Any], keywords: Mapping[str, Any], text: str):
-        self._parameters = tuple(parameters)
-        self._keywords = dict(keywords)
+    __slots__ = ("_parameters", "_keywords", "_text")
+
+    def __init__(self, parameters: Iterable[Any], keywords: Mapping[str, Any], text: Union[str, Span]):
+        self._parameters = parameters if type(parameters) is tuple else tuple(parameters)
+        self._keywords = MappingProxyType(dict(keywords)) if keywords else _EMPTY_KEYWORDS
         self._text = text
 
     @property
     def text(self):
         "The text that was parsed to produce the Element."
-        return self._text
+        text = self._text
+        if type(text) is Span:
+            # Copy the text out, and let go of the buffer.
+            text = self._text = str(text)
+        return text
 
     @property
     def keywords(self):
-        "Keyword arguments provided to the Element."
+        "Keyword arguments provided to the Element, as a read-only mapping."
         return self._keywords
 
     @property
@@ -53,14 +92,25 @@ class Element:
             KeyError: The string key does not exist in the keywords.
         """
         if isinstance(index, str):
-            return self.keywords[str]
+            return self.keywords[index]
         return self.parameters[index]
 
     def __repr__(self):
-        return f"{type(self).__name__}(parameters={self.parameters}, keywords={self.keywords}, text={repr(self.text)})"
+        return (
+            f"{type(self).__name__}(parameters={self.parameters}, keywords={dict(self.keywords)}, "
+            f"text={repr(self.text)})"
+        )
 
     def __eq__(self, rhs):
-        return (self._parameters == rhs._parameters) and (self._keywords == rhs._keywords) and (self._text == rhs._text)
+        if not isinstance(rhs, Element):
+            return NotImplemented
+        return (self._parameters == rhs._parameters) and (self._keywords == rhs._keywords) and (self.text == rhs.text)
+
+    def __hash__(self):
+        return hash((self._parameters, frozenset(self._keywords.items()), self.text))
+
+    def __reduce__(self):
+        return (type(self), (self._parameters, dict(self._keywords), self.text))
 
 
 # TODO: Add any appropriate methods to the classes below. See CursorDown as an example.
@@ -70,31 +120,35 @@ class Element:
 
 
 class AlignmentDisplay(Element):
-    pass
+    __slots__ = ()
 
 
 class Backspace(Element):
+    __slots__ = ()
+
     def __str__(self):
         return "Move cursor back one column"
 
 
 class Bell(Element):
-    pass
+    __slots__ = ()
 
 
 class CarriageReturn(Element):
-    pass
+    __slots__ = ()
 
 
 class ClearTabStop(Element):
-    pass
+    __slots__ = ()
 
 
 class CursorBack(Element):
-    pass
+    __slots__ = ()
 
 
 class CursorDown(Element):
+    __slots__ = ()
+
     @property
     def count(self):
         return self[0]
@@ -104,26 +158,28 @@ class CursorDown(Element):
 
 
 class CursorDown1(Element):
-    pass
+    __slots__ = ()
 
 
 class CursorForward(Element):
-    pass
+    __slots__ = ()
 
 
 class CursorPosition(Element):
-    pass
+    __slots__ = ()
 
 
 class CursorToColumn(Element):
-    pass
+    __slots__ = ()
 
 
 class CursorToLine(Element):
-    pass
+    __slots__ = ()
 
 
 class CursorUp(Element):
+    __slots__ = ()
+
     @property
     def count(self):
         return self[0]
@@ -133,39 +189,43 @@ class CursorUp(Element):
 
 
 class CursorUp1(Element):
-    pass
+    __slots__ = ()
 
 
 class Debug(Element):
+    __slots__ = ()
+
     def __str__(self):
         return f"Invalid control character: {repr(self.text)}"
 
 
 class DefineCharset(Element):
-    pass
+    __slots__ = ()
 
 
 class DeleteCharacters(Element):
-    pass
+    __slots__ = ()
 
 
 class DeleteLines(Element):
-    pass
+    __slots__ = ()
 
 
 class Draw(Element):
-    pass
+    __slots__ = ()
 
 
 class EraseCharacters(Element):
-    pass
+    __slots__ = ()
 
 
 class EraseInDisplay(Element):
-    pass
+    __slots__ = ()
 
 
 class EraseInLine(Element):
+    __slots__ = ()
+
     @property
     def how(self):
         methods = {
@@ -181,101 +241,107 @@ class EraseInLine(Element):
 
 
 class Index(Element):
-    pass
+    __slots__ = ()
 
 
 class InsertCharacters(Element):
-    pass
+    __slots__ = ()
 
 
 class InsertLines(Element):
-    pass
+    __slots__ = ()
 
 
 class LineFeed(Element):
-    pass
+    __slots__ = ()
 
 
 class ReportDeviceAttributes(Element):
-    pass
+    __slots__ = ()
 
 
 class ReportDeviceStatus(Element):
-    pass
+    __slots__ = ()
 
 
 class Reset(Element):
-    pass
+    __slots__ = ()
 
 
 class ResetMode(Element):
-    pass
+    __slots__ = ()
 
 
 class RestoreCursor(Element):
-    pass
+    __slots__ = ()
 
 
 class ReverseIndex(Element):
-    pass
+    __slots__ = ()
 
 
 class SaveCursor(Element):
-    pass
+    __slots__ = ()
 
 
 class SelectGraphicRendition(Element):
-    pass
+    __slots__ = ()
 
 
 class SetIconName(Element):
+    __slots__ = ()
+
     @property
     def name(self):
         return self["name"]
 
 
 class SetMargins(Element):
-    pass
+    __slots__ = ()
 
 
 class SetMode(Element):
-    pass
+    __slots__ = ()
 
 
 class SetTabStop(Element):
-    pass
+    __slots__ = ()
 
 
 class SetTitle(Element):
+    __slots__ = ()
+
     @property
     def title(self):
         return self["title"]
 
 
 class SetTitleAndIconName(SetIconName, SetTitle):
-    pass
+    __slots__ = ()
 
 
 class ShiftIn(Element):
-    pass
+    __slots__ = ()
 
 
 class ShiftOut(Element):
-    pass
+    __slots__ = ()
 
 
 class Tab(Element):
-    pass
+    __slots__ = ()
 
 
 class EnableUTF8Mode(Element):
-    pass
+    __slots__ = ()
 
 
 class DisableUTF8Mode(Element):
-    pass
+    __slots__ = ()
 
 
 class Text(Element):
+    __slots__ = ()
+
     def __str__(self):
         return self.text
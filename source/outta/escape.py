@@ -0,0 +1,119 @@
+"""The final characters of escape sequences.
+
+These are the values of ``pyte.escape``, which outta's parser was based on, kept here so that
+importing outta doesn't import pyte. Like those in ``control``, they're copied from pyte and checked
+against it by the tests. Note that some characters mean different things after ``ESC``, ``ESC #``
+and ``CSI``.
+"""
+
+# Sequences of the form ``ESC <final>``.
+
+#: Reset to initial state.
+RIS = "c"
+
+#: Index: move down a line, scrolling at the bottom margin.
+IND = "D"
+
+#: Next line: a carriage return and a line feed.
+NEL = "E"
+
+#: Reverse index: move up a line, scrolling at the top margin.
+RI = "M"
+
+#: Set a tab stop at the cursor.
+HTS = "H"
+
+#: Save the cursor.
+DECSC = "7"
+
+#: Restore the cursor.
+DECRC = "8"
+
+# Sequences of the form ``ESC # <final>``.
+
+#: Fill the screen with "E"s.
+DECALN = "8"
+
+# Sequences of the form ``CSI <parameters> <final>``.
+
+#: Insert blank characters.
+ICH = "@"
+
+#: Cursor up.
+CUU = "A"
+
+#: Cursor down.
+CUD = "B"
+
+#: Cursor forward.
+CUF = "C"
+
+#: Cursor back.
+CUB = "D"
+
+#: Cursor to the start of a line below.
+CNL = "E"
+
+#: Cursor to the start of a line above.
+CPL = "F"
+
+#: Cursor to a column.
+CHA = "G"
+
+#: Cursor to a line and column.
+CUP = "H"
+
+#: Erase in display.
+ED = "J"
+
+#: Erase in line.
+EL = "K"
+
+#: Insert lines.
+IL = "L"
+
+#: Delete lines.
+DL = "M"
+
+#: Delete characters.
+DCH = "P"
+
+#: Erase characters.
+ECH = "X"
+
+#: Cursor forward, by "horizontal position relative".
+HPR = "a"
+
+#: Report device attributes.
+DA = "c"
+
+#: Cursor to a line, by "vertical position absolute".
+VPA = "d"
+
+#: Cursor down, by "vertical position relative".
+VPR = "e"
+
+#: Cursor to a line and column, by "horizontal and vertical position".
+HVP = "f"
+
+#: Clear tab stops.
+TBC = "g"
+
+#: Set modes.
+SM = "h"
+
+#: Reset modes.
+RM = "l"
+
+#: Select graphic rendition.
+SGR = "m"
+
+#: Report device status.
+DSR = "n"
+
+#: Set the top and bottom margins.
+DECSTBM = "r"
+
+#: Cursor to a column, by "horizontal position absolute". This is the same as pyte's, although
+#: ECMA-48 has "`" for it.
+HPA = "'"
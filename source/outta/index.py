@@ -0,0 +1,200 @@
+"""A seekable index of a capture file, for parsing from part way through it.
+
+Parsing a long capture to get at something near its end means parsing everything before it. An
+``Index`` is built in one pass over a file, and records checkpoints as it goes: the byte offset, the
+number of elements parsed before it, and a snapshot of the parser's state (see ``Parser.snapshot``).
+Parsing can then be resumed at the last checkpoint before any offset or element, so getting at any
+part of the file costs about as much as parsing the interval between checkpoints.
+
+The file is parsed a chunk at a time, and a ``Text`` run which spans two chunks becomes two elements.
+The elements (and their ordinals) from an index are always those of parsing the whole file in its
+chunks, however it's resumed.
+
+An index can be saved alongside its file as JSON.
+"""
+
+import bisect
+import json
+from typing import Iterator, List
+
+from . import elements
+from .parser import Parser, ParserState
+
+#: The default number of bytes between checkpoints.
+INTERVAL = 1024 * 1024
+
+#: The default number of bytes parsed at a time.
+CHUNK_SIZE = 64 * 1024
+
+
+class Checkpoint:
+    """A point in a file at which parsing can be resumed.
+
+    Args:
+        offset: The byte offset in the file.
+        ordinal: The number of elements parsed before the offset.
+        state: The state of the parser at the offset.
+    """
+
+    __slots__ = ("offset", "ordinal", "state")
+
+    def __init__(self, offset: int, ordinal: int, state: ParserState):
+        self.offset = offset
+        self.ordinal = ordinal
+        self.state = state
+
+    def __repr__(self):
+        return f"Checkpoint(offset={self.offset}, ordinal={self.ordinal})"
+
+
+class Index:
+    """Checkpoints for a file, from ``build`` or ``load``.
+
+    Args:
+        checkpoints: The checkpoints, in order, starting with one at offset 0.
+        chunk_size: The number of bytes the file was parsed a chunk at a time in.
+        size: The size of the file, in bytes.
+        count: The number of elements in the file.
+    """
+
+    def __init__(self, checkpoints: List[Checkpoint], chunk_size: int, size: int, count: int):
+        self.checkpoints = checkpoints
+        self.chunk_size = chunk_size
+        self.size = size
+        self.count = count
+        self._offsets = [checkpoint.offset for checkpoint in checkpoints]
+        self._ordinals = [checkpoint.ordinal for checkpoint in checkpoints]
+
+    @classmethod
+    def build(
+        cls, filename: str, interval: int = INTERVAL, element_interval: int = None, chunk_size: int = CHUNK_SIZE
+    ) -> "Index":
+        """Index a file.
+
+        A checkpoint is made after each chunk once ``interval`` bytes, or ``element_interval`` elements,
+        have been parsed since the last one.
+
+        Args:
+            filename: The file to index.
+            interval: The number of bytes between checkpoints.
+            element_interval: The number of elements between checkpoints, if that's reached first.
+            chunk_size: The number of bytes to parse at a time.
+
+        Returns:
+            The index.
+        """
+        parser = Parser()
+        checkpoints = [Checkpoint(0, 0, parser.snapshot())]
+        offset = ordinal = 0
+        with open(filename, mode="rb") as handle:
+            while True:
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    break
+                ordinal += sum(1 for _ in parser.feed_bytes(chunk))
+                offset += len(chunk)
+
+                last = checkpoints[-1]
+                if offset - last.offset >= interval or (
+                    element_interval is not None and ordinal - last.ordinal >= element_interval
+                ):
+                    checkpoints.append(Checkpoint(offset, ordinal, parser.snapshot()))
+
+        return cls(checkpoints, chunk_size, offset, ordinal)
+
+    def checkpoint_at(self, offset: int) -> Checkpoint:
+        "The last checkpoint at or before a byte offset."
+        return self.checkpoints[bisect.bisect_right(self._offsets, offset) - 1]
+
+    def checkpoint_for(self, ordinal: int) -> Checkpoint:
+        "The last checkpoint before the element with an ordinal."
+        return self.checkpoints[bisect.bisect_right(self._ordinals, ordinal) - 1]
+
+    def parse_from(self, filename: str, checkpoint: Checkpoint) -> Iterator[elements.Element]:
+        """Parse a file from a checkpoint to its end.
+
+        Args:
+            filename: The file which was indexed.
+            checkpoint: One of the checkpoints.
+
+        Returns:
+            An iterable of elements, starting with the one with ordinal ``checkpoint.ordinal``.
+        """
+        parser = Parser()
+        parser.restore(checkpoint.state)
+        with open(filename, mode="rb") as handle:
+            handle.seek(checkpoint.offset)
+            while True:
+                chunk = handle.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield from parser.feed_bytes(chunk)
+
+    def elements_at(self, filename: str, offset: int) -> Iterator[elements.Element]:
+        """Parse a file from the last checkpoint at or before a byte offset.
+
+        Args:
+            filename: The file which was indexed.
+            offset: The byte offset.
+
+        Returns:
+            An iterable of elements.
+        """
+        return self.parse_from(filename, self.checkpoint_at(offset))
+
+    def elements(self, filename: str, start: int = 0, stop: int = None) -> Iterator[elements.Element]:
+        """Get elements by their ordinals.
+
+        Args:
+            filename: The file which was indexed.
+            start: The ordinal of the first element.
+            stop: The ordinal after that of the last element. Defaults to the end of the file.
+
+        Returns:
+            An iterable of elements.
+        """
+        checkpoint = self.checkpoint_for(start)
+        ordinal = checkpoint.ordinal
+        for element in self.parse_from(filename, checkpoint):
+            if stop is not None and ordinal >= stop:
+                break
+            if ordinal >= start:
+                yield element
+            ordinal += 1
+
+    def save(self, path: str):
+        "Write the index to a JSON file."
+        document = {
+            "chunk_size": self.chunk_size,
+            "size": self.size,
+            "count": self.count,
+            "checkpoints": [
+                [
+                    checkpoint.offset,
+                    checkpoint.ordinal,
+                    checkpoint.state.use_utf8,
+                    checkpoint.state.taking_plain_text,
+                    checkpoint.state.buffer,
+                    checkpoint.state.undecoded.hex(),
+                    checkpoint.state.position,
+                ]
+                for checkpoint in self.checkpoints
+            ],
+        }
+        with open(path, mode="w", encoding="utf-8") as handle:
+            json.dump(document, handle)
+
+    @classmethod
+    def load(cls, path: str) -> "Index":
+        "Read an index from a JSON file written by ``save``."
+        with open(path, encoding="utf-8") as handle:
+            document = json.load(handle)
+        checkpoints = [
+            Checkpoint(
+                offset,
+                ordinal,
+                ParserState(use_utf8, taking_plain_text, buffer, bytes.fromhex(undecoded), position),
+            )
+            for offset, ordinal, use_utf8, taking_plain_text, buffer, undecoded, position in document["checkpoints"]
+        ]
+        return cls(checkpoints, document["chunk_size"], document["size"], document["count"])
@@ -0,0 +1,506 @@
+"""A compact binary file format for element streams, and an on-disk cache of parsed inputs.
+
+A file starts with ``MAGIC``, followed by blocks. Each block is the varint length of its data, and
+the data, compressed with zlib. That holds the varint length of the records for a run of elements,
+the records, and then the plain text those elements cover, encoded as UTF-8. A record is a varint
+code:
+
+- An even code, 2n, is a ``Text`` element of the next n characters of the block's text.
+- An odd code, 2n + 1, is the element in entry n of a table, which is built up as the file is read.
+- Code 0 adds an entry to the table. It's followed by the varint length of the entry, and the entry
+  itself: either ``STRING`` and a UTF-8 string, or a kind id (from ``columnar.KINDS``) and the
+  text, parameters and keywords of an element. An entry with a length of 0 instead clears the table,
+  which the writer does whenever it reaches ``MAX_ENTRIES``, so it doesn't grow without bound.
+
+An element's text is a varint length followed by the UTF-8 text. Parameters and keywords are each a
+varint count followed by the values (or name and value pairs). Integers are zigzag varints, and other
+strings are the index of their entry in the table. Keyword values are tagged with their type. A string
+keyword which is part of the element's text, as an OSC payload is, is stored as the offset and length
+of that part, rather than a second time. An element's entry is written just before the first record
+which uses it, and the entries of any strings in it just before that.
+
+Programs repeat the same sequences over and over, so most records are a single byte, and reading one
+gives an element which has already been built. Like the elements from a ``Parser`` with a cache, those
+elements are shared. ``Text`` elements refer to the decoded text of their block with an
+``elements.Span``, so it isn't copied out until it's read. Terminal output compresses well, so a file
+is usually several times smaller than the input it was parsed from.
+
+``ParseCache`` uses this format to keep the elements parsed from inputs, keyed by a hash of their
+content, so an input which has been seen before doesn't need to be parsed again.
+"""
+
+import hashlib
+import mmap
+import os
+import tempfile
+import zlib
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from . import elements
+from .columnar import KIND_IDS, KINDS
+from .parser import Parser
+
+#: The first bytes of a file.
+MAGIC = b"OUTTA-IR\x02"
+
+#: The kind id of an entry which is a string.
+STRING = 255
+
+#: The default number of characters of plain text after which a ``Writer`` starts a new block.
+BLOCK_SIZE = 64 * 1024
+
+#: The zlib compression level of blocks.
+COMPRESSION_LEVEL = 6
+
+#: The default number of entries after which a ``Writer`` clears the table. Its memory, and a
+#: reader's, is bounded by this many elements and strings.
+MAX_ENTRIES = 16 * 1024
+
+# Keyword value tags.
+_FALSE, _TRUE, _INTEGER, _STRING, _NONE, _SLICE = range(6)
+
+
+class FormatError(ValueError):
+    "The data is not in the IR format."
+
+
+def _write_varint(out, value):
+    "Append an unsigned varint to a bytearray."
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, offset):
+    "Read an unsigned varint, returning it and the offset after it."
+    byte = data[offset]
+    if byte < 0x80:
+        return byte, offset + 1
+    value = byte & 0x7F
+    shift = 7
+    while True:
+        offset += 1
+        byte = data[offset]
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset + 1
+        shift += 7
+
+
+def _zigzag(value):
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+class Writer:
+    """Write elements to a binary stream, a block at a time.
+
+    Use it as a context manager, or call ``close`` when done, to write the last block.
+
+    Args:
+        stream: A binary file object to write to.
+        block_size: The number of characters of plain text after which to start a new block.
+        max_entries: The number of entries after which to clear the table. The table can go over
+            this by the entries for one element.
+    """
+
+    def __init__(self, stream: BinaryIO, block_size: int = BLOCK_SIZE, max_entries: int = MAX_ENTRIES):
+        self.stream = stream
+        self.block_size = block_size
+        self.max_entries = max_entries
+        self._entries = {}
+        self._strings = {}
+        self._records = bytearray()
+        self._text = []
+        self._text_length = 0
+        stream.write(MAGIC)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, items: Iterable[elements.Element]):
+        """Write some elements.
+
+        Args:
+            items: An iterable of elements.
+        """
+        for element in items:
+            self._write(element)
+
+    def _write(self, element):
+        element_type = type(element)
+        if element_type is elements.Text and not element.parameters:
+            text = element.text
+            if text:
+                _write_varint(self._records, len(text) << 1)
+                self._text.append(text)
+                self._text_length += len(text)
+                if self._text_length >= self.block_size:
+                    self.flush()
+                return
+
+        keywords = element.keywords
+        key = (element_type, element.parameters, tuple(keywords.items()) if keywords else (), element.text)
+        index = self._entries.get(key)
+        if index is None:
+            if len(self._entries) + len(self._strings) >= self.max_entries:
+                self._clear_table()
+            index = self._add_entry(self._entry(key), self._entries, key)
+        _write_varint(self._records, index << 1 | 1)
+
+    def flush(self):
+        "Write out the current block."
+        if not self._records:
+            return
+        block = bytearray()
+        _write_varint(block, len(self._records))
+        block += self._records
+        block += "".join(self._text).encode("utf-8", "surrogatepass")
+        block = zlib.compress(block, COMPRESSION_LEVEL)
+        header = bytearray()
+        _write_varint(header, len(block))
+        self.stream.write(header)
+        self.stream.write(block)
+        self._records = bytearray()
+        self._text = []
+        self._text_length = 0
+
+    def close(self):
+        "Write out the last block."
+        self.flush()
+
+    def _add_entry(self, entry, index, key):
+        "Write an entry to the table, recording its index under ``key`` in ``index``."
+        records = self._records
+        records.append(0)
+        _write_varint(records, len(entry))
+        records += entry
+        index[key] = len(self._entries) + len(self._strings)
+        return index[key]
+
+    def _clear_table(self):
+        self._records += b"\x00\x00"
+        self._entries.clear()
+        self._strings.clear()
+
+    def _string(self, value):
+        "The index of a string in the table, adding it if it's new."
+        index = self._strings.get(value)
+        if index is None:
+            index = self._add_entry(bytes([STRING]) + value.encode("utf-8", "surrogatepass"), self._strings, value)
+        return index
+
+    def _entry(self, key):
+        element_type, parameters, keywords, text = key
+        try:
+            kind = KIND_IDS[element_type]
+        except KeyError:
+            raise TypeError(f"{element_type.__name__} can't be written") from None
+
+        entry = bytearray([kind])
+        encoded = text.encode("utf-8", "surrogatepass")
+        _write_varint(entry, len(encoded))
+        entry += encoded
+
+        _write_varint(entry, len(parameters))
+        for parameter in parameters:
+            _write_varint(entry, self._string(parameter) if isinstance(parameter, str) else _zigzag(parameter))
+
+        _write_varint(entry, len(keywords))
+        for name, value in keywords:
+            _write_varint(entry, self._string(name))
+            if value is None:
+                entry.append(_NONE)
+            elif value is True or value is False:
+                entry.append(_TRUE if value else _FALSE)
+            elif isinstance(value, int):
+                entry.append(_INTEGER)
+                _write_varint(entry, _zigzag(value))
+            else:
+                start = text.find(value)
+                if start >= 0:
+                    entry.append(_SLICE)
+                    _write_varint(entry, start)
+                    _write_varint(entry, len(value))
+                else:
+                    entry.append(_STRING)
+                    _write_varint(entry, self._string(value))
+
+        return bytes(entry)
+
+
+def dump(
+    items: Iterable[elements.Element], stream: BinaryIO, block_size: int = BLOCK_SIZE, max_entries: int = MAX_ENTRIES
+):
+    """Write a stream of elements to a binary file object.
+
+    Args:
+        items: An iterable of elements.
+        stream: A binary file object to write to.
+        block_size: As for ``Writer``.
+        max_entries: As for ``Writer``.
+    """
+    with Writer(stream, block_size, max_entries) as writer:
+        writer.write(items)
+
+
+def loads(data) -> Iterator[elements.Element]:
+    """Read elements from data in the IR format.
+
+    The elements are produced as they are read, a block at a time.
+
+    Args:
+        data: A bytes-like object, e.g. ``bytes`` or an ``mmap``.
+
+    Returns:
+        An iterable of elements.
+
+    Raises:
+        FormatError: The data doesn't start with ``MAGIC``.
+    """
+    if data[: len(MAGIC)] != MAGIC:
+        raise FormatError("not an outta IR file")
+
+    text_type = elements.Text
+    span = elements.Span
+    table = []
+    offset = len(MAGIC)
+    length = len(data)
+    while offset < length:
+        block_length, offset = _read_varint(data, offset)
+        block = zlib.decompress(data[offset : offset + block_length])
+        offset += block_length
+
+        records_length, position = _read_varint(block, 0)
+        records_end = position + records_length
+        text = block[records_end:].decode("utf-8", "surrogatepass")
+
+        text_position = 0
+        while position < records_end:
+            code = block[position]
+            if code < 0x80:
+                position += 1
+            else:
+                code, position = _read_varint(block, position)
+
+            if code & 1:
+                yield table[code >> 1]
+            elif code:
+                end = text_position + (code >> 1)
+                yield text_type((), None, span(text, text_position, end))
+                text_position = end
+            else:
+                entry_length, position = _read_varint(block, position)
+                if entry_length:
+                    table.append(_decode_entry(block[position : position + entry_length], table))
+                    position += entry_length
+                else:
+                    table.clear()
+
+
+def _decode_entry(entry, table):
+    "Decode an entry, with strings from the table so far."
+    if entry[0] == STRING:
+        return entry[1:].decode("utf-8", "surrogatepass")
+
+    element_type = KINDS[entry[0]]
+    length, offset = _read_varint(entry, 1)
+    text = entry[offset : offset + length].decode("utf-8", "surrogatepass")
+    offset += length
+
+    count, offset = _read_varint(entry, offset)
+    parameters = []
+    for _ in range(count):
+        value, offset = _read_varint(entry, offset)
+        parameters.append(table[value] if element_type is elements.Text else _unzigzag(value))
+
+    count, offset = _read_varint(entry, offset)
+    keywords = {}
+    for _ in range(count):
+        name, offset = _read_varint(entry, offset)
+        tag = entry[offset]
+        offset += 1
+        if tag == _INTEGER or tag == _STRING:
+            value, offset = _read_varint(entry, offset)
+            value = _unzigzag(value) if tag == _INTEGER else table[value]
+        elif tag == _SLICE:
+            start, offset = _read_varint(entry, offset)
+            length, offset = _read_varint(entry, offset)
+            value = text[start : start + length]
+        else:
+            value = {_FALSE: False, _TRUE: True, _NONE: None}[tag]
+        keywords[table[name]] = value
+
+    return element_type(parameters, keywords, text)
+
+
+def load(filename: str) -> Iterator[elements.Element]:
+    """Read elements from a file in the IR format.
+
+    The file is memory-mapped, and elements are produced as they are read.
+
+    Args:
+        filename: The name of the file.
+
+    Returns:
+        An iterable of elements.
+    """
+    with open(filename, mode="rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            raise FormatError("not an outta IR file")
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from loads(data)
+
+
+def default_cache_directory() -> str:
+    "Where ``ParseCache`` keeps its files by default: $OUTTA_CACHE_DIR, or outta in the user's cache directory."
+    directory = os.environ.get("OUTTA_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "outta")
+
+
+class ParseCache:
+    """An on-disk cache of the elements parsed from inputs, keyed by a hash of the input's content.
+
+    Inputs are parsed by a default ``Parser``, with ``Parser.feed_bytes``. Entries are written to a
+    temporary file and then renamed into place, so several processes can share a cache.
+
+    Args:
+        directory: Where to keep the cache. Defaults to ``default_cache_directory()``.
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory or default_cache_directory()
+
+    def path(self, key: str) -> str:
+        "The file holding the entry for a key."
+        return os.path.join(self.directory, key[:2], key[2:] + ".ir")
+
+    @staticmethod
+    def key(chunks: Iterable[bytes]) -> str:
+        "The key for an input, from the chunks of its content."
+        digest = _digest()
+        for chunk in chunks:
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Iterator[elements.Element]]:
+        """Load the elements for an input.
+
+        Returns:
+            An iterable of the elements, or None if the input isn't in the cache.
+        """
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        return load(path)
+
+    def put(self, key: str, items: Iterable[elements.Element]) -> Iterator[elements.Element]:
+        """Add the elements for an input, passing them through.
+
+        The entry is only added once all the elements have been consumed.
+
+        Returns:
+            An iterable of the elements.
+        """
+        return self._store(items, lambda: key)
+
+    def _store(self, items, key):
+        """Add elements under a key which is only known once they've all been consumed.
+
+        Args:
+            items: An iterable of elements.
+            key: A callable giving the key.
+
+        Returns:
+            An iterable of the elements.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        handle = tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False)
+        try:
+            with handle, Writer(handle) as writer:
+                for element in items:
+                    writer._write(element)
+                    yield element
+            path = self.path(key())
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(handle.name, path)
+        finally:
+            if os.path.exists(handle.name):
+                os.unlink(handle.name)
+
+    def parse_bytes(self, data: bytes) -> Iterator[elements.Element]:
+        """Parse some bytes, or load their elements if they've been parsed before.
+
+        Returns:
+            An iterable of elements, as ``Parser().feed_bytes(data)`` would give.
+        """
+        key = self.key((data,))
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        return self.put(key, Parser().feed_bytes(data))
+
+    def parse_file(self, filename: str, chunk_size: int = 64 * 1024) -> Iterator[elements.Element]:
+        """Parse a file, or load its elements if it's been parsed before.
+
+        The file is read twice the first time it's seen: once to hash it, and once to parse it. The
+        elements are stored under the hash of what was parsed, which is only different if the file
+        changed in between (e.g. a capture which is still being written).
+
+        Returns:
+            An iterable of elements, as feeding the whole file to ``Parser.feed_bytes`` would give,
+            whatever the ``chunk_size``.
+        """
+        cached = self.get(self.key(_read_chunks(filename, chunk_size)))
+        if cached is not None:
+            return cached
+
+        digest = _digest()
+
+        def parse():
+            parser = Parser()
+            for chunk in _read_chunks(filename, chunk_size):
+                digest.update(chunk)
+                yield from parser.feed_bytes(chunk)
+
+        return self._store(_join_text(parse()), digest.hexdigest)
+
+
+def _digest():
+    return hashlib.sha256(MAGIC)
+
+
+def _join_text(items):
+    """Join adjacent plain ``Text`` elements, as they are when the input is parsed in chunks but
+    wouldn't be if it were parsed all at once."""
+    text_type = elements.Text
+    texts = []
+    for element in items:
+        if type(element) is text_type and not element.parameters:
+            texts.append(element.text)
+            continue
+        if texts:
+            yield text_type((), None, "".join(texts))
+            texts.clear()
+        yield element
+    if texts:
+        yield text_type((), None, "".join(texts))
+
+
+def _read_chunks(filename, chunk_size):
+    with open(filename, mode="rb") as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,220 @@
+"""Counters for what a ``Parser`` does, for monitoring it in production.
+
+A ``Parser`` given a ``Metrics`` swaps in counting versions of the few helpers its hot loop calls, so
+a parser without one runs exactly the same code as it always has, and pays nothing for this.
+
+The counters show how much of the input takes each path through the parser: plain text matched by
+``Parser._text_pattern``, whole sequences matched by ``Parser._sequence_pattern``, and everything
+else, which goes through the FSM a character at a time. Inputs which fall off the fast paths show up
+as a high ``fsm_characters``.
+"""
+
+import time
+from collections import Counter
+from typing import Any, Callable, Dict
+
+from . import control as ctrl
+from . import elements
+
+#: The names of the dispatch tables, by the second character of an escape sequence.
+_ESCAPE_TABLES = {"[": "csi", "]": "osc", "#": "sharp", "%": "percent"}
+
+#: The names of the dispatch tables, by the ``lastindex`` of a ``Parser._sequence_pattern`` match.
+_MATCH_TABLES = {3: "csi", 7: "osc", 8: "escape", 9: "basic"}
+
+
+class Metrics:
+    """Counters for one or more parsers.
+
+    Pass one to ``Parser(metrics=...)``. The counters can be read directly, or with ``as_dict``, or
+    pushed to an ``exporter``.
+
+    Args:
+        exporter: If given, this is called with ``as_dict()`` after a call to ``feed`` (or
+            ``feed_bytes``, etc.) when at least ``export_interval`` seconds have passed since the last
+            time it was called.
+        export_interval: The minimum number of seconds between calls to ``exporter``.
+
+    Attributes:
+        text_characters: Characters of plain text matched by the parser's text pattern.
+        sequence_characters: Characters of sequences matched whole by the parser's sequence pattern.
+        fsm_characters: Characters sent to the FSM one at a time.
+        tables: The number of sequences found with each dispatch table: "basic", "escape", "csi",
+            "sharp", "percent" and "osc". Characters which end a run of ignored ones count as "text".
+        debug: The number of ``Debug`` elements, for sequences which weren't recognized or were too
+            long.
+        fsm_resets: The number of times the FSM was reset after an exception.
+        lengths: A histogram of the lengths of sequences: the number of sequences whose length needs
+            each number of bits, i.e. is between ``2 ** (bits - 1)`` and ``2 ** bits - 1``.
+    """
+
+    def __init__(self, exporter: Callable[[Dict[str, Any]], None] = None, export_interval: float = 10.0):
+        self.exporter = exporter
+        self.export_interval = export_interval
+        self._exported = time.monotonic()
+        self.reset()
+
+    def reset(self):
+        "Set all the counters to zero."
+        self.text_characters = 0
+        self.sequence_characters = 0
+        self.fsm_characters = 0
+        self.tables = Counter()
+        self.debug = 0
+        self.fsm_resets = 0
+        self.lengths = Counter()
+
+    def as_dict(self) -> Dict[str, Any]:
+        "The counters, as a dict of plain values."
+        return {
+            "text_characters": self.text_characters,
+            "sequence_characters": self.sequence_characters,
+            "fsm_characters": self.fsm_characters,
+            "tables": dict(self.tables),
+            "debug": self.debug,
+            "fsm_resets": self.fsm_resets,
+            "lengths": {f"<{2 ** bits}": count for bits, count in sorted(self.lengths.items())},
+        }
+
+    def export(self):
+        "Call the exporter now."
+        self._exported = time.monotonic()
+        if self.exporter is not None:
+            self.exporter(self.as_dict())
+
+    def _count_sequence(self, table, length, debug):
+        self.tables[table] += 1
+        self.lengths[length.bit_length()] += 1
+        if debug:
+            self.debug += 1
+
+    def _fed(self):
+        if self.exporter is not None and time.monotonic() - self._exported >= self.export_interval:
+            self.export()
+
+    def attach(self, parser):
+        """Start counting what a parser does.
+
+        This is done by ``Parser`` when it's given metrics.
+        """
+        _MeteredParser(self, parser)
+
+
+class _MeteredPattern:
+    "Stands in for a compiled pattern, calling ``on_match`` with the matches of its ``match`` method."
+
+    __slots__ = ("pattern", "on_match")
+
+    def __init__(self, pattern, on_match):
+        self.pattern = pattern
+        self.on_match = on_match
+
+    def match(self, data, offset):
+        match = self.pattern.match(data, offset)
+        if match is not None:
+            self.on_match(match)
+        return match
+
+
+class _MeteredParser:
+    """Counting versions of a parser's helpers.
+
+    These are set as attributes of the parser, where they take the place of its methods and class
+    attributes.
+    """
+
+    def __init__(self, metrics, parser):
+        self.metrics = metrics
+        self.parser = parser
+        self.basic = parser.basic
+        # The first two characters and the length of the text sent to the FSM since it last produced
+        # an element, which are all that's needed to count it. The text itself isn't kept, since
+        # adding each character to it would take time proportional to its length.
+        self.sequence_start = ""
+        self.sequence_length = 0
+
+        self.send_to_parser = parser._send_to_parser
+        self.reset_fsm = parser._reset_fsm
+        self.restore = parser.restore
+        self.tokens = parser._tokens
+
+        parser._text_pattern = _MeteredPattern(parser._text_pattern, self.on_text)
+        parser._sequence_pattern = _MeteredPattern(parser._sequence_pattern, self.on_sequence)
+        parser._send_to_parser = self.on_send
+        parser._reset_fsm = self.on_reset_fsm
+        parser.restore = self.on_restore
+        parser._tokens = self.on_tokens
+
+    def on_text(self, match):
+        self.metrics.text_characters += match.end() - match.start()
+
+    def on_sequence(self, match):
+        length = match.end() - match.start()
+        max_scan_length = self.parser._max_scan_length
+        if max_scan_length is not None and length > max_scan_length:
+            # The parser won't use this match.
+            return
+
+        kind = match.lastindex
+        table = "sharp" if kind == 5 and match.group(4) == "#" else _MATCH_TABLES.get(kind, "percent")
+        self.metrics.sequence_characters += length
+        self.metrics._count_sequence(table, length, self.parser._sequence_type(match) is elements.Debug)
+
+    def on_send(self, char):
+        metrics = self.metrics
+        metrics.fsm_characters += 1
+        length = self.sequence_length + 1
+        start = self.sequence_start if length > 2 else self.sequence_start + char
+        # Cleared first so that, if the FSM is reset after an exception, this isn't counted as too long.
+        self.sequence_start = ""
+        self.sequence_length = 0
+        try:
+            result = self.send_to_parser(char)
+        except Exception:
+            metrics.fsm_resets += 1
+            raise
+
+        if result is None:
+            self.sequence_start = start
+            self.sequence_length = length
+            return None
+
+        element_type = result[0]
+        if element_type is elements.Text:
+            table = "text"
+        elif self.basic.get(char) is element_type:
+            table = "basic"
+        else:
+            table = self.table(start)
+        metrics._count_sequence(table, length, element_type is elements.Debug)
+        return result
+
+    @staticmethod
+    def table(sequence):
+        "The name of the dispatch table for a sequence, from its first two characters."
+        if sequence[0] == ctrl.ESC:
+            return _ESCAPE_TABLES.get(sequence[1:2], "escape")
+        elif sequence[0] == ctrl.CSI_C1:
+            return "csi"
+        elif sequence[0] == ctrl.OSC_C1:
+            return "osc"
+        return "basic"
+
+    def on_reset_fsm(self):
+        if self.sequence_length:
+            # The parser gave up on a sequence which was too long.
+            self.metrics._count_sequence(self.table(self.sequence_start), self.sequence_length, True)
+        self.sequence_start = ""
+        self.sequence_length = 0
+        self.reset_fsm()
+
+    def on_restore(self, state):
+        self.sequence_start = ""
+        self.sequence_length = 0
+        self.restore(state)
+        self.sequence_start = state.buffer[:2]
+        self.sequence_length = len(state.buffer)
+
+    def on_tokens(self, *args, **kwargs):
+        yield from self.tokens(*args, **kwargs)
+        self.metrics._fed()
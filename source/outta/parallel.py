@@ -0,0 +1,196 @@
+"""Parse a large input across several processes.
+
+The input is split into parts of about ``PART_SIZE``, just before ESC characters, and each part is parsed
+by a fresh ``Parser`` in a process pool. A fresh parser starts in the ground state, so this gives the same
+elements as a serial parse as long as the serial parser would also be in the ground state at each split
+point. That is checked after the fact: if a part doesn't end in the ground state (e.g. the ESC it was split
+at turns out to be inside an OSC sequence), a parser in this process carries on from where it left off,
+and is fed the parts after it until it gets back to the ground state. So the result is always identical to
+parsing the whole input with a single ``Parser``.
+
+Workers send back what they find as a ``columnar.Table``, which is far smaller and quicker to pickle than
+a list of elements, and only a few parts per worker are in progress at a time, so the memory used doesn't
+grow with the size of the input.
+"""
+
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Sequence
+
+from . import columnar, elements
+from .parser import Parser
+
+ESC = "\x1b"
+
+#: The default size of the parts to split the input into, in characters for text and bytes for files.
+PART_SIZE = 1024 * 1024
+
+#: The number of parts in progress at a time for each worker.
+PARTS_PER_WORKER = 2
+
+
+def split_points(data: Sequence, parts: int) -> List[int]:
+    """Find offsets at which to split some data into roughly equal parts.
+
+    Each offset is that of an ESC, so a text run never spans two parts. In UTF-8 input this is also always a
+    character boundary.
+
+    Args:
+        data: A str, or a bytes-like object (e.g. an mmap) with a ``find`` method.
+        parts: The number of parts wanted. There may be fewer if there aren't enough ESCs.
+
+    Returns:
+        The offsets, in increasing order, not including 0 or ``len(data)``.
+    """
+    esc = ESC if isinstance(data, str) else ESC.encode("ascii")
+    length = len(data)
+    points = []
+    for part in range(1, parts):
+        point = data.find(esc, max(part * length // parts, points[-1] + 1 if points else 1))
+        if point == -1:
+            break
+        points.append(point)
+    return points
+
+
+def _part_count(length, part_size):
+    return max(1, -(-length // part_size))
+
+
+def _ended_in_ground_state(parser):
+    # Anything pending (part of a sequence, or part of a UTF-8 character) would have carried over into
+    # the next part.
+    return parser._taking_plain_text and parser.use_utf8 and not parser._decoder.getstate()[0]
+
+
+def _read_range(filename, start, end):
+    with open(filename, mode="rb") as handle:
+        handle.seek(start)
+        return handle.read(end - start)
+
+
+def _parse_text(text):
+    parser = Parser()
+    table = parser.feed_columnar(text)
+    return table, None, parser.snapshot(), _ended_in_ground_state(parser)
+
+
+def _parse_file_range(filename, start, end):
+    parser = Parser()
+    table = columnar.Table()
+    # The table's offsets refer to the decoded text, which is sent back with it.
+    texts = []
+    position = 0
+    for text, tokens in parser._byte_tokens(_read_range(filename, start, end)):
+        table._append_tokens(tokens, position)
+        texts.append(text)
+        position += len(text)
+    return table, "".join(texts), parser.snapshot(), _ended_in_ground_state(parser)
+
+
+def _carry_on_text(parser, text):
+    return parser.feed(text)
+
+
+def _carry_on_file(parser, filename, start, end):
+    return parser.feed_bytes(_read_range(filename, start, end))
+
+
+def _map(executor, function, arguments, in_flight):
+    """Like ``executor.map``, but with only ``in_flight`` calls submitted ahead of the results taken.
+
+    Returns:
+        An iterable of the results, in order.
+    """
+    pending = deque()
+    for args in arguments:
+        if len(pending) >= in_flight:
+            yield pending.popleft().result()
+        pending.append(executor.submit(function, *args))
+    while pending:
+        yield pending.popleft().result()
+
+
+def _merge(results, carry_on) -> Iterator[elements.Element]:
+    """Put together the results for each part, carrying on in this process where a part didn't end in the
+    ground state.
+
+    Args:
+        results: The (table, text, state, ended in ground state) result of each part, in order, where
+            ``text`` is what the offsets in the table refer to, and ``state`` is the snapshot of the parser at
+            the end of the part.
+        carry_on: A callable taking a parser and the index of a part, which feeds the part to the parser,
+            returning the elements.
+    """
+    parser = None
+    for index, (table, text, state, ground) in enumerate(results):
+        if parser is None:
+            yield from table.elements(text)
+            if not ground:
+                parser = Parser()
+                parser.restore(state)
+        else:
+            # The worker parsed this part from the ground state, which was wrong.
+            yield from carry_on(parser, index)
+            if _ended_in_ground_state(parser):
+                parser = None
+
+
+def parse(text: str, workers: int = None, part_size: int = PART_SIZE) -> List[elements.Element]:
+    """Parse some text using several processes.
+
+    Args:
+        text: The text to parse.
+        workers: The number of processes to use. Defaults to the number of CPUs.
+        part_size: The size of the parts to split the text into, in characters.
+
+    Returns:
+        The elements, exactly as ``list(Parser().feed(text))`` would give.
+    """
+    workers = workers or os.cpu_count()
+    bounds = [0] + split_points(text, _part_count(len(text), part_size)) + [len(text)]
+    pieces = [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+    def results(executor):
+        parsed = _map(executor, _parse_text, ((piece,) for piece in pieces), workers * PARTS_PER_WORKER)
+        for piece, (table, _, state, ground) in zip(pieces, parsed):
+            yield table, piece, state, ground
+
+    def carry_on(parser, index):
+        return _carry_on_text(parser, pieces[index])
+
+    with ProcessPoolExecutor(workers) as executor:
+        return list(_merge(results(executor), carry_on))
+
+
+def parse_file(filename: str, workers: int = None, part_size: int = PART_SIZE) -> Iterator[elements.Element]:
+    """Parse a file using several processes.
+
+    Each process reads its own part of the file, and elements are produced in order as the parts are
+    finished.
+
+    Args:
+        filename: The file to parse.
+        workers: The number of processes to use. Defaults to the number of CPUs.
+        part_size: The size of the parts to split the file into, in bytes.
+
+    Returns:
+        An iterable of elements, exactly as ``Parser().feed_bytes()`` would give for the whole file.
+    """
+    workers = workers or os.cpu_count()
+    with open(filename, mode="rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            points = split_points(data, _part_count(size, part_size))
+    bounds = [0] + points + [size]
+    ranges = [(filename, start, end) for start, end in zip(bounds, bounds[1:])]
+
+    def carry_on(parser, index):
+        return _carry_on_file(parser, *ranges[index])
+
+    with ProcessPoolExecutor(workers) as executor:
+        yield from _merge(_map(executor, _parse_file_range, ranges, workers * PARTS_PER_WORKER), carry_on)
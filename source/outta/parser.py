@@ -15,14 +15,89 @@ Also, this is beautiful: https://terminalguide.namepad.de/seq/
 
 from __future__ import absolute_import, unicode_literals
 
+import codecs
 import re
-from collections import defaultdict
 from typing import Iterable
 
-from pyte import control as ctrl
-from pyte import escape as esc
+from . import columnar, elements
+from . import control as ctrl
+from . import escape as esc
+from .cache import SequenceCache
 
-from . import elements
+
+def _sequence_pattern_source(csi_finals: str, basic: str, not_escapes: str = "") -> str:
+    """Build the regular expression for ``Parser._sequence_pattern``, or a variant of it.
+
+    Args:
+        csi_finals: The characters other than "@" to "~" which end a CSI sequence.
+        basic: The basic control characters to match, in group 9.
+        not_escapes: Characters which aren't matched after ESC as non-CSI escape sequences, as well
+            as those which start longer sequences.
+
+    Returns:
+        The pattern, which must be compiled with ``re.DOTALL``.
+    """
+    return (
+        # CSI: groups 1-3.
+        "(?:{ESC}\\[|{CSI_C1})(\\?)?([0-9;]*)([@-~{csi_finals}])"
+        # "sharp" and "select charset": groups 4-5.
+        "|{ESC}([#%])(.)"
+        # OSC: groups 6-7.
+        "|(?:{ESC}\\]|{OSC_C1})([012])([^{BEL}{ESC}{ST_C1}]*)(?:{BEL}|{ESC}\\\\|{ST_C1})"
+        # non-CSI escape sequences: group 8.
+        "|{ESC}([^\\[\\]#%(){not_escapes}])"
+        # basic control characters which are never ignored: group 9.
+        "|([{basic}])"
+    ).format(
+        ESC=ctrl.ESC,
+        CSI_C1=ctrl.CSI_C1,
+        OSC_C1=ctrl.OSC_C1,
+        ST_C1=ctrl.ST_C1,
+        BEL=ctrl.BEL,
+        csi_finals=re.escape(csi_finals),
+        not_escapes=re.escape(not_escapes),
+        basic=re.escape(basic),
+    )
+
+
+class ParserState:
+    """A snapshot of the state of a ``Parser``, from ``Parser.snapshot``.
+
+    This is everything which carries over from one call to ``feed`` (or ``feed_bytes``) to the next,
+    and it's made of plain values, so it can be stored and used to carry on parsing later, or in
+    another process.
+
+    Args:
+        use_utf8: The parser's ``use_utf8``.
+        taking_plain_text: Whether the parser is between sequences.
+        buffer: The text of the sequence being parsed, so far.
+        undecoded: Bytes of a partial UTF-8 character passed to ``feed_bytes``.
+        position: The number of characters fed so far.
+    """
+
+    __slots__ = ("use_utf8", "taking_plain_text", "buffer", "undecoded", "position")
+
+    def __init__(self, use_utf8: bool, taking_plain_text: bool, buffer: str, undecoded: bytes, position: int):
+        self.use_utf8 = use_utf8
+        self.taking_plain_text = taking_plain_text
+        self.buffer = buffer
+        self.undecoded = undecoded
+        self.position = position
+
+    def _fields(self):
+        return self.use_utf8, self.taking_plain_text, self.buffer, self.undecoded, self.position
+
+    def __eq__(self, rhs):
+        if not isinstance(rhs, ParserState):
+            return NotImplemented
+        return self._fields() == rhs._fields()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self.__slots__, self._fields()))
+        return f"ParserState({fields})"
+
+    def __reduce__(self):
+        return (ParserState, self._fields())
 
 
 class Parser:
@@ -33,8 +108,34 @@ class Parser:
     implementation, for debugging or understanding control sequences, or
     any number of other purposes.
 
+    By default there is no limit on the length of a control sequence. For long-running
+    parsers fed with untrusted input, the ``max_*`` arguments bound the memory a partial
+    sequence can use. When a sequence exceeds one of them, the text consumed so far is
+    emitted as an ``elements.Debug`` and parsing resumes in the ground state with the next
+    character. No input text is lost: joining the ``text`` of all elements still gives
+    back the input.
+
     Args:
         strict: check if a given screen implements all required events.
+        max_sequence_length: The maximum length of the text of a control sequence.
+        max_parameter_length: The maximum number of digits in a CSI parameter.
+        max_osc_length: The maximum length of the payload of an OSC sequence.
+        spans: If true, elements from ``feed`` (and ``feed_bytes``) refer to the text they were parsed
+            from with an ``elements.Span`` instead of a copy of it. The text is only copied out
+            when it's read, at the cost of keeping the fed data alive as long as its elements are.
+            This pays off when most element texts are never read.
+        cache_size: If given, ``feed`` keeps the elements for up to this many distinct control
+            sequences in ``cache`` (a ``cache.SequenceCache``), and reuses them when the same
+            sequences are seen again instead of parsing them.
+        types: If given, only elements of these types (``elements.Element`` subclasses) are produced,
+            by ``feed``, ``feed_bytes`` and ``feed_columnar``. Everything else is still parsed, so the
+            parser's state is the same, but is skipped without working out its parameters or building
+            an element for it. Leaving out ``elements.Text`` drops all plain text.
+        metrics: If given, a ``metrics.Metrics`` to count what the parser does. Without one, there is
+            no counting code in the parser's path at all.
+        errors: How ``feed_bytes`` decodes bytes which aren't valid UTF-8, as for ``bytes.decode``. With
+            "surrogateescape", each is kept as a lone surrogate, so that the text can be encoded back to
+            exactly the bytes it came from (but can't be printed as it is).
     """
 
     #: Control sequences, which don't require any arguments.
@@ -111,13 +212,78 @@ class Parser:
     _text_pattern = re.compile("[^" + "".join(map(re.escape, _special)) + "]+")
     del _special
 
-    def __init__(self, strict=True):
+    #: The characters other than "@" to "~" which end a CSI sequence.
+    _csi_finals = "".join(code for code in csi if not "@" <= code <= "~")
+
+    #: A regular expression pattern matching the complete control sequences that
+    #: ``feed`` recognizes in a single step. Anything it doesn't match (partial
+    #: sequences, unusual CSI forms, charset designations, etc.) is handed to
+    #: ``_parser_fsm`` one character at a time instead. Which alternative matched
+    #: is given by ``Match.lastindex``; see ``_dispatch_sequence``.
+    _sequence_pattern = re.compile(
+        _sequence_pattern_source(
+            csi_finals=_csi_finals,
+            basic="".join(char for char in basic if char not in (ctrl.SI, ctrl.SO)),
+        ),
+        re.DOTALL,
+    )
+
+    #: The element types for OSC sequences, by their code.
+    _osc_types = {
+        "0": elements.SetTitleAndIconName,
+        "1": elements.SetIconName,
+        "2": elements.SetTitle,
+    }
+
+    #: A bytes pattern matching the "select charset" sequences that can change how
+    #: ``feed_bytes`` decodes what follows them.
+    _select_charset_pattern = re.compile(b"\x1b%.", re.DOTALL)
+
+    #: What ends an OSC sequence.
+    _OSC_TERMINATORS = frozenset([ctrl.ST_C0, ctrl.ST_C1, ctrl.BEL])
+
+    #: A pattern matching the start of a partial sequence which leaves the FSM in ``_osc_fsm``: the OSC
+    #: and its code. See ``restore``.
+    _partial_osc_pattern = re.compile(f"(?:{ctrl.ESC}\\]|{ctrl.OSC_C1})([^RP])", re.DOTALL)
+
+    def __init__(
+        self,
+        strict=True,
+        max_sequence_length=None,
+        max_parameter_length=None,
+        max_osc_length=None,
+        spans=False,
+        cache_size=None,
+        types=None,
+        metrics=None,
+        errors="replace",
+    ):
         self.strict = strict
+        self.spans = spans
+        self.types = None if types is None else frozenset(types)
+        self.cache = SequenceCache(cache_size) if cache_size else None
         self.use_utf8 = True
+        self.max_sequence_length = max_sequence_length
+        self.max_parameter_length = max_parameter_length
+        self.max_osc_length = max_osc_length
+
+        # Sequences no longer than this can't hit any of the limits, so they can take the
+        # fast path in ``feed``.
+        limits = [limit for limit in (max_sequence_length, max_parameter_length, max_osc_length) if limit is not None]
+        self._max_scan_length = min(limits) if limits else None
+
+        self.errors = errors
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors=errors)
+
+        # The number of characters fed so far.
+        self._position = 0
 
         self._parser = None
         self._initialize_parser()
 
+        if metrics is not None:
+            metrics.attach(self)
+
     @property
     def use_utf8(self) -> bool:
         """Whether to operate in "utf8" mode.
@@ -140,31 +306,350 @@ class Parser:
         Returns:
             An iterable of Element's.
         """
+        if self.cache is not None:
+            yield from self._elements(data, self._tokens(data, self.cache, self.types))
+            return
+
+        if self.spans:
+            span = elements.Span
+            for element_type, parameters, keywords, start, end, prefix in self._tokens(data, types=self.types):
+                yield element_type(parameters, keywords, prefix + data[start:end] if prefix else span(data, start, end))
+            return
+
+        for element_type, parameters, keywords, start, end, prefix in self._tokens(data, types=self.types):
+            yield element_type(parameters, keywords, prefix + data[start:end])
+
+    def feed_columnar(self, data: str, table: columnar.Table = None) -> columnar.Table:
+        """Consume some data, recording what is found in a ``columnar.Table`` instead of as elements.
+
+        This is much cheaper than ``feed`` when you only need the kind, position and parameters
+        of what is in the data. Elements can still be built from the table when needed.
+
+        Args:
+            data: a blob of data to feed from.
+            table: The table to append to. If not provided, a new one is created.
+
+        Returns:
+            The table.
+        """
+        if table is None:
+            table = columnar.Table()
+        table._append_tokens(self._tokens(data, types=self.types), self._position)
+        return table
+
+    def _tokens(self, data, cache=None, types=None):
+        """Parse some data into tokens, without building elements from them.
+
+        This is the engine behind ``feed`` and the other ways of consuming what the parser finds.
+        Each token is a tuple of (element type, parameters, keywords, start, end, prefix). The text
+        of the token is ``prefix + data[start:end]``, where ``prefix`` is the part of a sequence that
+        was passed to earlier calls (and usually empty).
+
+        If a ``cache`` is given, complete sequences are looked up in it, and their tokens are instead
+        (element, None, None, start, end, "") where the element comes from the cache.
+
+        If ``types`` is given, only tokens for those element types are produced.
+
+        Args:
+            data: a blob of data to feed from.
+            cache: A ``SequenceCache``.
+            types: A set of element types.
+
+        Returns:
+            An iterable of tokens.
+        """
         send = self._send_to_parser
         match_text = self._text_pattern.match
+        match_sequence = self._sequence_pattern.match
+        dispatch_sequence = self._dispatch_sequence
+        sequence_type = self._sequence_type
+        want_text = types is None or elements.Text in types
+        max_scan_length = self._max_scan_length
+        max_sequence_length = self.max_sequence_length
         taking_plain_text = self._taking_plain_text
 
         length = len(data)
         offset = 0
 
+        # Where, in ``data``, the sequence currently being parsed starts. Any part of it from
+        # earlier calls is in ``self._buffer``.
+        start = 0
+
         while offset < length:
             if taking_plain_text:
                 match = match_text(data, offset)
                 if match:
                     start, offset = match.span()
-                    yield elements.Text((), {}, data[start:offset])
+                    if want_text:
+                        yield elements.Text, (), None, start, offset, ""
                 else:
                     taking_plain_text = False
-                    self._buffer = ""
+                    start = offset
             else:
-                self._buffer += data[offset]
+                if offset == start and not self._buffer:
+                    # The FSM is in its ground state, so try to take a whole
+                    # sequence in one step.
+                    match = match_sequence(data, offset)
+                    if match is not None and (max_scan_length is None or match.end() - offset <= max_scan_length):
+                        start, offset = match.span()
+                        taking_plain_text = True
+                        if types is not None and sequence_type(match) not in types:
+                            continue
+                        if cache is None:
+                            element_type, parameters, keywords = dispatch_sequence(match)
+                            yield element_type, parameters, keywords, start, offset, ""
+                        else:
+                            yield self._cached_element(match, cache), None, None, start, offset, ""
+                        continue
+
                 result = send(data[offset])
+                offset += 1
                 if result is not None:
-                    yield result[0](result[1], result[2], self._buffer)
+                    prefix = self._buffer
+                    self._buffer = ""
+                    if types is None or result[0] in types:
+                        yield result[0], result[1], result[2], start, offset, prefix
+                    taking_plain_text = True
+                elif max_sequence_length is not None and len(self._buffer) + offset - start >= max_sequence_length:
+                    # Give up on this sequence and start over in the ground state.
+                    prefix = self._buffer
+                    self._buffer = ""
+                    self._reset_fsm()
+                    if types is None or elements.Debug in types:
+                        yield elements.Debug, (), None, start, offset, prefix
                     taking_plain_text = True
-                offset += 1
 
+        if not taking_plain_text:
+            self._buffer += data[start:]
         self._taking_plain_text = taking_plain_text
+        self._position += length
+
+    def feed_bytes(self, data: bytes) -> Iterable[elements.Element]:
+        """Consume some bytes and advance the state as necessary.
+
+        The bytes are decoded incrementally: as UTF-8 when ``use_utf8`` is set, and as Latin-1
+        otherwise, so that 8-bit C1 control bytes are recognized. A multibyte character split
+        between calls is carried over to the next call. ``EnableUTF8Mode`` and ``DisableUTF8Mode``
+        elements set ``use_utf8``, and so the decoding, for the bytes that follow them.
+
+        Args:
+            data: a bytes-like object (e.g. ``bytes``, ``bytearray`` or ``memoryview``) to feed from.
+
+        Returns:
+            An iterable of Element's.
+        """
+        for text, tokens in self._byte_tokens(data, self.cache, self.types):
+            yield from self._elements(text, tokens)
+
+    def _elements(self, data, tokens):
+        """Build elements from tokens.
+
+        Args:
+            data: The data the tokens were parsed from.
+            tokens: The tokens, from ``_tokens``.
+
+        Returns:
+            An iterable of Element's.
+        """
+        span = elements.Span if self.spans else None
+        for element_type, parameters, keywords, start, end, prefix in tokens:
+            if parameters is None:
+                # An element from the cache.
+                yield element_type
+            elif prefix or span is None:
+                yield element_type(parameters, keywords, prefix + data[start:end])
+            else:
+                yield element_type(parameters, keywords, span(data, start, end))
+
+    def _byte_tokens(self, data, cache=None, types=None):
+        """Parse some bytes into tokens, without building elements from them.
+
+        This is the bytes counterpart of ``_tokens``; see ``feed_bytes`` for how the bytes are decoded.
+        The bytes are decoded a segment at a time, and the tokens of each segment must be consumed
+        before moving on to the next segment.
+
+        Args:
+            data: a bytes-like object to feed from.
+            cache: As for ``_tokens``.
+            types: As for ``_tokens``.
+
+        Returns:
+            An iterable of (text, tokens) pairs, one for each decoded segment, where ``text`` is the
+            decoded text to which the offsets of its ``tokens`` refer.
+        """
+        data = memoryview(data)
+        search_select_charset = self._select_charset_pattern.search
+        length = len(data)
+        offset = 0
+
+        # The charset selections are always needed, to know how to decode what follows them.
+        token_types = None if types is None else types | {elements.EnableUTF8Mode, elements.DisableUTF8Mode}
+
+        stop = self._split_select_charset(data)
+        while offset < length:
+            # Decode up to the end of the next "select charset" sequence, since the decoding
+            # of what follows it depends on its outcome.
+            if stop is None:
+                match = search_select_charset(data, offset)
+                stop = match.end() if match else length
+
+            text = self._decode(data[offset:stop])
+            yield text, self._select_charsets(self._tokens(text, cache, token_types), types)
+            offset, stop = stop, None
+
+    def _split_select_charset(self, data):
+        """Find the end of a "select charset" sequence which was split by the previous call.
+
+        Args:
+            data: The bytes fed in this call.
+
+        Returns:
+            The offset in ``data`` of the end of the sequence, or None if there isn't one.
+        """
+        pending = "" if self._taking_plain_text else self._buffer[-2:]
+        if pending.endswith(ctrl.ESC + "%"):
+            return 1
+        elif pending.endswith(ctrl.ESC) and data[:1] == b"%":
+            return 2
+        return None
+
+    def _select_charsets(self, tokens, types=None):
+        """Pass tokens through, switching ``use_utf8`` after those which select a charset.
+
+        If ``types`` is given, only tokens for those element types are passed through.
+        """
+        enable, disable = elements.EnableUTF8Mode, elements.DisableUTF8Mode
+        for token in tokens:
+            element_type = token[0] if token[1] is not None else type(token[0])
+            if types is None or element_type in types:
+                yield token
+            if element_type is enable:
+                self._select_utf8(True)
+            elif element_type is disable:
+                self._select_utf8(False)
+
+    def _decode(self, data):
+        if self.use_utf8:
+            return self._decoder.decode(data)
+        return codecs.latin_1_decode(data)[0]
+
+    def _select_utf8(self, flag):
+        # The decoder can't be holding part of a character here, since the "select charset"
+        # sequence we've just seen is ASCII.
+        self._decoder.reset()
+        self.use_utf8 = flag
+
+    def _cached_element(self, match, cache):
+        """Get the element for a match of ``_sequence_pattern`` from a cache, adding it if need be.
+
+        Only sequences matched by ``_sequence_pattern`` can be cached this way: their elements depend only
+        on their text, not on the state of the parser.
+        """
+        text = match.group()
+        element = cache.get(text)
+        if element is None:
+            element_type, parameters, keywords = self._dispatch_sequence(match)
+            element = element_type(parameters, keywords, text)
+            cache.put(text, element)
+        return element
+
+    def _sequence_type(self, match):
+        """Determine just the element type for a match of ``_sequence_pattern``.
+
+        This is the same as the type from ``_dispatch_sequence``, but much cheaper.
+        """
+        kind = match.lastindex
+        if kind == 3:
+            return self.csi.get(match.group(3), elements.Debug)
+        elif kind == 9:
+            return self.basic[match.group(9)]
+        elif kind == 8:
+            return self.escape.get(match.group(8), elements.Debug)
+        elif kind == 5:
+            introducer, code = match.group(4, 5)
+            mapping = self.sharp if introducer == "#" else self.percent
+            return mapping.get(code, elements.Debug)
+        return self._osc_types[match.group(6)]
+
+    def _dispatch_sequence(self, match):
+        """Determine the element for a match of ``_sequence_pattern``.
+
+        This must produce exactly what ``_parser_fsm`` would for the same text.
+
+        Args:
+            match: A match object from ``_sequence_pattern``.
+
+        Returns:
+            A tuple of (element type, parameters, keywords).
+        """
+        kind = match.lastindex
+        if kind == 3:
+            private, params, code = match.group(1, 2, 3)
+            if params:
+                params = [min(int(param or 0), 9999) for param in params.split(";")]
+            else:
+                params = [0]
+            return self.csi.get(code, elements.Debug), params, {"private": True} if private else {}
+        elif kind == 9:
+            return self.basic[match.group(9)], (), {}
+        elif kind == 8:
+            return self.escape.get(match.group(8), elements.Debug), (), {}
+        elif kind == 5:
+            introducer, code = match.group(4, 5)
+            mapping = self.sharp if introducer == "#" else self.percent
+            return mapping.get(code, elements.Debug), (), {}
+
+        code, param = match.group(6, 7)
+        param = param[1:]  # Drop the ;.
+        if code == "0":
+            return elements.SetTitleAndIconName, (), {"name": param, "title": param}
+        elif code == "1":
+            return elements.SetIconName, (), {"name": param}
+        return elements.SetTitle, (), {"title": param}
+
+    def snapshot(self) -> ParserState:
+        "Capture the state of the parser, so that it can be restored with ``restore``."
+        return ParserState(
+            self.use_utf8, self._taking_plain_text, self._buffer, self._decoder.getstate()[0], self._position
+        )
+
+    def restore(self, state: ParserState):
+        """Put the parser into a state captured by ``snapshot``, possibly from another parser.
+
+        What the parser makes of what it's fed next is then exactly what the parser the state was
+        captured from would have made of it (given the same options).
+
+        Args:
+            state: The state.
+        """
+        # The FSM's state is determined by the text it has been sent since it last produced an element,
+        # which is what is buffered, so it can be rebuilt by sending it that text again. With nothing
+        # buffered before or after, it's already in its ground state. An OSC sequence can be long (e.g.
+        # a clipboard or image payload), so the FSM is started inside one, rather than sent all of it.
+        buffer = state.buffer
+        rebuild = buffer or self._buffer
+
+        self.use_utf8 = state.use_utf8
+        self._taking_plain_text = state.taking_plain_text
+        self._buffer = state.buffer
+        self._position = state.position
+        self._decoder.reset()
+        self._decoder.setstate((state.undecoded, 0))
+
+        if not rebuild:
+            return
+        osc = self._partial_osc_pattern.match(buffer)
+        if osc is None:
+            self._reset_fsm()
+            replay = buffer
+        else:
+            # Inside an OSC, each ESC is taken with the character after it, so an odd number of them
+            # at the end means the last is waiting for its character.
+            param = buffer[osc.end() :]
+            replay = ctrl.ESC if (len(param) - len(param.rstrip(ctrl.ESC))) % 2 else ""
+            self._reset_fsm((osc.group(1), param[: len(param) - len(replay)]))
+        for char in replay:
+            self._parser.send(char)
 
     def _send_to_parser(self, data):
         try:
@@ -178,10 +663,13 @@ class Parser:
     def _initialize_parser(self):
         self._buffer = ""
         self._taking_plain_text = True
-        self._parser = self._parser_fsm()
+        self._reset_fsm()
+
+    def _reset_fsm(self, osc=None):
+        self._parser = self._parser_fsm(osc)
         next(self._parser)
 
-    def _parser_fsm(self):
+    def _parser_fsm(self, osc=None):
         """An FSM implemented as a coroutine.
 
         This generator is not the most beautiful, but it is as performant
@@ -189,9 +677,15 @@ class Parser:
         will be the bottleneck, because it processes just one character
         at a time.
 
-        Don't change anything without profiling first.
+        Don't change anything without profiling first. ``python -m benchmarks``
+        in the repository measures the parser over a range of typical inputs.
+
+        Args:
+            osc: If given, the FSM starts part way through an OSC sequence instead of in the ground
+                state, with these arguments for ``_osc_fsm``.
         """
         basic = self.basic
+        max_parameter_length = self.max_parameter_length
 
         ESC, CSI_C1 = ctrl.ESC, ctrl.CSI_C1
         OSC_C1 = ctrl.OSC_C1
@@ -199,23 +693,19 @@ class Parser:
         NUL_OR_DEL = ctrl.NUL + ctrl.DEL
         CAN_OR_SUB = ctrl.CAN + ctrl.SUB
         ALLOWED_IN_CSI = "".join([ctrl.BEL, ctrl.BS, ctrl.HT, ctrl.LF, ctrl.VT, ctrl.FF, ctrl.CR])
-        OSC_TERMINATORS = set([ctrl.ST_C0, ctrl.ST_C1, ctrl.BEL])
-
-        def create_dispatcher(mapping):
-            return defaultdict(lambda: elements.Debug, mapping)
 
-        basic_dispatch = create_dispatcher(basic)
-        sharp_dispatch = create_dispatcher(self.sharp)
-        escape_dispatch = create_dispatcher(self.escape)
-        csi_dispatch = create_dispatcher(self.csi)
-        percent_dispatch = create_dispatcher(self.percent)
+        # The tables are shared by every FSM, so look them up with ``get`` rather than building a
+        # ``defaultdict`` of each one per FSM.
+        Debug = elements.Debug
+        sharp_dispatch = self.sharp.get
+        escape_dispatch = self.escape.get
+        csi_dispatch = self.csi.get
+        percent_dispatch = self.percent.get
+        osc_fsm = self._osc_fsm
 
-        sequence_buffer = ""
-        result = None
+        result = None if osc is None else (yield from osc_fsm(*osc))
         while True:
             char = yield result
-            sequence_buffer += char
-
             result = None
 
             if char == ESC:
@@ -237,9 +727,9 @@ class Parser:
                     char = OSC_C1  # Go to OSC.
                 else:
                     if char == "#":
-                        result = sharp_dispatch[(yield)], (), {}
+                        result = sharp_dispatch((yield), Debug), (), {}
                     elif char == "%":
-                        result = percent_dispatch[(yield)], (), {}
+                        result = percent_dispatch((yield), Debug), (), {}
                     elif char in "()":
                         code = yield
                         if self.use_utf8:
@@ -247,9 +737,9 @@ class Parser:
 
                         # See http://www.cl.cam.ac.uk/~mgk25/unicode.html#term
                         # for the why on the UTF-8 restriction.
-                        result = "define_charset", (), {"code": code, "mode": char}
+                        result = elements.DefineCharset, (), {"code": code, "mode": char}
                     else:
-                        result = escape_dispatch[char], (), {}
+                        result = escape_dispatch(char, Debug), (), {}
                     continue  # Don't go to CSI.
 
             if char in basic:
@@ -259,7 +749,7 @@ class Parser:
                 if (char == ctrl.SI or char == ctrl.SO) and self.use_utf8:
                     continue
 
-                result = basic_dispatch[char], (), {}
+                result = basic[char], (), {}
             elif char == CSI_C1:
                 # All parameters are unsigned, positive decimal integers, with
                 # the most significant digit sent first. Any parameter greater
@@ -282,7 +772,7 @@ class Parser:
                     if char == "?":
                         private = True
                     elif char in ALLOWED_IN_CSI:
-                        result = basic_dispatch[char], (), {}
+                        result = basic[char], (), {}
                     elif char in SP_OR_GT:
                         pass  # Secondary DA is not supported atm.
                     elif char in CAN_OR_SUB:
@@ -294,6 +784,9 @@ class Parser:
                         break
                     elif char.isdigit():
                         current += char
+                        if max_parameter_length is not None and len(current) > max_parameter_length:
+                            result = elements.Debug, (), {}
+                            break
                     elif char == "$":
                         # XTerm-specific ESC]...$[a-z] sequences are not
                         # currently supported.
@@ -306,9 +799,9 @@ class Parser:
                             current = ""
                         else:
                             if private:
-                                result = csi_dispatch[char], params, {"private": True}
+                                result = csi_dispatch(char, Debug), params, {"private": True}
                             else:
-                                result = csi_dispatch[char], params, {}
+                                result = csi_dispatch(char, Debug), params, {}
                             break  # CSI is finished.
             elif char == OSC_C1:
                 code = yield
@@ -317,22 +810,40 @@ class Parser:
                 elif code == "P":
                     continue  # Set palette. Not implemented.
 
-                param = ""
-                while True:
-                    char = yield
-                    if char == ESC:
-                        char += yield
-                    if char in OSC_TERMINATORS:
-                        break
-                    else:
-                        param += char
-
-                param = param[1:]  # Drop the ;.
-                if code == "0":
-                    result = elements.SetTitleAndIconName, (), {"name": param, "title": param}
-                elif code == "1":
-                    result = elements.SetIconName, (), {"name": param}
-                elif code == "2":
-                    result = elements.SetTitle, (), {"title": param}
+                result = yield from osc_fsm(code, "")
             elif char not in NUL_OR_DEL:
                 result = elements.Text, char, {}
+
+    def _osc_fsm(self, code, param):
+        """The part of the FSM which takes the rest of an OSC sequence, after its code.
+
+        Args:
+            code: The character after the OSC.
+            param: What has been taken of the sequence after the code so far, which is all of it
+                except an ESC waiting for the character after it (see ``restore``).
+
+        Returns:
+            The FSM's result for the sequence.
+        """
+        ESC = ctrl.ESC
+        OSC_TERMINATORS = self._OSC_TERMINATORS
+        max_osc_length = self.max_osc_length
+
+        while True:
+            char = yield
+            if char == ESC:
+                char += yield
+            if char in OSC_TERMINATORS:
+                break
+            param += char
+            if max_osc_length is not None and len(param) > max_osc_length:
+                return elements.Debug, (), {}
+
+        param = param[1:]  # Drop the ;.
+        if code == "0":
+            return elements.SetTitleAndIconName, (), {"name": param, "title": param}
+        elif code == "1":
+            return elements.SetIconName, (), {"name": param}
+        elif code == "2":
+            return elements.SetTitle, (), {"title": param}
+        return None
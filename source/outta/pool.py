@@ -0,0 +1,154 @@
+"""Parse many concurrent streams (e.g. terminal sessions) with one parser.
+
+A ``Parser`` for each of thousands of sessions costs a live FSM generator and the parser's other
+attributes per session. A ``ParserPool`` instead keeps a single parser, and for each session only
+the ``ParserState`` it was left in (see ``Parser.snapshot``): a small slotted record of its mode,
+the partial sequence it's part way through, and its UTF-8 flag. Feeding a session restores its state
+into the parser, parses, and snapshots it again, so the elements are exactly those a ``Parser`` of
+its own would have produced. Feeding the session which was fed last carries on without restoring
+anything, and restoring a session part way through a long OSC sequence starts the parser inside it,
+rather than parsing the sequence again.
+
+A state is picklable, so a session which has gone idle can be evicted with ``evict`` and stored
+elsewhere, and later brought back with ``add``.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterator, List, Tuple
+
+from . import elements
+from .parser import Parser, ParserState
+
+#: The ``max_sequence_length`` of a pool's parser if one isn't given, so that one session can't use
+#: an unbounded amount of memory with a sequence which never ends.
+MAX_SEQUENCE_LENGTH = 64 * 1024
+
+
+class ParserPool:
+    """Parsers for many sessions, sharing one ``Parser``.
+
+    Sessions are created when they're first fed, and kept in the order they were last fed in.
+
+    Args:
+        parser: The parser to use for every session, which sets the options (``strict``,
+            ``max_sequence_length``, etc.) they're parsed with. If not provided, a new one is created,
+            with a ``max_sequence_length`` of ``MAX_SEQUENCE_LENGTH``.
+        max_sessions: If given, the least recently fed session is evicted whenever there would
+            otherwise be more sessions than this.
+        on_evict: If given, this is called with the session id and state of each session evicted
+            because of ``max_sessions``, e.g. to store it somewhere.
+    """
+
+    def __init__(
+        self,
+        parser: Parser = None,
+        max_sessions: int = None,
+        on_evict: Callable[[Hashable, ParserState], None] = None,
+    ):
+        self.parser = parser or Parser(max_sequence_length=MAX_SEQUENCE_LENGTH)
+        self.max_sessions = max_sessions
+        self.on_evict = on_evict
+        self._initial = self.parser.snapshot()
+        self._sessions = OrderedDict()
+        # The session the parser was last left in, and the state it was left in.
+        self._loaded = None, None
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self._sessions
+
+    def __iter__(self) -> Iterator[Hashable]:
+        "The session ids, from the least recently fed."
+        return iter(self._sessions)
+
+    def feed(self, session_id: Hashable, data: str) -> List[elements.Element]:
+        """Consume some data for a session. See ``Parser.feed``.
+
+        Args:
+            session_id: The session, which is created if it doesn't exist yet.
+            data: a blob of data to feed from.
+
+        Returns:
+            A list of elements.
+        """
+        parser = self._resume(session_id)
+        try:
+            return list(parser.feed(data))
+        finally:
+            self._suspend(session_id)
+
+    def feed_bytes(self, session_id: Hashable, data: bytes) -> List[elements.Element]:
+        """Consume some bytes for a session. See ``Parser.feed_bytes``.
+
+        Args:
+            session_id: The session, which is created if it doesn't exist yet.
+            data: The bytes.
+
+        Returns:
+            A list of elements.
+        """
+        parser = self._resume(session_id)
+        try:
+            return list(parser.feed_bytes(data))
+        finally:
+            self._suspend(session_id)
+
+    def state(self, session_id: Hashable) -> ParserState:
+        "The state of a session, without evicting it."
+        return self._sessions[session_id]
+
+    def add(self, session_id: Hashable, state: ParserState = None):
+        """Add a session, e.g. one which was evicted earlier.
+
+        Args:
+            session_id: The session.
+            state: Its state. If not provided, it starts in the same state as a new ``Parser``.
+        """
+        self._sessions[session_id] = self._initial if state is None else state
+        self._sessions.move_to_end(session_id)
+        self._evict_excess()
+
+    def evict(self, session_id: Hashable) -> ParserState:
+        """Remove a session.
+
+        Returns:
+            Its state, which can be given to ``add`` to carry on with it.
+        """
+        return self._sessions.pop(session_id)
+
+    def evict_idle(self, count: int) -> List[Tuple[Hashable, ParserState]]:
+        """Remove the least recently fed sessions.
+
+        Args:
+            count: The number of sessions to remove.
+
+        Returns:
+            A list of (session id, state) pairs, from the least recently fed.
+        """
+        sessions = self._sessions
+        return [sessions.popitem(last=False) for _ in range(min(count, len(sessions)))]
+
+    def _resume(self, session_id):
+        state = self._sessions.get(session_id, self._initial)
+        loaded_id, loaded_state = self._loaded
+        # If the session's state has been replaced since (with ``add``), the parser isn't in it.
+        if loaded_state is not state or loaded_id != session_id:
+            self.parser.restore(state)
+        return self.parser
+
+    def _suspend(self, session_id):
+        sessions = self._sessions
+        state = sessions[session_id] = self.parser.snapshot()
+        self._loaded = session_id, state
+        sessions.move_to_end(session_id)
+        self._evict_excess()
+
+    def _evict_excess(self):
+        if self.max_sessions is None:
+            return
+        while len(self._sessions) > self.max_sessions:
+            session_id, state = self._sessions.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(session_id, state)
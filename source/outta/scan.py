@@ -0,0 +1,182 @@
+"""Parse large, mostly-text buffers by indexing their control characters up front.
+
+``Parser.feed`` finds the end of each run of text with a regular expression match, and goes round
+its loop once for each text run and each control character. ``Scanner`` instead finds the positions
+of all the characters which can start a sequence or a control in one pass over the buffer, using
+NumPy when it's installed (``pip install outta[numpy]``), and then goes straight from one to the
+next. Between two characters which can start a sequence (ESC, CSI, OSC, NUL, etc.) there's only
+text and basic controls such as line feeds, which are turned into elements without going through
+the parser at all. Everything else is
+handed to the parser, so the elements are exactly those ``Parser.feed`` produces.
+
+This pays off most for large buffers of mostly plain text, e.g. logs (see ``benchmarks/scan.py``).
+Metrics given to the parser (see ``Parser(metrics=...)``) only count what is handed to it.
+"""
+
+import re
+from typing import Iterable, List
+
+from . import control as ctrl
+from . import elements
+from .parser import Parser
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depends on the environment
+    numpy = None
+
+#: Whether the control characters can be indexed with NumPy.
+HAVE_NUMPY = numpy is not None
+
+#: The shortest text to index with NumPy; shorter text is quicker to index with a regular expression.
+NUMPY_THRESHOLD = 4 * 1024
+
+#: The characters which end a run of text: those which start a sequence, and the basic controls.
+SPECIAL = frozenset(ctrl.ESC + ctrl.CSI_C1 + ctrl.OSC_C1 + ctrl.NUL + ctrl.DEL).union(Parser.basic)
+
+_special_pattern = re.compile("[{}]".format("".join(map(re.escape, sorted(SPECIAL)))))
+
+if HAVE_NUMPY:
+    # Whether each code point up to U+00FF is one of ``SPECIAL``, which are all below U+00FF.
+    _SPECIAL_TABLE = numpy.zeros(256, dtype=bool)
+    _SPECIAL_TABLE[sorted(map(ord, SPECIAL))] = True
+
+
+def control_positions(data: str, use_numpy: bool = None) -> List[int]:
+    """Find the positions of the characters in some text which end a run of plain text.
+
+    Args:
+        data: The text.
+        use_numpy: Whether to use NumPy. By default it's used, if it's installed, for text at least
+            ``NUMPY_THRESHOLD`` long.
+
+    Returns:
+        The offsets of the characters in ``SPECIAL``, in increasing order.
+    """
+    if use_numpy is None:
+        use_numpy = HAVE_NUMPY and len(data) >= NUMPY_THRESHOLD
+    if use_numpy:
+        if data.isascii():
+            # ASCII text is stored a byte per character, so encoding it is just a copy.
+            codes = numpy.frombuffer(data.encode("ascii"), dtype=numpy.uint8)
+        else:
+            # Other text is indexed a code point at a time. Everything above U+00FF is looked up as
+            # U+00FF, which isn't special.
+            codes = numpy.minimum(numpy.frombuffer(data.encode("utf-32-le", "surrogatepass"), dtype="<u4"), 0xFF)
+        return numpy.flatnonzero(_SPECIAL_TABLE[codes]).tolist()
+    return [match.start() for match in _special_pattern.finditer(data)]
+
+
+class Scanner:
+    """Parse text with a parser, taking the text and basic controls between sequences in bulk.
+
+    Args:
+        parser: The parser to use. If not provided, a new one is created. Its options are respected,
+            and it's left in the same state as if it had been fed the text itself.
+        use_numpy: Passed to ``control_positions``.
+    """
+
+    def __init__(self, parser: Parser = None, use_numpy: bool = None):
+        self.parser = parser or Parser()
+        self.use_numpy = use_numpy
+        # The basic controls the parser produces an element for straight away. Shifts aren't, since
+        # they're ignored in UTF-8 mode.
+        self._basic = {
+            char: element_type for char, element_type in self.parser.basic.items() if char not in (ctrl.SI, ctrl.SO)
+        }
+
+    def feed(self, data: str) -> Iterable[elements.Element]:
+        """Consume some text. See ``Parser.feed``.
+
+        Args:
+            data: a blob of data to feed from.
+
+        Returns:
+            An iterable of elements.
+        """
+        parser = self.parser
+        basic = self._basic
+        types = parser.types
+        cache = parser.cache
+        spans = parser.spans and cache is None
+        match_sequence = parser._sequence_pattern.match
+        max_scan_length = parser._max_scan_length
+        text_type = elements.Text
+        span = elements.Span
+        want_text = types is None or text_type in types
+
+        positions = control_positions(data, self.use_numpy)
+        count = len(positions)
+        length = len(data)
+        index = 0
+        offset = 0
+        # The number of characters fed to the parser, which counts them itself.
+        parsed = 0
+
+        while offset < length:
+            if parser._taking_plain_text and not parser._buffer:
+                # The parser is in its ground state, so take the text and basic controls up to the
+                # next character which could start a sequence.
+                while index < count and positions[index] < offset:
+                    index += 1
+                while index < count:
+                    position = positions[index]
+                    char = data[position]
+                    if char not in basic:
+                        break
+                    index += 1
+                    if position > offset and want_text:
+                        yield text_type((), None, span(data, offset, position) if spans else data[offset:position])
+                    element_type = basic[char]
+                    if types is None or element_type in types:
+                        yield element_type((), None, char)
+                    offset = position + 1
+                else:
+                    if offset < length and want_text:
+                        yield text_type((), None, span(data, offset, length) if spans else data[offset:])
+                    break
+
+                if position > offset:
+                    if want_text:
+                        yield text_type((), None, span(data, offset, position) if spans else data[offset:position])
+                    offset = position
+
+                # Take a whole sequence in one step, as ``Parser.feed`` does.
+                match = match_sequence(data, offset)
+                if match is not None and (max_scan_length is None or match.end() - offset <= max_scan_length):
+                    start, offset = match.span()
+                    if types is not None and parser._sequence_type(match) not in types:
+                        continue
+                    if cache is None:
+                        element_type, parameters, keywords = parser._dispatch_sequence(match)
+                        yield element_type(parameters, keywords, span(data, start, offset) if spans else match.group())
+                    else:
+                        yield parser._cached_element(match, cache)
+                    continue
+
+            # Anything else goes through the parser, up to the next character which could start
+            # another sequence. Text never runs past one of those, so this doesn't split any.
+            while index < count and (positions[index] <= offset or data[positions[index]] in basic):
+                index += 1
+            end = positions[index] if index < count else length
+            yield from parser.feed(data[offset:end])
+            parsed += end - offset
+            offset = end
+
+        parser._position += length - parsed
+
+    def feed_bytes(self, data: bytes) -> Iterable[elements.Element]:
+        """Consume some bytes, decoding them as ``Parser.feed_bytes`` does.
+
+        Args:
+            data: A bytes-like object, e.g. ``bytes`` or an ``mmap``.
+
+        Returns:
+            An iterable of elements.
+        """
+        parser = self.parser
+        if parser._select_charset_pattern.search(data) is not None or parser._split_select_charset(data) is not None:
+            # What follows a "select charset" sequence is decoded differently.
+            yield from parser.feed_bytes(data)
+        else:
+            yield from self.feed(parser._decode(data))
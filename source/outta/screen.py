@@ -0,0 +1,357 @@
+"""A virtual screen, driven by elements, which keeps track of which rows change.
+
+``Screen`` applies the elements from a ``Parser`` to a grid of character cells. It records which rows
+each element touches, so a consumer (e.g. a live dashboard) can ask for just the rows that changed
+since it last looked, and its rendering cost scales with the amount of change rather than with the
+size of the screen.
+
+Each row is a pair of arrays, one of characters (as code points) and one of styles (packed as by
+``outta.sgr``), so a screen costs 12 bytes per cell. Every character takes up one cell; wide characters
+and combining characters are not treated specially.
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+from . import elements, sgr
+
+# How to turn an array of code points into text, and back.
+_ENCODING = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+
+_SPACE = ord(" ")
+
+#: The default distance between tab stops.
+TAB_WIDTH = 8
+
+
+class Screen:
+    """A grid of character cells, to which elements are applied.
+
+    The cursor, scrolling region, tab stops and the current style are tracked, and lines always wrap.
+    Elements which don't affect what's on the screen (e.g. titles and modes) are ignored.
+
+    Args:
+        columns: The width of the screen.
+        lines: The height of the screen.
+
+    Attributes:
+        x: The column of the cursor, counting from 0. It's ``columns`` when the last character drawn
+            was in the last column, in which case the next one is drawn at the start of the next line.
+        y: The row of the cursor, counting from 0.
+        style: The current style, packed as by ``outta.sgr``.
+        dirty: The rows which have changed since ``changes`` was last called.
+    """
+
+    def __init__(self, columns: int = 80, lines: int = 24):
+        self.columns = columns
+        self.lines = lines
+        self._sgr = sgr.SGRDecoder()
+        self._handlers = {
+            elements.Text: self._text,
+            elements.CarriageReturn: self._carriage_return,
+            elements.LineFeed: self._index,
+            elements.Index: self._index,
+            elements.ReverseIndex: self._reverse_index,
+            elements.Backspace: self._backspace,
+            elements.Tab: self._tab,
+            elements.SetTabStop: self._set_tab_stop,
+            elements.ClearTabStop: self._clear_tab_stop,
+            elements.CursorPosition: self._cursor_position,
+            elements.CursorUp: self._cursor_up,
+            elements.CursorDown: self._cursor_down,
+            elements.CursorUp1: self._cursor_up1,
+            elements.CursorDown1: self._cursor_down1,
+            elements.CursorForward: self._cursor_forward,
+            elements.CursorBack: self._cursor_back,
+            elements.CursorToColumn: self._cursor_to_column,
+            elements.CursorToLine: self._cursor_to_line,
+            elements.EraseInLine: self._erase_in_line,
+            elements.EraseInDisplay: self._erase_in_display,
+            elements.EraseCharacters: self._erase_characters,
+            elements.InsertCharacters: self._insert_characters,
+            elements.DeleteCharacters: self._delete_characters,
+            elements.InsertLines: self._insert_lines,
+            elements.DeleteLines: self._delete_lines,
+            elements.SetMargins: self._set_margins,
+            elements.SelectGraphicRendition: self._select_graphic_rendition,
+            elements.SaveCursor: self._save_cursor,
+            elements.RestoreCursor: self._restore_cursor,
+            elements.AlignmentDisplay: self._alignment_display,
+            elements.Reset: self._reset,
+        }
+        self._reset(None)
+
+    def feed(self, items: Iterable[elements.Element]):
+        """Apply some elements to the screen.
+
+        Args:
+            items: An iterable of elements, e.g. from ``Parser.feed``.
+        """
+        handlers = self._handlers
+        for element in items:
+            handler = handlers.get(type(element))
+            if handler is not None:
+                handler(element)
+
+    def line(self, y: int) -> str:
+        "The text of a row."
+        return self._characters[y].tobytes().decode(_ENCODING)
+
+    @property
+    def display(self) -> List[str]:
+        "The text of every row."
+        return [self.line(y) for y in range(self.lines)]
+
+    def changes(self) -> Dict[int, Tuple[str, array]]:
+        """Get the rows which have changed since the last call, and forget about those changes.
+
+        Returns:
+            A dict mapping the index of each changed row, in order, to its text and a copy of the styles
+            of its cells.
+        """
+        rows = {y: (self.line(y), array("Q", self._cell_styles[y])) for y in sorted(self.dirty)}
+        self.dirty = set()
+        return rows
+
+    def _blank_row(self):
+        return array("I", [_SPACE]) * self.columns, array("Q", [self.style]) * self.columns
+
+    def _erase(self, y, start, end):
+        "Blank the cells of a row from ``start`` up to ``end``."
+        count = end - start
+        if count > 0:
+            self._characters[y][start:end] = array("I", [_SPACE]) * count
+            self._cell_styles[y][start:end] = array("Q", [self.style]) * count
+            self.dirty.add(y)
+
+    def _scroll_up(self, top, bottom, count):
+        "Move rows ``top`` to ``bottom`` (inclusive) up by ``count``, blanking those at the bottom."
+        count = min(count, bottom - top + 1)
+        for rows in (self._characters, self._cell_styles):
+            del rows[top : top + count]
+        for _ in range(count):
+            characters, styles = self._blank_row()
+            self._characters.insert(bottom - count + 1, characters)
+            self._cell_styles.insert(bottom - count + 1, styles)
+        self.dirty.update(range(top, bottom + 1))
+
+    def _scroll_down(self, top, bottom, count):
+        "Move rows ``top`` to ``bottom`` (inclusive) down by ``count``, blanking those at the top."
+        count = min(count, bottom - top + 1)
+        for rows in (self._characters, self._cell_styles):
+            del rows[bottom - count + 1 : bottom + 1]
+        for _ in range(count):
+            characters, styles = self._blank_row()
+            self._characters.insert(top, characters)
+            self._cell_styles.insert(top, styles)
+        self.dirty.update(range(top, bottom + 1))
+
+    def _column(self):
+        "The column of the cursor, for operations which don't draw."
+        return min(self.x, self.columns - 1)
+
+    @staticmethod
+    def _count(element, default=1):
+        "The first parameter of an element, where 0 or a missing parameter means ``default``."
+        parameters = element.parameters
+        return (parameters[0] if parameters else 0) or default
+
+    def _draw(self, text):
+        codes = array("I", text.encode(_ENCODING))
+        columns = self.columns
+        length = len(codes)
+        offset = 0
+        while offset < length:
+            if self.x >= columns:
+                self.x = 0
+                self._index(None)
+            x, y = self.x, self.y
+            count = min(length - offset, columns - x)
+            self._characters[y][x : x + count] = codes[offset : offset + count]
+            self._cell_styles[y][x : x + count] = array("Q", [self.style]) * count
+            self.dirty.add(y)
+            self.x += count
+            offset += count
+
+    def _text(self, element):
+        parameters = element.parameters
+        if not parameters:
+            self._draw(element.text)
+        elif parameters[0] not in "\x18\x1a":
+            # A character which ended a run of ignored ones. A sequence cancelled by CAN or SUB draws
+            # nothing.
+            self._draw(parameters[0])
+
+    def _carriage_return(self, element):
+        self.x = 0
+
+    def _index(self, element):
+        if self.y == self.bottom:
+            self._scroll_up(self.top, self.bottom, 1)
+        elif self.y < self.lines - 1:
+            self.y += 1
+
+    def _reverse_index(self, element):
+        if self.y == self.top:
+            self._scroll_down(self.top, self.bottom, 1)
+        elif self.y > 0:
+            self.y -= 1
+
+    def _backspace(self, element):
+        self.x = max(self._column() - 1, 0)
+
+    def _tab(self, element):
+        x = self._column()
+        self.x = min((stop for stop in self.tab_stops if stop > x), default=self.columns - 1)
+
+    def _set_tab_stop(self, element):
+        self.tab_stops.add(self._column())
+
+    def _clear_tab_stop(self, element):
+        how = element.parameters[0] if element.parameters else 0
+        if how == 0:
+            self.tab_stops.discard(self._column())
+        elif how == 3:
+            self.tab_stops.clear()
+
+    def _move_to(self, x, y):
+        self.x = max(0, min(x, self.columns - 1))
+        self.y = max(0, min(y, self.lines - 1))
+
+    def _cursor_position(self, element):
+        parameters = element.parameters
+        line = parameters[0] if parameters else 0
+        column = parameters[1] if len(parameters) > 1 else 0
+        self._move_to((column or 1) - 1, (line or 1) - 1)
+
+    def _vertical_limits(self):
+        "The rows the cursor can move between: the scrolling region, if the cursor is inside it."
+        if self.top <= self.y <= self.bottom:
+            return self.top, self.bottom
+        return 0, self.lines - 1
+
+    def _cursor_up(self, element):
+        top = self._vertical_limits()[0]
+        self.x = self._column()
+        self.y = max(self.y - self._count(element), top)
+
+    def _cursor_down(self, element):
+        bottom = self._vertical_limits()[1]
+        self.x = self._column()
+        self.y = min(self.y + self._count(element), bottom)
+
+    def _cursor_up1(self, element):
+        self._cursor_up(element)
+        self.x = 0
+
+    def _cursor_down1(self, element):
+        self._cursor_down(element)
+        self.x = 0
+
+    def _cursor_forward(self, element):
+        self._move_to(self._column() + self._count(element), self.y)
+
+    def _cursor_back(self, element):
+        self._move_to(self._column() - self._count(element), self.y)
+
+    def _cursor_to_column(self, element):
+        self._move_to(self._count(element) - 1, self.y)
+
+    def _cursor_to_line(self, element):
+        self._move_to(self._column(), self._count(element) - 1)
+
+    def _erase_in_line(self, element):
+        how = self._count(element, 0)
+        x = self._column()
+        if how == 0:
+            self._erase(self.y, x, self.columns)
+        elif how == 1:
+            self._erase(self.y, 0, x + 1)
+        elif how == 2:
+            self._erase(self.y, 0, self.columns)
+
+    def _erase_in_display(self, element):
+        how = self._count(element, 0)
+        if how == 0:
+            rows = range(self.y + 1, self.lines)
+            self._erase(self.y, self._column(), self.columns)
+        elif how == 1:
+            rows = range(self.y)
+            self._erase(self.y, 0, self._column() + 1)
+        elif how in (2, 3):
+            rows = range(self.lines)
+        else:
+            return
+        for y in rows:
+            self._erase(y, 0, self.columns)
+
+    def _erase_characters(self, element):
+        x = self._column()
+        self._erase(self.y, x, min(x + self._count(element), self.columns))
+
+    def _insert_characters(self, element):
+        x = self._column()
+        count = min(self._count(element), self.columns - x)
+        for row, blank in ((self._characters[self.y], _SPACE), (self._cell_styles[self.y], self.style)):
+            row[x:] = array(row.typecode, [blank]) * count + row[x : self.columns - count]
+        self.dirty.add(self.y)
+
+    def _delete_characters(self, element):
+        x = self._column()
+        count = min(self._count(element), self.columns - x)
+        for row, blank in ((self._characters[self.y], _SPACE), (self._cell_styles[self.y], self.style)):
+            row[x:] = row[x + count :] + array(row.typecode, [blank]) * count
+        self.dirty.add(self.y)
+
+    def _insert_lines(self, element):
+        if self.top <= self.y <= self.bottom:
+            self._scroll_down(self.y, self.bottom, self._count(element))
+            self.x = 0
+
+    def _delete_lines(self, element):
+        if self.top <= self.y <= self.bottom:
+            self._scroll_up(self.y, self.bottom, self._count(element))
+            self.x = 0
+
+    def _set_margins(self, element):
+        parameters = element.parameters
+        top = (parameters[0] if parameters else 0) or 1
+        bottom = (parameters[1] if len(parameters) > 1 else 0) or self.lines
+        bottom = min(bottom, self.lines)
+        if bottom > top:
+            self.top, self.bottom = top - 1, bottom - 1
+            self._move_to(0, 0)
+
+    def _select_graphic_rendition(self, element):
+        self.style = self._sgr.style_after(self.style, element.parameters)
+
+    def _save_cursor(self, element):
+        self._saved = self.x, self.y, self.style
+
+    def _restore_cursor(self, element):
+        if self._saved is None:
+            self.x, self.y, self.style = 0, 0, sgr.DEFAULT
+        else:
+            self.x, self.y, self.style = self._saved
+
+    def _alignment_display(self, element):
+        for y in range(self.lines):
+            self._characters[y] = array("I", [ord("E")]) * self.columns
+        self.dirty.update(range(self.lines))
+
+    def _reset(self, element):
+        self.x = 0
+        self.y = 0
+        self.top = 0
+        self.bottom = self.lines - 1
+        self.tab_stops = set(range(TAB_WIDTH, self.columns, TAB_WIDTH))
+        self.style = sgr.DEFAULT
+        self._saved = None
+        self._characters = []
+        self._cell_styles = []
+        for _ in range(self.lines):
+            characters, styles = self._blank_row()
+            self._characters.append(characters)
+            self._cell_styles.append(styles)
+        self.dirty = set(range(self.lines))
@@ -0,0 +1,253 @@
+"""Decode ``SelectGraphicRendition`` parameters into packed integer styles.
+
+A style is a single int which holds the foreground color, the background color and the attribute
+flags (bold, underline, etc.), so styles are cheap to store (e.g. in an ``array("Q")``), compare and
+hash. The colors can be the default, one of the 256 indexed colors, or a 24-bit RGB color, as set
+by e.g. ``CSI 31 m``, ``CSI 38;5;n m`` and ``CSI 38;2;r;g;b m``.
+
+The effect of a list of SGR parameters on a style is always to clear some bits and then set some
+others, whatever the style was before. ``SGRDecoder`` works that out once for each distinct list of
+parameters, after which applying them to any style takes a couple of bitwise operations.
+"""
+
+from typing import Sequence, Tuple, Union
+
+#: The style with default colors and no attributes.
+DEFAULT = 0
+
+# A color takes up 26 bits: its kind in the top 2, and its value in the rest.
+_COLOR_BITS = 26
+_COLOR_MASK = (1 << _COLOR_BITS) - 1
+_VALUE_MASK = (1 << 24) - 1
+
+#: Color kinds.
+DEFAULT_COLOR = 0
+INDEXED_COLOR = 1
+RGB_COLOR = 2
+
+FOREGROUND_SHIFT = 0
+BACKGROUND_SHIFT = _COLOR_BITS
+FOREGROUND_MASK = _COLOR_MASK << FOREGROUND_SHIFT
+BACKGROUND_MASK = _COLOR_MASK << BACKGROUND_SHIFT
+
+#: Attribute flags.
+BOLD = 1 << 52
+FAINT = 1 << 53
+ITALIC = 1 << 54
+UNDERLINE = 1 << 55
+BLINK = 1 << 56
+REVERSE = 1 << 57
+CONCEAL = 1 << 58
+STRIKETHROUGH = 1 << 59
+
+ALL = (1 << 60) - 1
+
+_ATTRIBUTE_NAMES = (
+    ("bold", BOLD),
+    ("faint", FAINT),
+    ("italic", ITALIC),
+    ("underline", UNDERLINE),
+    ("blink", BLINK),
+    ("reverse", REVERSE),
+    ("conceal", CONCEAL),
+    ("strikethrough", STRIKETHROUGH),
+)
+
+# The attributes each parameter sets, and those it clears.
+_SET_ATTRIBUTES = {
+    1: BOLD,
+    2: FAINT,
+    3: ITALIC,
+    4: UNDERLINE,
+    5: BLINK,
+    6: BLINK,
+    7: REVERSE,
+    8: CONCEAL,
+    9: STRIKETHROUGH,
+    21: UNDERLINE,
+}
+_CLEAR_ATTRIBUTES = {
+    22: BOLD | FAINT,
+    23: ITALIC,
+    24: UNDERLINE,
+    25: BLINK,
+    27: REVERSE,
+    28: CONCEAL,
+    29: STRIKETHROUGH,
+}
+
+#: The default maximum number of distinct parameter lists for an ``SGRDecoder`` to remember.
+CACHE_SIZE = 1024
+
+
+def _color(kind, value):
+    return kind << 24 | value
+
+
+def foreground(style: int) -> Union[None, int, Tuple[int, int, int]]:
+    """The foreground color of a style.
+
+    Returns:
+        None for the default color, the index of an indexed color, or the (red, green, blue) of an RGB
+        color.
+    """
+    return _unpack_color(style >> FOREGROUND_SHIFT & _COLOR_MASK)
+
+
+def background(style: int) -> Union[None, int, Tuple[int, int, int]]:
+    "The background color of a style, as for ``foreground``."
+    return _unpack_color(style >> BACKGROUND_SHIFT & _COLOR_MASK)
+
+
+def _unpack_color(color):
+    kind, value = color >> 24, color & _VALUE_MASK
+    if kind == INDEXED_COLOR:
+        return value
+    elif kind == RGB_COLOR:
+        return value >> 16, value >> 8 & 0xFF, value & 0xFF
+    return None
+
+
+def _extended_color(parameters, index):
+    """Decode the color at ``parameters[index:]``, after a 38 or 48.
+
+    Returns:
+        The packed color (or None if the parameters are incomplete or invalid), and the index of the
+        first parameter after it.
+    """
+    kind = parameters[index] if index < len(parameters) else None
+    if kind == 5 and index + 1 < len(parameters):
+        return _color(INDEXED_COLOR, min(parameters[index + 1], 255)), index + 2
+    elif kind == 2 and index + 3 < len(parameters):
+        red, green, blue = (min(value, 255) for value in parameters[index + 1 : index + 4])
+        return _color(RGB_COLOR, red << 16 | green << 8 | blue), index + 4
+    return None, len(parameters)
+
+
+def transform(parameters: Sequence[int]) -> Tuple[int, int]:
+    """Work out the effect of some SGR parameters on a style.
+
+    Args:
+        parameters: The parameters of a ``SelectGraphicRendition``.
+
+    Returns:
+        A (keep, set) pair of masks, such that the style after the parameters is
+        ``style & keep | set``.
+    """
+    length = len(parameters)
+    if not length:
+        # The same as a single 0.
+        return 0, 0
+
+    keep, set_ = ALL, 0
+    index = 0
+    while index < length:
+        parameter = parameters[index]
+        index += 1
+        if parameter == 0:
+            keep, set_ = 0, 0
+            continue
+
+        if parameter in _SET_ATTRIBUTES:
+            clear, bits = 0, _SET_ATTRIBUTES[parameter]
+        elif parameter in _CLEAR_ATTRIBUTES:
+            clear, bits = _CLEAR_ATTRIBUTES[parameter], 0
+        elif 30 <= parameter <= 37 or 90 <= parameter <= 97:
+            clear, bits = FOREGROUND_MASK, _color(INDEXED_COLOR, parameter - 30 if parameter < 90 else parameter - 82)
+        elif 40 <= parameter <= 47 or 100 <= parameter <= 107:
+            color = _color(INDEXED_COLOR, parameter - 40 if parameter < 100 else parameter - 92)
+            clear, bits = BACKGROUND_MASK, color << BACKGROUND_SHIFT
+        elif parameter == 39:
+            clear, bits = FOREGROUND_MASK, 0
+        elif parameter == 49:
+            clear, bits = BACKGROUND_MASK, 0
+        elif parameter == 38 or parameter == 48:
+            color, index = _extended_color(parameters, index)
+            if color is None:
+                continue
+            if parameter == 38:
+                clear, bits = FOREGROUND_MASK, color << FOREGROUND_SHIFT
+            else:
+                clear, bits = BACKGROUND_MASK, color << BACKGROUND_SHIFT
+        else:
+            continue
+
+        keep &= ~clear
+        set_ = set_ & ~clear | bits
+
+    return keep, set_
+
+
+class SGRDecoder:
+    """Apply SGR parameters to packed styles, remembering the effect of each distinct list of parameters.
+
+    The memo is a plain dict, emptied when it's full, since looking it up is the hot path. Programs use
+    few distinct lists of parameters, so in practice it is rarely emptied.
+
+    Args:
+        style: The style to start with.
+        cache_size: The maximum number of distinct parameter lists to remember.
+
+    Attributes:
+        style: The current style, as updated by ``apply``.
+    """
+
+    def __init__(self, style: int = DEFAULT, cache_size: int = CACHE_SIZE):
+        self.style = style
+        self.cache_size = cache_size
+        self._transforms = {}
+
+    def transform(self, parameters: Sequence[int]) -> Tuple[int, int]:
+        "The same as ``transform``, but remembered."
+        transforms = self._transforms
+        result = transforms.get(parameters)
+        if result is None:
+            if len(transforms) >= self.cache_size:
+                transforms.clear()
+            result = transforms[parameters] = transform(parameters)
+        return result
+
+    def style_after(self, style: int, parameters: Sequence[int]) -> int:
+        """Apply some SGR parameters to a style, leaving the current style alone.
+
+        Args:
+            style: A packed style.
+            parameters: A hashable sequence of parameters, e.g. ``SelectGraphicRendition.parameters``.
+
+        Returns:
+            The new packed style.
+        """
+        result = self._transforms.get(parameters)
+        if result is None:
+            result = self.transform(parameters)
+        return style & result[0] | result[1]
+
+    def apply(self, parameters: Sequence[int]) -> int:
+        """Apply some SGR parameters to the current style.
+
+        Args:
+            parameters: As for ``style_after``.
+
+        Returns:
+            The new current style.
+        """
+        self.style = self.style_after(self.style, parameters)
+        return self.style
+
+    def decode(self, parameters: Sequence[int]) -> int:
+        "The style given by some SGR parameters, starting from the default style."
+        return self.style_after(DEFAULT, parameters)
+
+
+def attributes(style: int) -> int:
+    "The attribute flags of a style, e.g. ``attributes(style) & BOLD``."
+    return style & ~(FOREGROUND_MASK | BACKGROUND_MASK)
+
+
+def describe(style: int) -> str:
+    "A short description of a style, e.g. 'bold, fg=1, bg=(0, 0, 128)', or '' for the default style."
+    names = [name for name, flag in _ATTRIBUTE_NAMES if style & flag]
+    for name, color in (("fg", foreground(style)), ("bg", background(style))):
+        if color is not None:
+            names.append(f"{name}={color}")
+    return ", ".join(names)
@@ -0,0 +1,96 @@
+"""Summary statistics about the control codes in a stream.
+
+These are gathered on the fly and in constant memory, without building ``Element``s, so they can be
+collected over very large inputs.
+"""
+
+from collections import Counter
+from typing import Hashable, List, Tuple
+
+from . import elements
+from .parser import Parser
+
+
+class TopCounter:
+    """Count the most frequent items in a stream in bounded memory.
+
+    At most ``2 * capacity`` items are tracked at a time. When that is exceeded, all but the ``capacity``
+    most frequent are forgotten. So if there are more distinct items than that, the counts are
+    approximate: an item is only counted from the last time it started being tracked. Frequent items
+    are rarely forgotten, so the counts at the top are usually exact.
+
+    Args:
+        capacity: The number of items guaranteed to be kept.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._counts = {}
+
+    def add(self, item: Hashable, count: int = 1):
+        "Count ``count`` occurrences of an item."
+        counts = self._counts
+        try:
+            counts[item] += count
+        except KeyError:
+            if len(counts) >= 2 * self.capacity:
+                self._prune()
+            counts[item] = count
+
+    def most_common(self, count: int) -> List[Tuple[Hashable, int]]:
+        "The ``count`` most frequent items and their counts, most frequent first."
+        return sorted(self._counts.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def _prune(self):
+        self._counts = dict(self.most_common(self.capacity))
+
+
+class Stats:
+    """Statistics about the elements in a stream.
+
+    Args:
+        parser: The parser to use. If not provided, a new one is created.
+        top_capacity: The number of distinct sequences to keep counts for; see ``TopCounter``.
+
+    Attributes:
+        counts: The number of elements of each element type.
+        lengths: The total length, in characters, of the text of the elements of each element type.
+        sequences: The most frequent control sequences, by their exact text.
+        input_bytes: The number of bytes fed.
+    """
+
+    def __init__(self, parser: Parser = None, top_capacity: int = 1000):
+        self.parser = parser or Parser()
+        self.counts = Counter()
+        self.lengths = Counter()
+        self.sequences = TopCounter(top_capacity)
+        self.input_bytes = 0
+
+    def feed_bytes(self, data: bytes):
+        """Parse some bytes and add what is found to the statistics.
+
+        Args:
+            data: A bytes-like object.
+        """
+        self.input_bytes += len(data)
+        counts = self.counts
+        lengths = self.lengths
+        add_sequence = self.sequences.add
+        text_type = elements.Text
+
+        for text, tokens in self.parser._byte_tokens(data):
+            for element_type, _, _, start, end, prefix in tokens:
+                counts[element_type] += 1
+                lengths[element_type] += end - start + len(prefix)
+                if element_type is not text_type:
+                    add_sequence(prefix + text[start:end])
+
+    @property
+    def text_length(self) -> int:
+        "The total length of all plain text."
+        return self.lengths[elements.Text]
+
+    @property
+    def control_length(self) -> int:
+        "The total length of everything but plain text."
+        return sum(self.lengths.values()) - self.text_length
@@ -0,0 +1,163 @@
+"""Turn terminal output into plain text.
+
+``Stripper`` follows exactly the same grammar as ``Parser``, but only produces the plain text it finds,
+without building elements. This is the fast way to, e.g., index terminal logs for searching.
+"""
+
+import re
+import sys
+from typing import BinaryIO, TextIO
+
+from . import control as ctrl
+from . import elements
+from . import escape as esc
+from .parser import Parser, _sequence_pattern_source
+
+CAN_OR_SUB = ctrl.CAN + ctrl.SUB
+
+#: The text to output for the control characters which are kept by default.
+WHITESPACE = {
+    elements.Tab: "\t",
+    elements.LineFeed: "\n",
+    elements.CarriageReturn: "\r",
+}
+
+
+class Stripper:
+    """Remove control sequences from text, a chunk at a time.
+
+    Tabs, line feeds and carriage returns are kept (see ``WHITESPACE``); other control sequences are
+    dropped.
+
+    Most chunks consist only of plain text and complete, well-formed sequences. Those are stripped with
+    a single regular expression substitution. Anything else (partial sequences, NUL, shifts, etc.) is
+    stripped by going through the parser's tokens, which is slower but handles everything the parser
+    does.
+
+    Args:
+        parser: The parser to use. If not provided, a new one is created.
+        substitute: What to output for a sequence cancelled by CAN or SUB. A terminal shows an error
+            character in its place; use e.g. "\\ufffd" to keep track of them.
+        whitespace: The text to output for each type of element which is kept.
+    """
+
+    #: Complete sequences which the parser recognizes in one step, except for those which are kept as
+    #: whitespace. It's built the same way as ``Parser._sequence_pattern``, but with only the basic
+    #: controls which are dropped, and without ESC E (NEL). The lookahead lets the regular expression
+    #: engine skip quickly over plain text.
+    _sequence_pattern = re.compile(
+        "(?=[{}])(?:{})".format(
+            re.escape(ctrl.ESC + ctrl.CSI_C1 + ctrl.OSC_C1 + ctrl.BEL + ctrl.BS),
+            _sequence_pattern_source(
+                csi_finals=Parser._csi_finals,
+                basic=ctrl.BEL + ctrl.BS,
+                not_escapes=esc.NEL,
+            ),
+        ),
+        re.DOTALL,
+    )
+
+    #: Characters which, if left after removing complete sequences, need the parser's full treatment.
+    _leftover_pattern = re.compile(
+        "[{}]".format(
+            re.escape(ctrl.ESC + ctrl.CSI_C1 + ctrl.OSC_C1 + ctrl.NUL + ctrl.DEL + ctrl.SI + ctrl.SO)
+        )
+    )
+
+    #: What's left after removing ``_sequence_pattern`` which is kept as a line feed.
+    _line_feed_pattern = re.compile("{}|[{}]".format(re.escape(ctrl.ESC + esc.NEL), re.escape(ctrl.VT + ctrl.FF)))
+
+    def __init__(self, parser: Parser = None, substitute: str = "", whitespace=None):
+        self.parser = parser or Parser()
+        self.substitute = substitute
+        self.whitespace = WHITESPACE if whitespace is None else whitespace
+
+    def feed(self, data: str) -> str:
+        """Strip some text.
+
+        Args:
+            data: The text.
+
+        Returns:
+            The plain text in it.
+        """
+        if self._can_substitute():
+            stripped = self._sequence_pattern.sub("", data)
+            # Looking for single characters is much quicker than running the substitution on plain text.
+            if ctrl.ESC in stripped or ctrl.VT in stripped or ctrl.FF in stripped:
+                stripped = self._line_feed_pattern.sub("\n", stripped)
+            if self._leftover_pattern.search(stripped) is None:
+                self.parser._position += len(data)
+                return stripped
+
+        return "".join(self._pieces(data, self.parser._tokens(data)))
+
+    def feed_bytes(self, data: bytes) -> str:
+        """Strip some bytes, decoding them as ``Parser.feed_bytes`` does.
+
+        Args:
+            data: A bytes-like object.
+
+        Returns:
+            The plain text in it.
+        """
+        parser = self.parser
+        if self._can_substitute() and parser._select_charset_pattern.search(data) is None:
+            # Nothing in here can change how the bytes are decoded.
+            return self.feed(parser._decode(data))
+
+        return "".join(piece for text, tokens in parser._byte_tokens(data) for piece in self._pieces(text, tokens))
+
+    def _can_substitute(self):
+        # The substitution only gives the same results as the parser when it starts in the ground state,
+        # and when none of the parser's options make it treat complete sequences differently.
+        parser = self.parser
+        return parser._taking_plain_text and parser._max_scan_length is None and self.whitespace is WHITESPACE
+
+    def _pieces(self, data, tokens):
+        text_type = elements.Text
+        whitespace = self.whitespace
+        substitute = self.substitute
+        for element_type, parameters, _, start, end, _ in tokens:
+            if element_type is text_type:
+                if not parameters:
+                    yield data[start:end]
+                elif parameters[0] in CAN_OR_SUB:
+                    yield substitute
+                else:
+                    # A character which ended a run of ignored ones.
+                    yield parameters[0]
+            elif element_type in whitespace:
+                yield whitespace[element_type]
+
+
+def strip(text: str, **kwargs) -> str:
+    """Remove control sequences from some text.
+
+    Args:
+        text: The text.
+        kwargs: Passed to ``Stripper``.
+
+    Returns:
+        The plain text in it.
+    """
+    return Stripper(**kwargs).feed(text)
+
+
+def strip_stream(source: BinaryIO, destination: TextIO = None, chunk_size: int = 64 * 1024, **kwargs):
+    """Strip control sequences from a stream of bytes, writing the plain text to another stream.
+
+    Args:
+        source: A binary file object to read from.
+        destination: A text file object to write to. Defaults to stdout.
+        chunk_size: The maximum number of bytes to read at a time.
+        kwargs: Passed to ``Stripper``.
+    """
+    write = (destination or sys.stdout).write
+    feed = Stripper(**kwargs).feed_bytes
+    read = source.read1 if hasattr(source, "read1") else source.read
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        write(feed(chunk))
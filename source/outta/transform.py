@@ -0,0 +1,270 @@
+"""Rewrite terminal output, dropping or changing some kinds of control sequence.
+
+A ``Transform`` has a rule for each type of element it changes: drop it, replace it with some fixed
+text, or map it to new text with a function. Everything else is copied unchanged, straight from the
+input, e.g. to remove titles (which can give away host names) from a capture before sharing it:
+
+    transform = Transform().drop(elements.SetTitle, elements.SetIconName)
+    with open("capture", "rb") as source, open("shared", "wb") as destination:
+        transform_stream(transform, source, destination)
+
+Only the element types with rules are built as elements (see ``Parser(types=...)``). The text between
+them is copied from the input in as few pieces as possible, so a transform costs about as much as
+parsing without building elements.
+
+Bytes are rewritten byte for byte: everything without a rule comes out exactly as it went in, even if
+it isn't valid UTF-8, or it's Latin-1 after a "select charset" sequence.
+"""
+
+import sys
+from typing import BinaryIO, Callable, Optional, Tuple, Type, Union
+
+from . import control as ctrl
+from . import elements
+from .columnar import KINDS
+from .parser import Parser
+
+#: The RGB levels of the 6x6x6 color cube in the 256 indexed colors.
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+ElementTypes = Union[Type[elements.Element], Tuple[Type[elements.Element], ...]]
+
+
+class Transform:
+    """Rewrite text a chunk at a time.
+
+    Rules are added with ``drop``, ``replace`` and ``map``, which return the transform, so they can be
+    chained. A rule for an element type also applies to its subclasses (e.g. a rule for ``SetTitle``
+    applies to ``SetTitleAndIconName``), unless they have their own.
+
+    Output for a sequence which is split between chunks is held back until the end of the sequence
+    has been seen.
+
+    Args:
+        parser: The parser to use. If not provided, a new one is created. Its ``types`` are ignored.
+            ``feed_bytes`` only copies invalid UTF-8 unchanged if its ``errors`` is "surrogateescape",
+            as the new one's is.
+    """
+
+    def __init__(self, parser: Parser = None):
+        self.parser = parser or Parser(errors="surrogateescape")
+        self.rules = {}
+        # The rule for each element type, including the subclasses of those in ``rules``.
+        self._rules = {}
+        self._types = frozenset()
+        # The text of a sequence which was split between chunks, which hasn't been output yet.
+        self._held = ""
+
+    def drop(self, *element_types: Type[elements.Element]) -> "Transform":
+        "Remove elements of some types."
+        return self._add(element_types, "")
+
+    def replace(self, element_types: ElementTypes, text: str) -> "Transform":
+        """Replace elements of some types with some text.
+
+        Args:
+            element_types: An element type, or a tuple of them.
+            text: The text to output in place of each of them.
+        """
+        return self._add(element_types, text)
+
+    def map(self, element_types: ElementTypes, function: Callable[[elements.Element], Optional[str]]) -> "Transform":
+        """Replace elements of some types with text worked out from them.
+
+        Args:
+            element_types: An element type, or a tuple of them.
+            function: Called with each element, and returns the text to output in its place (e.g. its
+                ``text`` to leave it as it is), or None to drop it.
+        """
+        return self._add(element_types, function)
+
+    def _add(self, element_types, rule):
+        if not isinstance(element_types, tuple):
+            element_types = (element_types,)
+        for element_type in element_types:
+            self.rules[element_type] = rule
+        self._rules = {}
+        for kind in KINDS:
+            rule_type = next((base for base in kind.__mro__ if base in self.rules), None)
+            if rule_type is not None:
+                self._rules[kind] = self.rules[rule_type]
+        self._types = frozenset(self._rules)
+        return self
+
+    def feed(self, data: str) -> str:
+        """Rewrite some text.
+
+        Args:
+            data: The text.
+
+        Returns:
+            The rewritten text.
+        """
+        return self._rewrite(data, self.parser._tokens(data, types=self._types))
+
+    def feed_bytes(self, data: bytes) -> bytes:
+        """Rewrite some bytes.
+
+        The bytes are decoded as ``Parser.feed_bytes`` does, and the rewritten text is encoded the same
+        way, so what isn't rewritten is unchanged. Text from a rule which can't be encoded in Latin-1
+        (after a "select charset" sequence) comes out as "?".
+
+        Args:
+            data: A bytes-like object.
+
+        Returns:
+            The rewritten bytes.
+        """
+        parser = self.parser
+        pieces = []
+        for text, tokens in parser._byte_tokens(data, types=self._types):
+            # This is the charset the text was decoded with. It's only changed by the tokens, when a
+            # "select charset" sequence at the end of the text is reached.
+            use_utf8 = parser.use_utf8
+            pieces.append(_encode(self._rewrite(text, tokens), use_utf8))
+        return b"".join(pieces)
+
+    def _rewrite(self, data, tokens):
+        rules = self._rules
+        pieces = []
+        write = pieces.append
+        held = self._held
+        last = 0
+        for element_type, parameters, keywords, start, end, prefix in tokens:
+            if held:
+                # The held sequence either ends with this element, or has already ended without
+                # matching a rule.
+                if not prefix:
+                    write(held)
+                held = ""
+            if start > last:
+                write(data[last:start])
+            last = end
+
+            rule = rules[element_type]
+            if type(rule) is str:
+                write(rule)
+            else:
+                text = rule(element_type(parameters, keywords, prefix + data[start:end]))
+                if text:
+                    write(text)
+
+        parser = self.parser
+        pending = "" if parser._taking_plain_text else parser._buffer
+        if held:
+            if len(pending) == len(held) + len(data):
+                # The held sequence still hasn't ended.
+                self._held = pending
+                return ""
+            pieces.insert(0, held)
+
+        end = len(data) - min(len(pending), len(data))
+        if end > last:
+            write(data[last:end])
+        self._held = pending
+        return "".join(pieces)
+
+    def flush(self) -> str:
+        """Output the text of a sequence which is being held back, e.g. at the end of the input.
+
+        The sequence is output as it is, since it never ended.
+
+        Returns:
+            The text.
+        """
+        held, self._held = self._held, ""
+        return held
+
+    def flush_bytes(self) -> bytes:
+        """Output the bytes of a sequence which is being held back by ``feed_bytes``, and of a UTF-8
+        character which was never finished. See ``flush``.
+
+        Returns:
+            The bytes.
+        """
+        parser = self.parser
+        held = self.flush()
+        if parser.use_utf8:
+            held += parser._decoder.decode(b"", final=True)
+        return _encode(held, parser.use_utf8)
+
+
+def _encode(text, use_utf8):
+    "Encode text as ``Parser.feed_bytes`` decoded it."
+    if use_utf8:
+        return text.encode("utf-8", "surrogateescape")
+    return text.encode("latin-1", "replace")
+
+
+def _nearest_indexed_color(red, green, blue):
+    "The nearest of the 256 indexed colors to an RGB color, from the color cube and the gray ramp."
+    levels = [min(range(6), key=lambda level: abs(_CUBE_LEVELS[level] - value)) for value in (red, green, blue)]
+    cube = 16 + 36 * levels[0] + 6 * levels[1] + levels[2]
+    cube_rgb = [_CUBE_LEVELS[level] for level in levels]
+
+    gray_level = min(23, max(0, round(((red + green + blue) / 3 - 8) / 10)))
+    gray = 8 + 10 * gray_level
+
+    def distance(rgb):
+        return sum((value - target) ** 2 for value, target in zip(rgb, (red, green, blue)))
+
+    return cube if distance(cube_rgb) <= distance((gray, gray, gray)) else 232 + gray_level
+
+
+def downgrade_truecolor(element: elements.SelectGraphicRendition) -> str:
+    """Rewrite the 24-bit RGB colors of an SGR sequence as the nearest of the 256 indexed colors.
+
+    This is a rule for ``Transform.map``, for terminals which don't support RGB colors.
+
+    Returns:
+        The text of the sequence, which is unchanged if it has no RGB colors.
+    """
+    parameters = element.parameters
+    if 2 not in parameters:
+        return element.text
+
+    rewritten = []
+    index = 0
+    length = len(parameters)
+    while index < length:
+        parameter = parameters[index]
+        if (parameter == 38 or parameter == 48) and index + 4 < length and parameters[index + 1] == 2:
+            color = _nearest_indexed_color(*(min(value, 255) for value in parameters[index + 2 : index + 5]))
+            rewritten += (parameter, 5, color)
+            index += 5
+        elif (parameter == 38 or parameter == 48) and index + 2 < length and parameters[index + 1] == 5:
+            rewritten += parameters[index : index + 3]
+            index += 3
+        else:
+            rewritten.append(parameter)
+            index += 1
+
+    if rewritten == list(parameters):
+        return element.text
+    text = element.text
+    introducer = ctrl.CSI_C1 if text.startswith(ctrl.CSI_C1) else ctrl.CSI_C0
+    return introducer + ";".join(map(str, rewritten)) + "m"
+
+
+def transform_stream(
+    transform: Transform, source: BinaryIO, destination: BinaryIO = None, chunk_size: int = 64 * 1024
+):
+    """Rewrite a stream of bytes, writing the rewritten bytes to another stream.
+
+    Only a chunk of the input (and any sequence split between chunks) is in memory at a time.
+
+    Args:
+        transform: The transform.
+        source: A binary file object to read from.
+        destination: A binary file object to write to. Defaults to stdout's.
+        chunk_size: The maximum number of bytes to read at a time.
+    """
+    write = (destination or sys.stdout.buffer).write
+    feed = transform.feed_bytes
+    read = source.read1 if hasattr(source, "read1") else source.read
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        write(feed(chunk))
+    write(transform.flush_bytes())
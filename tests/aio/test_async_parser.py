@@ -0,0 +1,88 @@
+import asyncio
+
+from outta.aio import AsyncParser
+from outta.parser import Parser
+
+TEXT = "café \x1b[4Cmore\x1b[3D\r\n\x1b]2;title\x07end"
+
+
+def _reader(*chunks):
+    reader = asyncio.StreamReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    return reader
+
+
+async def _collect(parser):
+    return [element async for element in parser]
+
+
+def test_stream_reader():
+    async def run():
+        data = TEXT.encode("utf-8")
+        return await _collect(AsyncParser(_reader(data[:7], data[7:])))
+
+    assert asyncio.run(run()) == list(Parser().feed(TEXT))
+
+
+def test_async_iterable():
+    async def source():
+        data = TEXT.encode("utf-8")
+        for index in range(len(data)):
+            yield data[index : index + 1]
+
+    async def run():
+        return await _collect(AsyncParser(source()))
+
+    elements = asyncio.run(run())
+    assert "".join(element.text for element in elements) == TEXT
+
+
+def test_batches():
+    async def run():
+        parser = AsyncParser(_reader(TEXT.encode("utf-8")), yield_every=3)
+        return [batch async for batch in parser.batches()]
+
+    batches = asyncio.run(run())
+    assert [len(batch) for batch in batches] == [3, 3, 2]
+    assert [element for batch in batches for element in batch] == list(Parser().feed(TEXT))
+
+
+def test_other_tasks_run_while_parsing_large_chunks():
+    async def run():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(len(elements))
+                await asyncio.sleep(0)
+
+        elements = []
+        task = asyncio.create_task(ticker())
+        async for element in AsyncParser(_reader(b"\x1b[1m" * 10_000), yield_every=100):
+            elements.append(element)
+        task.cancel()
+        return ticks
+
+    ticks = asyncio.run(run())
+    assert len(set(ticks)) > 10
+
+
+def test_reads_only_when_consumer_wants_more():
+    class Source:
+        def __init__(self):
+            self.reads = 0
+
+        async def read(self, size):
+            self.reads += 1
+            return b"\x1b[1m" if self.reads < 100 else b""
+
+    async def run():
+        source = Source()
+        iterator = AsyncParser(source).__aiter__()
+        await iterator.__anext__()
+        await iterator.__anext__()
+        return source.reads
+
+    assert asyncio.run(run()) == 2
@@ -0,0 +1,98 @@
+import pytest
+from outta import batch, elements
+from outta.stats import Stats
+
+
+@pytest.fixture
+def captures(tmp_path):
+    contents = {
+        "a.log": b"hi \x1b[1mbold\x1b[0m\r\n",
+        "b.log": b"\x1b]2;title\x07plain",
+        "sub/c.log": b"\x1b[1m\x1b[1m\xe9t\xc3\xa9",
+        "sub/d.txt": b"",
+    }
+    for name, content in contents.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(content)
+    return tmp_path, contents
+
+
+def _elements(parser, filename):
+    with open(filename, "rb") as handle:
+        return [str(element) for element in parser.feed_bytes(handle.read())]
+
+
+def _unfinished(parser, filename):
+    # Leave the parser part way through a sequence, and a feed.
+    feed = parser.feed("\x1b]2;unfinished")
+    next(feed, None)
+    return filename
+
+
+def test_find_files(captures):
+    directory, contents = captures
+    assert batch.find_files([str(directory)]) == sorted(str(directory / name) for name in contents)
+    assert batch.find_files([str(directory / "**" / "*.log"), str(directory / "*.log")]) == [
+        str(directory / "a.log"),
+        str(directory / "b.log"),
+        str(directory / "sub" / "c.log"),
+    ]
+    assert batch.find_files([str(directory / "*")]) == [str(directory / "a.log"), str(directory / "b.log")]
+    assert batch.find_files([str(directory / "missing")]) == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_summaries_match_stats(captures, workers):
+    directory, contents = captures
+    filenames = batch.find_files([str(directory)])
+    results = list(batch.run(filenames, workers=workers, batch_size=1))
+
+    assert [result.filename for result in results] == filenames
+    for result in results:
+        assert result.error is None
+        stats = Stats()
+        stats.feed_bytes((directory / result.filename).read_bytes())
+        assert result.result.input_bytes == stats.input_bytes
+        assert result.result.counts == stats.counts
+        assert result.result.lengths == stats.lengths
+        assert result.result.sequences == stats.sequences.most_common(10)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failures_are_reported(captures, workers):
+    directory, _ = captures
+    filenames = [str(directory / "a.log"), str(directory / "missing.log"), str(directory / "b.log")]
+    results = list(batch.run(filenames, workers=workers))
+
+    assert [result.filename for result in results] == filenames
+    assert results[0].error is None and results[2].error is None
+    assert results[1].result is None
+    assert results[1].error.startswith("FileNotFoundError: ")
+
+
+def test_parser_is_reset_between_files(captures):
+    directory, _ = captures
+    filenames = [str(directory / "a.log"), str(directory / "b.log")]
+    for filename in filenames:
+        list(batch.run([filename], _unfinished, workers=1))
+        [result] = batch.run([filename], _elements, workers=1)
+        assert result.result == _elements(batch.Parser(), filename)
+
+
+def test_totals(captures):
+    directory, contents = captures
+    filenames = batch.find_files([str(directory)]) + [str(directory / "missing.log")]
+    totals = batch.Totals()
+    for result in batch.run(filenames, workers=1):
+        totals.add(result)
+
+    stats = Stats()
+    for content in contents.values():
+        stats.feed_bytes(content)
+    assert (totals.files, totals.failed) == (5, 1)
+    assert totals.input_bytes == stats.input_bytes
+    assert totals.counts == stats.counts
+    assert totals.lengths == stats.lengths
+    assert totals.sequences.most_common(1) == [("\x1b[1m", 3)]
+    assert totals.counts[elements.SetTitle] == 1
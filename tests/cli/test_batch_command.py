@@ -0,0 +1,27 @@
+import pytest
+from outta import cli
+
+
+def test_main_batch(tmp_path, capsys):
+    (tmp_path / "a.log").write_bytes(b"hi \x1b[1mbold\x1b[0m")
+    (tmp_path / "b.log").write_bytes(b"\x1b[1m")
+
+    cli.main(["batch", "--jobs", "1", "--top", "1", str(tmp_path)])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[:2] == [f"{tmp_path / 'a.log'}: 15 bytes, 4 elements", f"{tmp_path / 'b.log'}: 4 bytes, 1 elements"]
+    assert "2 files parsed, 0 failed" in lines
+    assert lines[lines.index("Top 1 sequences:") + 1].split() == ["2", repr("\x1b[1m")]
+    assert lines[-1].startswith("Parsed 0.00 MB in")
+
+
+def test_batch_failures(tmp_path, capsys):
+    (tmp_path / "a.log").write_bytes(b"hi")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.log").symlink_to(tmp_path / "deleted")
+
+    with pytest.raises(SystemExit) as raised:
+        cli.main(["batch", "--jobs", "2", "--quiet", str(tmp_path / "**" / "*.log"), str(tmp_path / "missing")])
+    captured = capsys.readouterr()
+    assert raised.value.code == 1
+    assert captured.out.startswith("1 files parsed, 1 failed\n")
+    assert captured.err.startswith(f"{tmp_path / 'sub' / 'b.log'}: FileNotFoundError: ")
@@ -0,0 +1,81 @@
+import io
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from outta import cli
+from outta.parser import Parser
+
+TEXT = "café \x1b[4Cmore\x1b[3D\r\nend"
+
+
+def _expected(text):
+    return "".join(f"{element}\n" for element in Parser().feed(text))
+
+
+def test_explain_file(tmp_path, capsys):
+    path = tmp_path / "capture"
+    path.write_bytes(TEXT.encode("utf-8"))
+
+    cli.explain(str(path))
+
+    assert capsys.readouterr().out == _expected(TEXT)
+
+
+def test_small_chunks(tmp_path):
+    path = tmp_path / "capture"
+    path.write_bytes(TEXT.encode("utf-8"))
+
+    elements = list(cli.parse_file(str(path), chunk_size=1))
+
+    assert "".join(element.text for element in elements) == TEXT
+
+
+def test_explain_stdin(monkeypatch):
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(TEXT.encode("utf-8"))))
+    output = io.StringIO()
+
+    cli.explain("-", output=output)
+
+    assert output.getvalue() == _expected(TEXT)
+
+
+def test_broken_pipe_stops_cleanly(tmp_path):
+    path = tmp_path / "capture"
+    path.write_bytes(TEXT.encode("utf-8") * 100_000)
+    env = dict(os.environ, PYTHONPATH=str(Path(cli.__file__).parents[1]))
+
+    with subprocess.Popen(
+        [sys.executable, "-m", "outta.cli", str(path)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+    ) as process:
+        process.stdout.readline()
+        process.stdout.close()
+        stderr = process.stderr.read()
+
+    assert process.returncode == 1
+    assert stderr == b""
+
+
+def test_explain_with_jobs(tmp_path):
+    path = tmp_path / "capture"
+    path.write_bytes(TEXT.encode("utf-8") * 10)
+    output = io.StringIO()
+
+    cli.explain(str(path), output=output, jobs=2)
+
+    assert output.getvalue() == _expected(TEXT * 10)
+
+
+def test_explain_with_cache(tmp_path):
+    path = tmp_path / "capture"
+    path.write_bytes(TEXT.encode("utf-8"))
+
+    for _ in range(2):
+        output = io.StringIO()
+        cli.explain(str(path), output=output, cache=str(tmp_path / "cache"))
+        assert output.getvalue() == _expected(TEXT)
+    assert len(list((tmp_path / "cache").rglob("*.ir"))) == 1
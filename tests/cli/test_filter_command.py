@@ -0,0 +1,33 @@
+import pytest
+from outta import cli
+
+
+def test_main_filter(tmp_path, capsys):
+    path = tmp_path / "capture"
+    path.write_bytes(b"$ \x1b]0;user@host\x07ls\r\n\x1b[6n\x1b[38;2;255;0;0mred\x1b[0m\r\n")
+
+    cli.main(["filter", str(path)])
+    assert capsys.readouterr().out == path.read_bytes().decode()
+
+    cli.main(["filter", "--drop", "SetTitle", "--drop", "ReportDeviceStatus", "--no-truecolor", str(path)])
+    assert capsys.readouterr().out == "$ ls\r\n\x1b[38;5;196mred\x1b[0m\r\n"
+
+
+def test_filter_chunks(tmp_path, capsys):
+    path = tmp_path / "capture"
+    path.write_bytes(b"a\x1b]2;title\x07b\x1b]2;unfinished")
+    cli.main(["filter", "--chunk-size", "2", "--drop", "SetTitle", str(path)])
+    assert capsys.readouterr().out == "ab\x1b]2;unfinished"
+
+
+def test_filter_is_byte_exact(tmp_path, capsysbinary):
+    path = tmp_path / "capture"
+    path.write_bytes(b"\xff\xfe\x1b]2;title\x07a\x1b%@caf\xe9\x1b]2;title\x07")
+    cli.main(["filter", "--drop", "SetTitle", str(path)])
+    assert capsysbinary.readouterr().out == b"\xff\xfea\x1b%@caf\xe9"
+
+
+def test_filter_unknown_element(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        cli.main(["filter", "--drop", "Nonsense", str(tmp_path / "capture")])
+    assert "no such element: Nonsense" in capsys.readouterr().err
@@ -0,0 +1,13 @@
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize("module", ["outta.parser", "outta.cli"])
+def test_slow_modules_are_not_imported(module):
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    modules = set(completed.stdout.splitlines())
+    assert module in modules
+    assert not modules & {"pyte", "outta.ir", "outta.parallel", "concurrent.futures", "tempfile"}
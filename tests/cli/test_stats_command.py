@@ -0,0 +1,37 @@
+import io
+
+from outta import cli
+
+
+def test_stats(tmp_path):
+    path = tmp_path / "capture"
+    path.write_bytes(b"hi \x1b[1mbold\x1b[0m\x1b[1m")
+    output = io.StringIO()
+
+    cli.stats(str(path), top=1, output=output)
+
+    lines = output.getvalue().splitlines()
+    assert lines[1].split() == ["SelectGraphicRendition", "3", "12"]
+    assert lines[2].split() == ["Text", "2", "7"]
+    assert "Text: 36.8% of characters, control sequences: 63.2%" in lines
+    assert lines[lines.index("Top 1 sequences:") + 1].split() == ["2", repr("\x1b[1m")]
+    assert lines[-1].startswith("Parsed 0.00 MB in")
+
+
+def test_main_defaults_to_explain(tmp_path, capsys):
+    path = tmp_path / "capture"
+    path.write_bytes(b"hi")
+
+    cli.main([str(path)])
+    assert capsys.readouterr().out == "hi\n"
+
+    cli.main(["explain", str(path)])
+    assert capsys.readouterr().out == "hi\n"
+
+
+def test_main_stats(tmp_path, capsys):
+    path = tmp_path / "capture"
+    path.write_bytes(b"hi")
+
+    cli.main(["stats", str(path)])
+    assert capsys.readouterr().out.startswith("Element")
@@ -0,0 +1,24 @@
+import io
+
+from outta import cli
+
+
+def test_strip(tmp_path):
+    path = tmp_path / "capture"
+    path.write_bytes(b"hi \x1b[1mbold\x1b[0m\r\n\x1b]0;title\x07done\x1b[")
+    output = io.StringIO()
+
+    cli.strip(str(path), chunk_size=5, output=output)
+
+    assert output.getvalue() == "hi bold\r\ndone"
+
+
+def test_main_strip(tmp_path, capsys):
+    path = tmp_path / "capture"
+    path.write_bytes(b"a\x1b[1\x18b")
+
+    cli.main(["strip", str(path)])
+    assert capsys.readouterr().out == "ab"
+
+    cli.main(["strip", "--substitute", "?", str(path)])
+    assert capsys.readouterr().out == "a?b"
@@ -0,0 +1,60 @@
+import pytest
+from outta import elements
+from outta.columnar import KIND_IDS, KINDS
+from outta.parser import Parser
+
+TEXT = (
+    "plain \x1b[1;31mred\x1b[0m\r\n"
+    "\x1b[?25l\x1b[12;40H\x1b]2;a title\x07\x1b]0;both\x1b\\"
+    "\x1b#8\x1b%G\x07\x00\x1b[2J\x1bc\x18\x1b[9x"
+)
+
+
+def test_every_element_type_has_a_kind():
+    element_types = {
+        value
+        for value in vars(elements).values()
+        if isinstance(value, type) and issubclass(value, elements.Element) and value is not elements.Element
+    }
+    assert set(KINDS) == element_types
+    assert len(KIND_IDS) == len(KINDS)
+
+
+def test_kind_ids_are_stable():
+    assert KIND_IDS[elements.AlignmentDisplay] == 0
+    assert KIND_IDS[elements.SelectGraphicRendition] == 33
+    assert KIND_IDS[elements.Text] == 45
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, len(TEXT)])
+def test_elements_match_feed(chunk_size):
+    chunks = [TEXT[i : i + chunk_size] for i in range(0, len(TEXT), chunk_size)]
+
+    parser = Parser()
+    expected = [element for chunk in chunks for element in parser.feed(chunk)]
+
+    parser = Parser()
+    table = None
+    for chunk in chunks:
+        table = parser.feed_columnar(chunk, table)
+    actual = list(table.elements(TEXT))
+
+    assert actual == expected
+    assert [type(e) for e in actual] == [type(e) for e in expected]
+    assert [table.kind(row) for row in range(len(table))] == [type(e) for e in expected]
+
+
+def test_columns():
+    table = Parser().feed_columnar("ab\x1b[1;2H\x1b]2;x\x07")
+
+    assert [KINDS[kind] for kind in table.kinds] == [elements.Text, elements.CursorPosition, elements.SetTitle]
+    assert list(table.starts) == [0, 2, 8]
+    assert list(table.ends) == [2, 8, 14]
+    assert list(table.parameter_offsets) == [0, 0, 2, 2]
+    assert list(table.parameters) == [1, 2]
+    assert table.keywords == {2: {"title": "x"}}
+
+
+def test_element_without_source():
+    table = Parser().feed_columnar("\x1b[5C")
+    assert table.element(0) == elements.CursorForward((5,), {}, "")
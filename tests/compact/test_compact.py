@@ -0,0 +1,93 @@
+import pytest
+from outta.compact import Compactor, compact
+from outta.elements import CursorBack, CursorForward, CursorUp, SelectGraphicRendition, Text
+from outta.parser import Parser
+from outta.screen import Screen
+from corpus import random_chunks, random_corpus
+
+PIECES = (
+    "text ",
+    "\r\n",
+    "\x1b[C",
+    "\x1b[3C",
+    "\x1b[D",
+    "\x1b[2A",
+    "\x1b[B",
+    "\x1b[?5C",
+    "\x1b[1m",
+    "\x1b[0m",
+    "\x1b[31;4m",
+    "\x1b[38;5;0m",
+    "\x1b[48;2;1;0;3m",
+    "\x1b[38m",
+    "\x1b[m",
+    "\x1b[K",
+    "\x1b[5;9H",
+    "\x00",
+    "\x1b[1\x18",
+)
+
+
+def _parse_in_chunks(text, seed):
+    parser = Parser()
+    for chunk in random_chunks(text, seed, 8):
+        yield from parser.feed(chunk)
+
+
+def _screen(items):
+    screen = Screen(30, 10)
+    screen.feed(items)
+    styles = [list(styles) for _, styles in screen.changes().values()]
+    return screen.display, styles, (screen.x, screen.y, screen.style)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_compaction_keeps_text_and_effect(seed):
+    text = random_corpus(seed, 400, PIECES)
+    original = list(_parse_in_chunks(text, seed))
+    compacted = list(compact(original))
+    assert "".join(element.text for element in compacted) == "".join(element.text for element in original)
+    assert _screen(compacted) == _screen(original)
+    assert len(compacted) < len(original)
+
+
+def test_text_is_coalesced_across_feeds():
+    compactor = Compactor()
+    parser = Parser()
+    output = []
+    for chunk in ["hel", "lo ", "wor", "ld"]:
+        output.extend(compactor.feed(parser.feed(chunk)))
+    assert output == []
+    assert list(compactor.flush()) == [Text((), None, "hello world")]
+    assert list(compactor.flush()) == []
+
+
+def test_moves_are_folded():
+    compacted = list(compact(Parser().feed("\x1b[C" * 20 + "\x1b[2C\x1b[D\x1b[D\x1b[A")))
+    assert [(type(element), element.parameters) for element in compacted] == [
+        (CursorForward, (22,)),
+        (CursorBack, (2,)),
+        (CursorUp, (0,)),
+    ]
+
+
+def test_folded_moves_stay_within_the_parameter_limit():
+    compacted = list(compact(Parser().feed("\x1b[9999C\x1b[C")))
+    assert [element.parameters for element in compacted] == [(9999,), (0,)]
+
+
+@pytest.mark.parametrize(
+    "text, parameters",
+    [
+        ("\x1b[1m\x1b[31m", [(1, 31)]),
+        ("\x1b[1m\x1b[0m", [(0,)]),
+        ("\x1b[1m\x1b[m\x1b[4m", [(0, 4)]),
+        ("\x1b[1m\x1b[38;5;0m", [(1, 38, 5, 0)]),
+        ("\x1b[1m\x1b[38;5m\x1b[0;1m", [(1, 38, 5), (0, 1)]),
+    ],
+)
+def test_overridden_renditions_are_dropped(text, parameters):
+    compacted = list(compact(Parser().feed(text)))
+    assert {type(element) for element in compacted} == {SelectGraphicRendition}
+    assert [element.parameters for element in compacted] == parameters
+    assert "".join(element.text for element in compacted) == text
@@ -0,0 +1,5 @@
+"""Configuration shared by all the tests.
+
+pytest puts the directory of this file on ``sys.path``, so tests can import the helpers next to it, e.g.
+``from corpus import random_corpus``.
+"""
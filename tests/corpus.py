@@ -0,0 +1,96 @@
+"""Random terminal output, for tests which check that different ways of parsing it give the same result.
+
+The same seed always gives the same output, so a failure can be reproduced.
+"""
+
+import random
+
+#: Pieces of terminal output which between them take every path through the parser: text, basic
+#: controls, sequences which are whole, unfinished, cancelled or interrupted by a control, charset
+#: selection, and non-ASCII text. They're all Latin-1, so a corpus can be encoded either way.
+PIECES = (
+    "hello",
+    " world ",
+    "\n",
+    "\r\n",
+    "\x07",
+    "\x08",
+    "\t",
+    "\x0b",
+    "\x0c",
+    "\x0e",
+    "\x0f",
+    "\x00",
+    "\x7f",
+    "\x18",
+    "\x1a",
+    "\x1b",
+    "\x1b[",
+    "\x1b[0m",
+    "\x1b[1;31m",
+    "\x1b[38;5;208m",
+    "\x1b[38;2;10;20;30m",
+    "\x1b[;m",
+    "\x1b[99999C",
+    "\x1b[?25h",
+    "\x1b[?1049l",
+    "\x1b[>c",
+    "\x1b[ q",
+    "\x1b[1\n2H",
+    "\x1b[2$p",
+    "\x1b[5'",
+    "\x1b[1:2m",
+    "\x9b2J",
+    "\x1b#8",
+    "\x1b#x",
+    "\x1b%G",
+    "\x1b%@",
+    "\x1b(B",
+    "\x1b)0",
+    "\x1bc",
+    "\x1b7",
+    "\x1b\x1b",
+    "\x1b]0;title\x07",
+    "\x1b]1;icon\x1b\\",
+    "\x9d2;other title\x9c",
+    "\x1b]2;esc \x1bx inside\x07",
+    "\x1b]10;rgb:ffff\x07",
+    "\x1b]R",
+    "\x1b]P",
+    "\x1b]",
+    "\xe9t\xe9",
+)
+
+
+def random_corpus(seed, count=300, pieces=PIECES):
+    """Join pieces chosen at random.
+
+    Args:
+        seed: The seed for choosing them.
+        count: The number of pieces.
+        pieces: The pieces to choose from.
+
+    Returns:
+        The text.
+    """
+    rng = random.Random(seed)
+    return "".join(rng.choice(pieces) for _ in range(count))
+
+
+def random_chunks(data, seed, max_size=16):
+    """Split text or bytes into chunks of random sizes.
+
+    Args:
+        data: The text or bytes.
+        seed: The seed for choosing the sizes.
+        max_size: The largest size of a chunk.
+
+    Returns:
+        An iterable of the chunks.
+    """
+    rng = random.Random(seed)
+    offset = 0
+    while offset < len(data):
+        size = rng.randint(1, max_size)
+        yield data[offset : offset + size]
+        offset += size
@@ -0,0 +1,57 @@
+import pickle
+
+import pytest
+from outta import elements
+from outta.elements import CursorForward, SetTitle, Text
+
+ELEMENT_TYPES = [
+    value
+    for value in vars(elements).values()
+    if isinstance(value, type) and issubclass(value, elements.Element)
+]
+
+
+@pytest.mark.parametrize("element_type", ELEMENT_TYPES, ids=lambda t: t.__name__)
+def test_elements_have_no_dict(element_type):
+    element = element_type((), {}, "")
+    assert not hasattr(element, "__dict__")
+
+
+def test_empty_parameters_and_keywords_are_shared():
+    first = Text((), {}, "a")
+    second = CursorForward([], {}, "b")
+    assert first.parameters is second.parameters
+    assert first.keywords is second.keywords
+
+
+def test_elements_are_read_only():
+    element = SetTitle((), {"title": "x"}, "\x1b]2;x\x07")
+    with pytest.raises(AttributeError):
+        element.text = "y"
+    with pytest.raises(TypeError):
+        element.keywords["title"] = "y"
+
+
+def test_equal_elements_have_equal_hashes():
+    first = SetTitle((), {"title": "x"}, "\x1b]2;x\x07")
+    second = SetTitle([], dict(title="x"), "\x1b]2;x\x07")
+    assert first == second
+    assert hash(first) == hash(second)
+    assert len({first, second}) == 1
+
+
+def test_comparison_with_other_types():
+    assert Text((), {}, "a") != "a"
+
+
+def test_getitem():
+    element = SetTitle((1,), {"title": "x"}, "")
+    assert element[0] == 1
+    assert element["title"] == "x"
+
+
+def test_pickle():
+    element = SetTitle((1, 2), {"title": "x"}, "text")
+    copy = pickle.loads(pickle.dumps(element))
+    assert type(copy) is SetTitle
+    assert copy == element
@@ -0,0 +1,66 @@
+import pytest
+from outta.index import Index
+from outta.parser import Parser
+from corpus import random_corpus
+
+PIECES = (
+    "text ",
+    "café ",
+    "\r\n",
+    "\x1b[1;31m",
+    "\x1b]2;a longer title\x07",
+    "\x1b%@",
+    "\x1b%G",
+    "\x1b[1\x18",
+)
+
+
+@pytest.fixture
+def capture(tmp_path):
+    data = random_corpus(0, 2000, PIECES).encode("utf-8")
+    path = tmp_path / "capture"
+    path.write_bytes(data)
+    return str(path), data
+
+
+def _parse_in_chunks(data, chunk_size):
+    parser = Parser()
+    chunks = [data[offset : offset + chunk_size] for offset in range(0, len(data), chunk_size)]
+    return [element for chunk in chunks for element in parser.feed_bytes(chunk)]
+
+
+def test_build(capture):
+    filename, data = capture
+    index = Index.build(filename, interval=1000, chunk_size=100)
+    assert index.size == len(data)
+    assert index.count == len(_parse_in_chunks(data, 100))
+    assert [checkpoint.offset for checkpoint in index.checkpoints] == list(range(0, len(data), 1000))
+
+
+def test_element_interval(capture):
+    filename, _ = capture
+    index = Index.build(filename, interval=10**9, element_interval=50, chunk_size=64)
+    ordinals = [checkpoint.ordinal for checkpoint in index.checkpoints]
+    assert len(ordinals) > 10
+    assert all(0 < later - earlier < 50 + 64 for earlier, later in zip(ordinals, ordinals[1:]))
+
+
+@pytest.mark.parametrize("start, stop", [(0, 10), (123, 456), (700, None), (5, 5)])
+def test_elements_by_ordinal(capture, start, stop):
+    filename, data = capture
+    index = Index.build(filename, interval=1000, chunk_size=100)
+    expected = _parse_in_chunks(data, 100)[start:stop]
+    actual = list(index.elements(filename, start, stop))
+    assert actual == expected
+    assert [type(element) for element in actual] == [type(element) for element in expected]
+
+
+def test_elements_at_offset(capture, tmp_path):
+    filename, data = capture
+    index = Index.build(filename, interval=1000, chunk_size=100)
+    index.save(str(tmp_path / "capture.index"))
+    index = Index.load(str(tmp_path / "capture.index"))
+
+    checkpoint = index.checkpoint_at(4321)
+    assert checkpoint.offset == 4000
+    assert list(index.elements_at(filename, 4321)) == _parse_in_chunks(data, 100)[checkpoint.ordinal :]
@@ -0,0 +1,159 @@
+import io
+import random
+import string
+
+import pytest
+from outta import elements, ir
+from outta.parser import Parser
+from corpus import random_corpus
+
+PIECES = (
+    "text ",
+    "café ",
+    "\r\n",
+    "\x1b[0m",
+    "\x1b[1;31m",
+    "\x1b[?25h",
+    "\x1b[12;40H",
+    "\x1b]0;host:~\x07",
+    "\x1b]2;título\x1b\\",
+    "\x1b#8",
+    "\x1b%G",
+    "\x1b(B",
+    "\x1b[1",
+    "\x00",
+    "\x1b[1\x18",
+    "\x9b2J",
+)
+
+
+def _round_trip(items, **kwargs):
+    stream = io.BytesIO()
+    ir.dump(items, stream, **kwargs)
+    return list(ir.loads(stream.getvalue()))
+
+
+def _same(actual, expected):
+    return actual == expected and [type(element) for element in actual] == [type(element) for element in expected]
+
+
+@pytest.mark.parametrize("block_size", [1, 16, ir.BLOCK_SIZE])
+@pytest.mark.parametrize("seed", range(5))
+def test_round_trip(seed, block_size):
+    parser = Parser()
+    text = random_corpus(seed, 500, PIECES)
+    expected = [element for offset in range(0, len(text), 7) for element in parser.feed(text[offset : offset + 7])]
+    assert _same(_round_trip(expected, block_size=block_size), expected)
+
+
+def test_keywords_and_unusual_values_round_trip():
+    expected = [
+        elements.DefineCharset((), {"code": "0", "mode": "("}, "\x1b(0"),
+        elements.EraseInLine([2], {"private": True}, "\x1b[?2K"),
+        elements.Debug([-3, 10**12], {"flag": False, "missing": None, "count": -1}, ""),
+        elements.Text((), None, ""),
+        elements.Text((), None, "\ud800 lone surrogate"),
+    ]
+    actual = _round_trip(expected)
+    assert _same(actual, expected)
+    assert [dict(element.keywords) for element in actual] == [dict(element.keywords) for element in expected]
+
+
+def test_repeated_sequences_take_one_byte():
+    stream = io.BytesIO()
+    ir.dump(Parser().feed("\x1b[0m" * 1000), stream)
+    assert len(stream.getvalue()) < len(ir.MAGIC) + 1000 + 50
+
+
+def test_payloads_are_stored_once():
+    # Longer than zlib's window, and random, so that a second copy would take up as much again.
+    rng = random.Random(0)
+    title = "".join(rng.choice(string.ascii_letters) for _ in range(100_000))
+    stream = io.BytesIO()
+    ir.dump(Parser().feed(f"\x1b]0;{title}\x07"), stream)
+    assert len(stream.getvalue()) < len(title)
+    (element,) = ir.loads(stream.getvalue())
+    assert element.keywords == {"name": title, "title": title}
+
+
+@pytest.mark.parametrize("max_entries", [1, 4, 10])
+def test_table_is_bounded(max_entries):
+    parser = Parser()
+    expected = [element for title in range(200) for element in parser.feed(f"\x1b]2;{title}\x07\x1b[{title}A ")]
+    stream = io.BytesIO()
+    with ir.Writer(stream, block_size=64, max_entries=max_entries) as writer:
+        for element in expected:
+            writer.write([element])
+            # An element's entry, and those of its keyword names and string values.
+            assert len(writer._entries) + len(writer._strings) <= max_entries + 3
+    assert _same(list(ir.loads(stream.getvalue())), expected)
+
+
+def test_load_from_file(tmp_path):
+    expected = list(Parser().feed(random_corpus(1, 500, PIECES)))
+    path = tmp_path / "capture.ir"
+    with open(path, "wb") as handle:
+        ir.dump(expected, handle)
+    assert _same(list(ir.load(str(path))), expected)
+
+
+def test_not_ir():
+    with pytest.raises(ir.FormatError):
+        list(ir.loads(b"\x1b[0m"))
+
+
+def test_cache_reuses_parsed_files(tmp_path, monkeypatch):
+    data = random_corpus(2, 500, PIECES).encode("utf-8")
+    path = tmp_path / "capture"
+    path.write_bytes(data)
+    cache = ir.ParseCache(str(tmp_path / "cache"))
+    expected = list(Parser().feed_bytes(data))
+
+    assert _same(list(cache.parse_file(str(path))), expected)
+    assert cache.get(cache.key([data])) is not None
+
+    # Now the parser isn't needed.
+    monkeypatch.setattr(ir, "Parser", None)
+    assert _same(list(cache.parse_file(str(path))), expected)
+    assert _same(list(cache.parse_bytes(data)), expected)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64 * 1024])
+def test_cache_is_the_same_whatever_the_chunk_size(tmp_path, chunk_size):
+    data = random_corpus(4, 500, PIECES).encode("utf-8")
+    path = tmp_path / "capture"
+    path.write_bytes(data)
+    cache = ir.ParseCache(str(tmp_path / "cache"))
+    expected = list(Parser().feed_bytes(data))
+
+    assert _same(list(cache.parse_file(str(path), chunk_size)), expected)
+    assert _same(list(cache.parse_bytes(data)), expected)
+
+
+def test_file_which_grows_is_cached_as_parsed(tmp_path, monkeypatch):
+    path = tmp_path / "capture"
+    path.write_bytes(b"before \x1b[1m")
+    read_chunks = ir._read_chunks
+
+    def growing_read_chunks(filename, chunk_size):
+        yield from read_chunks(filename, chunk_size)
+        with open(filename, "ab") as handle:
+            handle.write(b"after")
+
+    monkeypatch.setattr(ir, "_read_chunks", growing_read_chunks)
+    cache = ir.ParseCache(str(tmp_path / "cache"))
+    parsed = list(cache.parse_file(str(path)))
+
+    assert [element.text for element in parsed] == ["before ", "\x1b[1m", "after"]
+    assert cache.get(cache.key([b"before \x1b[1m"])) is None
+    assert _same(list(cache.get(cache.key([b"before \x1b[1mafter"]))), parsed)
+
+
+def test_cache_entry_is_only_added_once_complete(tmp_path):
+    data = random_corpus(3, 500, PIECES).encode("utf-8")
+    cache = ir.ParseCache(str(tmp_path))
+    items = cache.parse_bytes(data)
+    next(items)
+    items.close()
+    assert cache.get(cache.key([data])) is None
+    assert [path.name for path in tmp_path.rglob("*") if path.is_file()] == []
@@ -0,0 +1,169 @@
+import time
+
+import pytest
+from outta.metrics import Metrics
+from outta.parser import Parser
+from corpus import random_corpus
+
+PIECES = (
+    "text ",
+    "\r\n",
+    "\x1b[0m",
+    "\x1b[1;31m",
+    "\x1b]2;title\x07",
+    "\x1b#8",
+    "\x1b%G",
+    "\x1b(B",
+    "\x1b[1",
+    "\x1b[?1049h",
+    "\x00",
+    "é",
+)
+
+
+def _feed(parser, data):
+    return list(parser.feed(data))
+
+
+def test_text_is_counted():
+    metrics = Metrics()
+    _feed(Parser(metrics=metrics), "hello")
+    assert metrics.text_characters == 5
+    assert metrics.sequence_characters == 0
+    assert metrics.fsm_characters == 0
+    assert not metrics.tables
+
+
+def test_fast_path_sequences_are_counted():
+    metrics = Metrics()
+    _feed(Parser(metrics=metrics), "a\x1b[1;31mb\x1b]2;title\x07\r\x1b#8\x1b%G")
+    assert metrics.text_characters == 2
+    assert metrics.sequence_characters == 7 + 10 + 1 + 3 + 3
+    assert metrics.fsm_characters == 0
+    assert metrics.tables == {"csi": 1, "osc": 1, "basic": 1, "sharp": 1, "percent": 1}
+    assert metrics.lengths == {1: 1, 2: 2, 3: 1, 4: 1}
+    assert metrics.debug == 0
+
+
+def test_split_sequences_go_through_the_fsm():
+    metrics = Metrics()
+    parser = Parser(metrics=metrics)
+    _feed(parser, "\x1b[1;3")
+    _feed(parser, "1m")
+    assert metrics.sequence_characters == 0
+    assert metrics.fsm_characters == 7
+    assert metrics.tables == {"csi": 1}
+    assert metrics.lengths == {3: 1}
+
+
+def test_unknown_sequences_are_counted_as_debug():
+    metrics = Metrics()
+    _feed(Parser(metrics=metrics), "\x1b[1y")
+    assert metrics.debug == 1
+    assert metrics.tables == {"csi": 1}
+
+
+def test_sequences_which_are_too_long_are_counted_as_debug():
+    metrics = Metrics()
+    _feed(Parser(max_sequence_length=8, metrics=metrics), "\x1b]2;a long title\x07")
+    assert metrics.debug == 1
+    assert metrics.tables["osc"] == 1
+    assert metrics.lengths[4] == 1
+
+
+def test_long_split_sequences_take_linear_time():
+    # Each character of a sequence which goes through the FSM used to copy the whole sequence so far.
+    data = "\x1b]2;" + "x" * 400_000
+    timings = []
+    for metrics in (None, Metrics()):
+        parser = Parser(metrics=metrics)
+        started = time.perf_counter()
+        _feed(parser, data[:200_000])
+        _feed(parser, data[200_000:] + "\x07")
+        timings.append(time.perf_counter() - started)
+
+    assert metrics.fsm_characters == len(data) + 1
+    assert metrics.tables == {"osc": 1}
+    assert metrics.lengths == {(len(data) + 1).bit_length(): 1}
+    assert timings[1] < 5 * timings[0] + 0.1
+
+
+def test_fsm_resets_are_counted():
+    metrics = Metrics()
+    parser = Parser(metrics=metrics)
+    parser._parser = None
+    with pytest.raises(Exception):
+        _feed(parser, "\x1b[1")
+    assert metrics.fsm_resets == 1
+    assert metrics.debug == 0
+
+    assert _feed(parser, "\x1b[1m") == _feed(Parser(), "\x1b[1m")
+
+
+def test_restore_carries_on_counting_the_sequence():
+    parser = Parser()
+    _feed(parser, "\x1b[1;3")
+    metrics = Metrics()
+    restored = Parser(metrics=metrics)
+    restored.restore(parser.snapshot())
+    _feed(restored, "1m")
+    assert metrics.tables == {"csi": 1}
+    assert metrics.lengths == {3: 1}
+
+
+def test_metrics_dont_change_the_elements():
+    data = random_corpus(20, 2000, PIECES)
+    chunks = [data[index : index + 7] for index in range(0, len(data), 7)]
+
+    parser = Parser()
+    expected = [element for chunk in chunks for element in parser.feed(chunk)]
+    metrics = Metrics()
+    parser = Parser(metrics=metrics)
+    actual = [element for chunk in chunks for element in parser.feed(chunk)]
+
+    assert actual == expected
+    assert [type(element) for element in actual] == [type(element) for element in expected]
+    assert metrics.text_characters + metrics.sequence_characters + metrics.fsm_characters == len(data)
+
+
+def test_exporter_is_called():
+    exported = []
+    metrics = Metrics(exporter=exported.append, export_interval=0)
+    parser = Parser(metrics=metrics)
+    _feed(parser, "a\x1b[1m")
+    _feed(parser, "b")
+    assert len(exported) == 2
+    assert exported[-1]["text_characters"] == 2
+
+
+def test_exporter_waits_for_the_interval():
+    exported = []
+    metrics = Metrics(exporter=exported.append, export_interval=3600)
+    _feed(Parser(metrics=metrics), "a")
+    assert not exported
+    metrics.export()
+    assert exported == [metrics.as_dict()]
+
+
+def test_as_dict():
+    metrics = Metrics()
+    _feed(Parser(metrics=metrics), "ab\x1b[1m")
+    assert metrics.as_dict() == {
+        "text_characters": 2,
+        "sequence_characters": 4,
+        "fsm_characters": 0,
+        "tables": {"csi": 1},
+        "debug": 0,
+        "fsm_resets": 0,
+        "lengths": {"<8": 1},
+    }
+
+    metrics.reset()
+    assert metrics.as_dict()["text_characters"] == 0
+
+
+def test_feed_bytes_is_counted():
+    metrics = Metrics()
+    list(Parser(metrics=metrics).feed_bytes(b"ab\x1b[1m"))
+    assert metrics.text_characters == 2
+    assert metrics.tables == {"csi": 1}
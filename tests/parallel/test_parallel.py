@@ -0,0 +1,104 @@
+import pytest
+from outta import parallel
+from outta.parser import Parser
+from corpus import random_corpus
+
+PIECES = (
+    "plain text ",
+    "\r\n",
+    "\x1b[1;31m",
+    "\x1b[0m",
+    "\x1b[12;40H",
+    "\x1b]2;a title\x07",
+    "\x1b]2;esc \x1bx inside a title\x07",
+    "\x1b[1",
+    "\x1b(B",
+    "\x00",
+    "\x1b%@",
+    "\x1b%G",
+    "caf\xe9 ",
+)
+
+
+def test_split_points_are_at_esc():
+    text = random_corpus(0, 500, PIECES)
+    points = parallel.split_points(text, 8)
+
+    assert len(points) == 7
+    assert points == sorted(set(points))
+    assert all(text[point] == "\x1b" for point in points)
+
+
+def test_split_points_without_esc():
+    assert parallel.split_points("no escapes here", 4) == []
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_parse_matches_serial(seed):
+    text = random_corpus(seed, 500, PIECES)
+    expected = list(Parser().feed(text))
+
+    actual = parallel.parse(text, workers=2, part_size=len(text) // 16)
+
+    assert actual == expected
+    assert [type(e) for e in actual] == [type(e) for e in expected]
+
+
+def test_split_inside_sequence_is_reparsed():
+    # The only ESCs after the start are inside the OSC payload, so every split lands inside it.
+    text = "\x1b]2;" + "title \x1bx " * 100 + "\x07done"
+    expected = list(Parser().feed(text))
+
+    assert parallel.parse(text, workers=2, part_size=len(text) // 8) == expected
+
+
+@pytest.mark.parametrize("in_file", [False, True])
+def test_reparsing_after_a_split_sequence_is_linear(tmp_path, monkeypatch, in_file):
+    # A stray sequence early on which isn't finished until much later means that each part up to its end is
+    # fed to a parser in this process, once.
+    text = "start \x1b]2;" + "title \x1bx " * 2000 + "\x07" + "plain \x1b[1mbold\x1b[0m\r\n" * 1000
+    expected = list(Parser().feed(text))
+    path = tmp_path / "capture"
+    path.write_bytes(text.encode("utf-8"))
+    part_size = len(text) // 32
+
+    reparsed = []
+    carry_on_text, carry_on_file = parallel._carry_on_text, parallel._carry_on_file
+
+    def counting_carry_on_text(parser, piece):
+        reparsed.append(len(piece))
+        return carry_on_text(parser, piece)
+
+    def counting_carry_on_file(parser, filename, start, end):
+        reparsed.append(end - start)
+        return carry_on_file(parser, filename, start, end)
+
+    monkeypatch.setattr(parallel, "_carry_on_text", counting_carry_on_text)
+    monkeypatch.setattr(parallel, "_carry_on_file", counting_carry_on_file)
+
+    if in_file:
+        actual = list(parallel.parse_file(str(path), workers=2, part_size=part_size))
+    else:
+        actual = parallel.parse(text, workers=2, part_size=part_size)
+
+    assert actual == expected
+    assert 0 < sum(reparsed) <= text.index("\x07") + 2 * part_size
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_parse_file_matches_serial(tmp_path, seed):
+    data = random_corpus(seed, 500, PIECES).encode("utf-8") + b"\xc3"
+    path = tmp_path / "capture"
+    path.write_bytes(data)
+    expected = list(Parser().feed_bytes(data))
+
+    actual = list(parallel.parse_file(str(path), workers=2, part_size=len(data) // 16))
+
+    assert actual == expected
+    assert [type(e) for e in actual] == [type(e) for e in expected]
+
+
+def test_parse_empty_file(tmp_path):
+    path = tmp_path / "capture"
+    path.write_bytes(b"")
+    assert list(parallel.parse_file(str(path), workers=2)) == []
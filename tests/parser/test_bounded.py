@@ -0,0 +1,66 @@
+from outta.elements import Debug, SelectGraphicRendition, SetTitle, Text
+from outta.parser import Parser
+
+
+def _parse(parser, *chunks):
+    result = []
+    for chunk in chunks:
+        result.extend(parser.feed(chunk))
+    return result
+
+
+def test_sequences_within_limits_are_unaffected():
+    text = "\x1b[1;31mred\x1b]2;title\x07"
+    parser = Parser(max_sequence_length=64, max_parameter_length=4, max_osc_length=16)
+    assert _parse(parser, text) == _parse(Parser(), text)
+
+
+def test_long_osc_payload_is_truncated():
+    payload = "x" * 100
+    text = f"\x1b]2;{payload}\x07after"
+    actual = _parse(Parser(max_osc_length=10), text)
+
+    assert type(actual[0]) is Debug
+    assert actual[0].text == "\x1b]2;xxxxxxxxxx"
+    assert "".join(e.text for e in actual) == text
+
+
+def test_long_parameter_is_truncated():
+    text = "\x1b[" + "1" * 20 + "m\x1b[1m"
+    actual = _parse(Parser(max_parameter_length=5), text)
+
+    assert type(actual[0]) is Debug
+    assert actual[0].text == "\x1b[111111"
+    assert actual[-1] == SelectGraphicRendition((1,), {}, "\x1b[1m")
+    assert "".join(e.text for e in actual) == text
+
+
+def test_long_sequence_is_truncated():
+    text = "\x1b[" + ";" * 30 + "m"
+    actual = _parse(Parser(max_sequence_length=8), text)
+
+    assert actual[0] == Debug((), {}, text[:8])
+    assert "".join(e.text for e in actual) == text
+
+
+def test_limits_apply_across_feeds():
+    parser = Parser(max_sequence_length=8)
+    chunks = ["\x1b]2;ti", "tle that", " is long", "\x07"]
+    actual = _parse(parser, *chunks)
+
+    assert actual[0] == Debug((), {}, "\x1b]2;titl")
+    assert "".join(e.text for e in actual) == "".join(chunks)
+
+
+def test_ignored_characters_are_bounded():
+    parser = Parser(max_sequence_length=4)
+    actual = _parse(parser, "\x00" * 10, "a")
+
+    assert actual == [Debug((), {}, "\x00" * 4), Debug((), {}, "\x00" * 4), Text(("a",), {}, "\x00\x00a")]
+
+
+def test_parser_recovers_after_truncation():
+    parser = Parser(max_osc_length=4)
+    actual = _parse(parser, "\x1b]2;long title\x07", "\x1b]2;ok\x07")
+
+    assert actual[-1] == SetTitle((), {"title": "ok"}, "\x1b]2;ok\x07")
@@ -0,0 +1,78 @@
+import pytest
+from outta.cache import SequenceCache
+from outta.elements import SelectGraphicRendition, Text
+from outta.parser import Parser
+from corpus import random_chunks, random_corpus
+
+PIECES = (
+    "text ",
+    "\r\n",
+    "\x1b[0m",
+    "\x1b[1;31m",
+    "\x1b[?25h",
+    "\x1b[K",
+    "\x1b[12;40H",
+    "\x1b]2;title\x07",
+    "\x1b#8",
+    "\x1b%G",
+    "\x1b%@",
+    "\x1b(B",
+    "\x0e",
+    "\x00",
+    "\x1b[1",
+    "\x9b2J",
+)
+
+
+@pytest.mark.parametrize("use_utf8", [True, False])
+@pytest.mark.parametrize("seed", range(10))
+def test_cached_output_matches_uncached(seed, use_utf8):
+    text = random_corpus(seed, 300, PIECES)
+    results = []
+    for parser in (Parser(), Parser(cache_size=4)):
+        parser.use_utf8 = use_utf8
+        results.append([element for chunk in random_chunks(text, seed) for element in parser.feed(chunk)])
+
+    expected, actual = results
+    assert actual == expected
+    assert [type(e) for e in actual] == [type(e) for e in expected]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cached_bytes_output_matches_uncached(seed):
+    data = random_corpus(seed, 300, PIECES).encode("latin-1")
+    expected = list(Parser().feed_bytes(data))
+    actual = list(Parser(cache_size=8).feed_bytes(data))
+    assert actual == expected
+    assert [type(e) for e in actual] == [type(e) for e in expected]
+
+
+def test_repeated_sequences_are_reused():
+    parser = Parser(cache_size=8)
+    elements = list(parser.feed("\x1b[1mA\x1b[1mB\x1b[1m"))
+
+    assert elements[0] == SelectGraphicRendition((1,), {}, "\x1b[1m")
+    assert elements[0] is elements[2] is elements[4]
+    assert type(elements[1]) is Text
+    assert (parser.cache.hits, parser.cache.misses) == (2, 1)
+
+
+def test_no_cache_by_default():
+    assert Parser().cache is None
+
+
+def test_least_recently_used_is_evicted():
+    cache = SequenceCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
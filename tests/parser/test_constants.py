@@ -0,0 +1,21 @@
+import pytest
+from outta import control, escape
+
+pyte = pytest.importorskip("pyte")
+from pyte import control as pyte_control  # noqa: E402
+from pyte import escape as pyte_escape  # noqa: E402
+
+
+def _constants(module):
+    return {name: value for name, value in vars(module).items() if name.isupper()}
+
+
+@pytest.mark.parametrize("module, pyte_module", [(control, pyte_control), (escape, pyte_escape)])
+def test_constants_match_pyte(module, pyte_module):
+    constants = _constants(module)
+    pyte_constants = _constants(pyte_module)
+    assert constants == {name: pyte_constants[name] for name in constants}
+
+
+def test_all_of_pytes_control_characters_are_there():
+    assert set(_constants(pyte_control)) <= set(_constants(control))
@@ -0,0 +1,62 @@
+import pytest
+from outta.elements import (CursorForward, DisableUTF8Mode, EnableUTF8Mode,
+                            SetTitle, Text)
+from outta.parser import Parser
+
+
+def _parse(parser, *chunks):
+    result = []
+    for chunk in chunks:
+        result.extend(parser.feed_bytes(chunk))
+    return result
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_bytes_like_input(wrap):
+    text = "café \x1b[4C\x1b]2;tïtle\x07"
+    actual = _parse(Parser(), wrap(text.encode("utf-8")))
+    assert actual == list(Parser().feed(text))
+
+
+def test_multibyte_character_split_between_calls():
+    data = "\x1b[4Cé€".encode("utf-8")
+    actual = _parse(Parser(), *(data[i : i + 1] for i in range(len(data))))
+
+    assert actual[0] == CursorForward((4,), {}, "\x1b[4C")
+    assert "".join(e.text for e in actual[1:]) == "é€"
+
+
+def test_invalid_utf8_is_replaced():
+    actual = _parse(Parser(), b"a\xffb")
+    assert "".join(e.text for e in actual) == "a�b"
+
+
+def test_c1_bytes_without_utf8():
+    parser = Parser()
+    parser.use_utf8 = False
+    actual = _parse(parser, b"\x9b4C\x9d2;title\x9c")
+
+    assert actual == [
+        CursorForward((4,), {}, "\x9b4C"),
+        SetTitle((), {"title": "title"}, "\x9d2;title\x9c"),
+    ]
+
+
+def test_c1_bytes_with_utf8_are_not_controls():
+    actual = _parse(Parser(), b"\x9b4C")
+    assert actual == [Text((), {}, "�4C")]
+
+
+@pytest.mark.parametrize("split", range(1, 6))
+def test_select_charset_switches_decoding(split):
+    data = b"\x1b%@\x9b4C\x1b%G\xc3\xa9"
+    parser = Parser()
+    actual = _parse(parser, data[:split], data[split:])
+
+    assert actual == [
+        DisableUTF8Mode((), {}, "\x1b%@"),
+        CursorForward((4,), {}, "\x9b4C"),
+        EnableUTF8Mode((), {}, "\x1b%G"),
+        Text((), {}, "é"),
+    ]
+    assert parser.use_utf8
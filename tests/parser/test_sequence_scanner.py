@@ -0,0 +1,43 @@
+# Differential tests for the whole-sequence scanner in Parser.feed.
+#
+# The scanner is only an optimization, so for any input and any way of chunking it, the
+# elements must be exactly what the character-at-a-time FSM produces.
+
+import re
+
+import pytest
+from outta.parser import Parser
+from corpus import random_chunks, random_corpus
+
+
+class FSMOnlyParser(Parser):
+    "A Parser which never takes the whole-sequence fast path."
+    _sequence_pattern = re.compile("(?!)")
+
+
+def _parse(parser, chunks, use_utf8):
+    parser.use_utf8 = use_utf8
+    result = []
+    for chunk in chunks:
+        result.extend(parser.feed(chunk))
+    return result
+
+
+@pytest.mark.parametrize("use_utf8", [True, False])
+@pytest.mark.parametrize("seed", range(20))
+def test_whole_input_matches_fsm(seed, use_utf8):
+    text = random_corpus(seed, 200)
+    expected = _parse(FSMOnlyParser(), [text], use_utf8)
+    actual = _parse(Parser(), [text], use_utf8)
+    assert actual == expected
+    assert [type(e) for e in actual] == [type(e) for e in expected]
+
+
+@pytest.mark.parametrize("use_utf8", [True, False])
+@pytest.mark.parametrize("seed", range(20))
+def test_chunked_input_matches_fsm(seed, use_utf8):
+    text = random_corpus(seed, 200)
+    expected = _parse(FSMOnlyParser(), random_chunks(text, seed), use_utf8)
+    actual = _parse(Parser(), random_chunks(text, seed), use_utf8)
+    assert actual == expected
+    assert [type(e) for e in actual] == [type(e) for e in expected]
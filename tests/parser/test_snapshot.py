@@ -0,0 +1,64 @@
+import pickle
+import random
+
+import pytest
+from outta.parser import Parser, ParserState
+from corpus import random_corpus
+
+PIECES = (
+    "text ",
+    "café ",
+    "\r\n",
+    "\x1b[1;31m",
+    "\x1b[?25h",
+    "\x1b]2;title\x07",
+    "\x1b]R",
+    "\x1b#8",
+    "\x1b%@",
+    "\x1b%G",
+    "\x1b(B",
+    "\x0e",
+    "\x00",
+    "\x1b[1\x18",
+    "\x9b2J",
+)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_restored_parser_carries_on_the_same(seed):
+    data = random_corpus(seed, 200, PIECES).encode("utf-8")
+    rng = random.Random(seed)
+    split = rng.randrange(len(data))
+    chunks = [data[offset : offset + 5] for offset in range(split, len(data), 5)]
+
+    original = Parser()
+    list(original.feed_bytes(data[:split]))
+    state = pickle.loads(pickle.dumps(original.snapshot()))
+
+    restored = Parser()
+    restored.restore(state)
+    assert restored.snapshot() == state
+    for chunk in chunks:
+        assert list(restored.feed_bytes(chunk)) == list(original.feed_bytes(chunk))
+    assert restored.snapshot() == original.snapshot()
+
+
+@pytest.mark.parametrize("max_osc_length", [None, 6])
+def test_restored_parser_carries_on_inside_an_osc(max_osc_length):
+    # ESCs inside an OSC are taken in pairs, so a split can leave one waiting for its character.
+    data = "\x1b]2;a\x1b\x1b\x1bxb\x1b\x1b\x1b\\c\x9d1;\x1b\x1bd\x07\x1b]R\x1b]P1\x1b]0;long title\x9c"
+    for split in range(len(data)):
+        original = Parser(max_osc_length=max_osc_length)
+        list(original.feed(data[:split]))
+        restored = Parser(max_osc_length=max_osc_length)
+        restored.restore(original.snapshot())
+        assert list(restored.feed(data[split:])) == list(original.feed(data[split:])), split
+
+
+def test_snapshot_of_a_partial_sequence():
+    parser = Parser()
+    list(parser.feed_bytes(b"ab\x1b[1;3"))
+    assert parser.snapshot() == ParserState(True, False, "\x1b[1;3", b"", 7)
+
+    list(parser.feed_bytes(b"\xc3"))
+    assert parser.snapshot().undecoded == b"\xc3"
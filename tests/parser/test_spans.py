@@ -0,0 +1,46 @@
+import sys
+
+from outta.elements import Span
+from outta.parser import Parser
+
+TEXT = "some text \x1b[1;31mred\x1b[0m\x1b]2;title\x07\r\n"
+
+
+def _parse(parser, *chunks):
+    result = []
+    for chunk in chunks:
+        result.extend(parser.feed(chunk))
+    return result
+
+
+def test_span_elements_match_copied_elements():
+    chunks = [TEXT[:14], TEXT[14:30], TEXT[30:]]
+    assert _parse(Parser(spans=True), *chunks) == _parse(Parser(), *chunks)
+
+
+def test_text_is_not_copied_until_read():
+    data = "".join(["hello", "\x1b[4C"])
+    element = next(iter(Parser(spans=True).feed(data)))
+
+    assert type(element._text) is Span
+    assert element._text.buffer is data
+    assert element.text == "hello"
+    assert type(element._text) is str
+
+
+def test_span_keeps_buffer_alive():
+    data = "".join(["x" * 100, "\x1b[4C"])
+    before = sys.getrefcount(data)
+    elements = list(Parser(spans=True).feed(data))
+    assert sys.getrefcount(data) == before + len(elements)
+
+
+def test_sequence_split_between_feeds_is_copied():
+    elements = _parse(Parser(spans=True), "\x1b[1", ";2H")
+    assert type(elements[0]._text) is str
+    assert elements[0].text == "\x1b[1;2H"
+
+
+def test_memoryview_input():
+    data = memoryview(TEXT.encode("utf-8"))
+    assert list(Parser(spans=True).feed_bytes(data)) == list(Parser().feed(TEXT))
@@ -0,0 +1,88 @@
+import pytest
+from outta.elements import (
+    CursorPosition,
+    Debug,
+    DisableUTF8Mode,
+    EnableUTF8Mode,
+    SelectGraphicRendition,
+    SetTitle,
+    SetTitleAndIconName,
+    Text,
+)
+from outta.parser import Parser
+from corpus import random_chunks, random_corpus
+
+PIECES = (
+    "text ",
+    "\r\n",
+    "\x1b[0m",
+    "\x1b[1;31m",
+    "\x1b[?25h",
+    "\x1b[12;40H",
+    "\x1b]0;both\x07",
+    "\x1b]2;title\x1b\\",
+    "\x1b]2;long title which the FSM has to take\x07",
+    "\x1b#8",
+    "\x1b%G",
+    "\x1b%@",
+    "\x1b(B",
+    "\x1b[1",
+    "\x00",
+    "\x18",
+    "é",
+)
+
+TYPE_SETS = (
+    {Text},
+    {SelectGraphicRendition},
+    {SetTitle, SetTitleAndIconName},
+    {CursorPosition, Debug},
+    {EnableUTF8Mode, DisableUTF8Mode, Text},
+    set(),
+)
+
+
+def _expected(chunks, types, feed="feed", **kwargs):
+    parser = Parser(**kwargs)
+    return [element for chunk in chunks for element in getattr(parser, feed)(chunk) if type(element) in types]
+
+
+@pytest.mark.parametrize("types", TYPE_SETS)
+@pytest.mark.parametrize("seed", range(5))
+def test_feed_produces_only_wanted_types(types, seed):
+    chunks = list(random_chunks(random_corpus(seed, 300, PIECES), seed))
+    parser = Parser(types=types)
+    actual = [element for chunk in chunks for element in parser.feed(chunk)]
+    assert actual == _expected(chunks, types)
+    assert [type(element) for element in actual] == [type(element) for element in _expected(chunks, types)]
+
+
+@pytest.mark.parametrize("types", TYPE_SETS)
+@pytest.mark.parametrize("seed", range(5))
+def test_feed_bytes_produces_only_wanted_types(types, seed):
+    chunks = list(random_chunks(random_corpus(seed, 300, PIECES).encode("utf-8"), seed))
+    parser = Parser(types=types)
+    actual = [element for chunk in chunks for element in parser.feed_bytes(chunk)]
+    assert actual == _expected(chunks, types, "feed_bytes")
+
+
+@pytest.mark.parametrize("kwargs", [{"cache_size": 4}, {"spans": True}, {"max_sequence_length": 8}])
+def test_options_are_combined_with_types(kwargs):
+    types = {SelectGraphicRendition, SetTitle, Debug}
+    chunks = list(random_chunks(random_corpus(1, 300, PIECES), 1))
+    parser = Parser(types=types, **kwargs)
+    actual = [element for chunk in chunks for element in parser.feed(chunk)]
+    assert actual == _expected(chunks, types, **kwargs)
+
+
+def test_feed_columnar_records_only_wanted_types():
+    text = random_corpus(2, 300, PIECES)
+    table = Parser(types={SelectGraphicRendition}).feed_columnar(text)
+    expected = [element for element in Parser().feed(text) if type(element) is SelectGraphicRendition]
+    assert list(table.elements(text)) == expected
+
+
+def test_charset_selection_still_changes_decoding():
+    parser = Parser(types={Text})
+    data = "\x1b%@é\x1b%Gé".encode("utf-8")
+    assert [element.text for element in parser.feed_bytes(data)] == ["Ã©", "é"]
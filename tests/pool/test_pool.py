@@ -0,0 +1,148 @@
+import pickle
+import random
+import time
+
+import pytest
+from outta.parser import Parser
+from outta.pool import MAX_SEQUENCE_LENGTH, ParserPool
+from corpus import random_chunks, random_corpus
+
+PIECES = (
+    "text ",
+    "café ",
+    "\r\n",
+    "\x1b[1;31m",
+    "\x1b[?25h",
+    "\x1b]2;title\x07",
+    "\x1b#8",
+    "\x1b%@",
+    "\x1b%G",
+    "\x1b(B",
+    "\x0e",
+    "\x1b[1\x18",
+    "\x9b2J",
+)
+
+
+def _interleaved(seed, sessions=5, count=300):
+    "Chunks of data for several sessions, each session's in order but mixed up with the others'."
+    rng = random.Random(seed)
+    chunks = {}
+    for session in range(sessions):
+        data = random_corpus(rng.random(), count, PIECES).encode("utf-8")
+        chunks[session] = list(random_chunks(data, rng.random(), 11))
+    order = [session for session, session_chunks in chunks.items() for _ in session_chunks]
+    rng.shuffle(order)
+    return [(session, chunks[session].pop(0)) for session in order]
+
+
+def _separately(chunks):
+    parsers = {}
+    results = {}
+    for session, chunk in chunks:
+        parser = parsers.setdefault(session, Parser())
+        results.setdefault(session, []).extend(parser.feed_bytes(chunk))
+    return results
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_sessions_are_parsed_as_if_separately(seed):
+    chunks = _interleaved(seed)
+    pool = ParserPool()
+    results = {}
+    for session, chunk in chunks:
+        results.setdefault(session, []).extend(pool.feed_bytes(session, chunk))
+
+    expected = _separately(chunks)
+    assert results == expected
+    for session in expected:
+        assert [type(element) for element in results[session]] == [type(element) for element in expected[session]]
+
+
+def test_feed_str():
+    pool = ParserPool()
+    assert pool.feed("a", "\x1b[1;") == []
+    assert [element.text for element in pool.feed("b", "x\x1b[2J")] == ["x", "\x1b[2J"]
+    assert [element.text for element in pool.feed("a", "31mz")] == ["\x1b[1;31m", "z"]
+
+
+def test_evicted_sessions_can_be_added_back():
+    chunks = _interleaved(1)
+    pool = ParserPool()
+    results = {}
+    for index, (session, chunk) in enumerate(chunks):
+        results.setdefault(session, []).extend(pool.feed_bytes(session, chunk))
+        if index % 7 == 0:
+            state = pickle.loads(pickle.dumps(pool.evict(session)))
+            assert session not in pool
+            pool.add(session, state)
+
+    assert results == _separately(chunks)
+
+
+def test_max_sessions_evicts_the_least_recently_fed():
+    evicted = []
+    pool = ParserPool(max_sessions=2, on_evict=lambda session, state: evicted.append((session, state.buffer)))
+    pool.feed("a", "\x1b[")
+    pool.feed("b", "x")
+    pool.feed("a", "1")
+    pool.feed("c", "y")
+
+    assert list(pool) == ["a", "c"]
+    assert evicted == [("b", "")]
+
+    pool.add("b")
+    assert list(pool) == ["c", "b"]
+    assert evicted[-1] == ("a", "\x1b[1")
+
+
+def test_evict_idle():
+    pool = ParserPool()
+    for session in "abc":
+        pool.feed(session, "x")
+    pool.feed("a", "x")
+
+    assert [session for session, _ in pool.evict_idle(2)] == ["b", "c"]
+    assert list(pool) == ["a"]
+    assert pool.evict_idle(5) and len(pool) == 0
+
+
+@pytest.mark.parametrize("sessions", [1, 2])
+def test_long_split_osc_takes_linear_time(sessions):
+    # Each feed used to restore the session by sending the whole sequence so far through the FSM again.
+    data = "\x1b]52;c;" + "YWJj\x1b\x1b" * 40_000 + "\x07"
+    chunks = [data[offset : offset + 1024] for offset in range(0, len(data), 1024)]
+    parsers = [Parser() for _ in range(sessions)]
+    timings = []
+    for feed in (lambda session, chunk: parsers[session].feed(chunk), ParserPool(Parser()).feed):
+        started = time.perf_counter()
+        results = [[] for _ in range(sessions)]
+        for chunk in chunks:
+            for session, result in enumerate(results):
+                result.extend(feed(session, chunk))
+        timings.append(time.perf_counter() - started)
+
+    assert results[0] == list(Parser().feed(data))
+    assert timings[1] < 5 * timings[0] + 0.1
+
+
+def test_default_max_sequence_length():
+    pool = ParserPool()
+    assert pool.parser.max_sequence_length == MAX_SEQUENCE_LENGTH
+    element = pool.feed(1, "\x1b]2;" + "x" * MAX_SEQUENCE_LENGTH)[0]
+    assert type(element).__name__ == "Debug" and len(element.text) == MAX_SEQUENCE_LENGTH
+
+
+def test_options_come_from_the_parser():
+    pool = ParserPool(Parser(max_sequence_length=4))
+    assert [type(element).__name__ for element in pool.feed(1, "\x1b]2;title\x07")] == ["Debug", "Text", "Bell"]
+
+
+def test_state_after_an_exception():
+    pool = ParserPool()
+    pool.feed("a", "x")
+    pool.parser._parser = None
+    with pytest.raises(Exception):
+        pool.feed("a", "\x1b[1")
+    assert pool.state("a").buffer == ""
+    assert [element.text for element in pool.feed("a", "\x1b[1m")] == ["\x1b[1m"]
@@ -0,0 +1,97 @@
+import pytest
+from outta import elements
+from outta.parser import Parser
+from outta.scan import HAVE_NUMPY, Scanner, control_positions
+from corpus import random_chunks, random_corpus
+
+PIECES = (
+    "text ",
+    "a longer line of log output ",
+    "café ",
+    "│ 表示 ─┼─ ",
+    "\r\n",
+    "\n",
+    "\t",
+    "\x07",
+    "\x08",
+    "\x0b",
+    "\x1b[0m",
+    "\x1b[1;31m",
+    "\x1b[?25h",
+    "\x1b]2;title\x07",
+    "\x1b]0;title\x1b\\",
+    "\x1b#8",
+    "\x1b%G",
+    "\x1b(B",
+    "\x0e",
+    "\x00",
+    "\x7f",
+    "\x1b[1\x18",
+    "\x9b2J",
+    "\x1b[1\r2H",
+    "\x1b",
+)
+
+NUMPY = [False, pytest.param(True, marks=pytest.mark.skipif(not HAVE_NUMPY, reason="NumPy isn't installed"))]
+
+OPTIONS = [
+    {},
+    {"spans": True},
+    {"cache_size": 16},
+    {"types": {elements.Text, elements.LineFeed, elements.SetTitle}},
+    {"types": {elements.SelectGraphicRendition}},
+    {"max_sequence_length": 6},
+]
+
+
+@pytest.mark.parametrize("use_numpy", NUMPY)
+@pytest.mark.parametrize("options", OPTIONS)
+@pytest.mark.parametrize("seed", range(10))
+def test_same_as_parser(seed, options, use_numpy):
+    data = random_corpus(seed, 400, PIECES)
+    parser = Parser(**options)
+    expected = [element for chunk in random_chunks(data, seed, 199) for element in parser.feed(chunk)]
+    scanner = Scanner(Parser(**options), use_numpy=use_numpy)
+    actual = [element for chunk in random_chunks(data, seed, 199) for element in scanner.feed(chunk)]
+
+    assert [(type(element), element.text) for element in actual] == [
+        (type(element), element.text) for element in expected
+    ]
+    assert actual == expected
+    assert scanner.parser.snapshot() == parser.snapshot()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_feed_bytes(seed):
+    data = random_corpus(seed, 400, PIECES).encode("utf-8") + b"\x1b%@caf\xe9\x1b%G caf\xc3\xa9"
+    parser = Parser()
+    expected = [element for chunk in random_chunks(data, seed, 199) for element in parser.feed_bytes(chunk)]
+    scanner = Scanner()
+    actual = [element for chunk in random_chunks(data, seed, 199) for element in scanner.feed_bytes(chunk)]
+    assert [(type(element), element.text) for element in actual] == [
+        (type(element), element.text) for element in expected
+    ]
+
+
+@pytest.mark.parametrize("use_numpy", NUMPY)
+def test_control_positions(use_numpy):
+    data = "ab\ncd\x1b[0m\x9b1m\x00é\x7f\r"
+    assert control_positions(data, use_numpy) == [2, 5, 9, 12, 14, 15]
+    assert control_positions("plain", use_numpy) == []
+    assert control_positions("€\x1b[0m\n", use_numpy) == [1, 5]
+    # Characters whose low byte is that of a control aren't controls.
+    assert control_positions("\u011b\u019b\u0a0a─\U0001f600\udcff\x1b", use_numpy) == [6]
+
+
+@pytest.mark.parametrize(
+    "chunks", [[b"ab\x1b", b"%@caf\xe9"], [b"ab\x1b%", b"@caf\xe9"], [b"\x1b%@caf\xe9\x1b", b"%G caf\xc3\xa9"]]
+)
+def test_feed_bytes_split_select_charset(chunks):
+    parser = Parser()
+    expected = [element for chunk in chunks for element in parser.feed_bytes(chunk)]
+    scanner = Scanner()
+    actual = [element for chunk in chunks for element in scanner.feed_bytes(chunk)]
+    assert [(type(element), element.text) for element in actual] == [
+        (type(element), element.text) for element in expected
+    ]
+    assert scanner.parser.use_utf8 == parser.use_utf8
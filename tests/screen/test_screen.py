@@ -0,0 +1,97 @@
+import pyte
+import pytest
+from outta import sgr
+from outta.parser import Parser
+from outta.screen import Screen
+from corpus import random_corpus
+
+PIECES = (
+    "text ",
+    "a longer run of text which wraps",
+    "\r\n",
+    "\n",
+    "\r",
+    "\b",
+    "\t",
+    "\x1b[K",
+    "\x1b[1K",
+    "\x1b[2K",
+    "\x1b[J",
+    "\x1b[1J",
+    "\x1b[2J",
+    "\x1b[H",
+    "\x1b[3;5H",
+    "\x1b[9;30H",
+    "\x1b[2A",
+    "\x1b[B",
+    "\x1b[3C",
+    "\x1b[D",
+    "\x1b[2E",
+    "\x1b[F",
+    "\x1b[7G",
+    "\x1b[4d",
+    "\x1b[2L",
+    "\x1b[M",
+    "\x1b[3@",
+    "\x1b[2P",
+    "\x1b[4X",
+    "\x1bD",
+    "\x1bM",
+    "\x1b7",
+    "\x1b8",
+    "\x1b[1;31m",
+    "\x1b[0m",
+)
+
+
+def _pyte_display(text, columns, lines):
+    screen = pyte.Screen(columns, lines)
+    pyte.Stream(screen).feed(text)
+    return screen.display
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_display_matches_pyte(seed):
+    text = random_corpus(seed, 200, PIECES)
+    screen = Screen(20, 10)
+    screen.feed(Parser().feed(text))
+    assert screen.display == _pyte_display(text, 20, 10)
+
+
+def test_margins_match_pyte():
+    text = "".join(f"line {number}\r\n" for number in range(12))
+    text += "\x1b[3;6r\x1b[5;1Hscrolled\n\n\x1b[4;1H\x1b[2L\x1b[M"
+    screen = Screen(20, 8)
+    screen.feed(Parser().feed(text))
+    assert screen.display == _pyte_display(text, 20, 8)
+
+
+def test_changes_are_only_the_touched_rows():
+    screen = Screen(10, 5)
+    screen.changes()
+    screen.feed(Parser().feed("\x1b[2;1Hhello\x1b[4;1H\x1b[K"))
+    changes = screen.changes()
+    assert {y: text for y, (text, _) in changes.items()} == {1: "hello     ", 3: "          "}
+    assert screen.changes() == {}
+
+
+def test_scrolling_marks_the_scrolled_rows():
+    screen = Screen(10, 5)
+    screen.feed(Parser().feed("\x1b[2;4r"))
+    screen.changes()
+    screen.feed(Parser().feed("\x1b[4;1H\n"))
+    assert list(screen.changes()) == [1, 2, 3]
+
+
+def test_styles_are_recorded_per_cell():
+    screen = Screen(10, 2)
+    screen.feed(Parser().feed("a\x1b[1mb\x1b[31mc\x1b[0md\x1b[1;38;5;200me"))
+    styles = [sgr.describe(style) for style in screen.changes()[0][1][:5]]
+    assert styles == ["", "bold", "bold, fg=1", "", "bold, fg=200"]
+
+
+def test_changes_are_copies():
+    screen = Screen(10, 2)
+    text, styles = screen.changes()[0]
+    screen.feed(Parser().feed("\x1b[1mx"))
+    assert (text, list(styles)) == (" " * 10, [0] * 10)
@@ -0,0 +1,70 @@
+import pytest
+from outta import sgr
+
+
+@pytest.mark.parametrize(
+    "parameters, description",
+    [
+        ((0,), ""),
+        ((), ""),
+        ((1,), "bold"),
+        ((1, 2, 3, 4, 5, 7, 8, 9), "bold, faint, italic, underline, blink, reverse, conceal, strikethrough"),
+        ((1, 22), ""),
+        ((31,), "fg=1"),
+        ((97,), "fg=15"),
+        ((44,), "bg=4"),
+        ((107,), "bg=15"),
+        ((38, 5, 200), "fg=200"),
+        ((48, 5, 9999), "bg=255"),
+        ((38, 2, 1, 2, 3), "fg=(1, 2, 3)"),
+        ((48, 2, 10, 20, 30, 1), "bold, bg=(10, 20, 30)"),
+        ((31, 39), ""),
+        ((44, 49), ""),
+        ((1, 0, 4), "underline"),
+        ((38, 2, 1), ""),
+        ((38, 7, 4), ""),
+        ((1, 38), "bold"),
+        ((1, 999), "bold"),
+    ],
+)
+def test_decode(parameters, description):
+    assert sgr.describe(sgr.SGRDecoder().decode(parameters)) == description
+
+
+def test_colors():
+    style = sgr.SGRDecoder().decode((31, 48, 2, 0, 0, 128, 1))
+    assert sgr.foreground(style) == 1
+    assert sgr.background(style) == (0, 0, 128)
+    assert sgr.attributes(style) == sgr.BOLD
+    assert sgr.foreground(sgr.DEFAULT) is None
+
+
+def test_apply_keeps_what_is_not_changed():
+    decoder = sgr.SGRDecoder()
+    decoder.apply((1, 31))
+    assert sgr.describe(decoder.apply((4, 44))) == "bold, underline, fg=1, bg=4"
+    assert sgr.describe(decoder.apply((22, 39))) == "underline, bg=4"
+    assert decoder.apply((0,)) == sgr.DEFAULT
+
+
+def test_style_after_leaves_the_current_style_alone():
+    decoder = sgr.SGRDecoder()
+    bold = decoder.style_after(sgr.DEFAULT, (1,))
+    assert sgr.describe(decoder.style_after(bold, (32,))) == "bold, fg=2"
+    assert decoder.style == sgr.DEFAULT
+
+
+@pytest.mark.parametrize("first", [(1,), (31, 4), (38, 5, 3), (0,), (22, 48, 2, 1, 2, 3)])
+@pytest.mark.parametrize("second", [(2,), (39, 24), (48, 5, 3), (0, 1), (38, 2, 4, 5, 6)])
+def test_transforms_compose(first, second):
+    decoder = sgr.SGRDecoder()
+    style = decoder.decode((1, 3, 35, 46))
+    assert decoder.style_after(decoder.style_after(style, first), second) == decoder.style_after(style, first + second)
+
+
+def test_memo_is_bounded():
+    decoder = sgr.SGRDecoder(cache_size=2)
+    for parameters in [(1,), (2,), (3,), (4,)]:
+        decoder.decode(parameters)
+    assert len(decoder._transforms) <= 2
+    assert sgr.describe(decoder.decode((1,))) == "bold"
@@ -0,0 +1,47 @@
+from collections import Counter
+
+from outta.elements import SelectGraphicRendition, SetTitle, Text
+from outta.parser import Parser
+from outta.stats import Stats, TopCounter
+
+TEXT = "hi \x1b[1mbold\x1b[0m\r\n\x1b[1mx\x1b[0m\x1b]2;tïtle\x07"
+
+
+def test_counts_match_elements():
+    stats = Stats()
+    parser = Parser()
+    data = TEXT.encode("utf-8")
+    elements = []
+    for index in range(0, len(data), 5):
+        stats.feed_bytes(data[index : index + 5])
+        elements.extend(parser.feed_bytes(data[index : index + 5]))
+
+    assert stats.counts == Counter(type(e) for e in elements)
+    assert stats.counts[SelectGraphicRendition] == 4
+    assert stats.lengths[SetTitle] == len("\x1b]2;tïtle\x07")
+    assert stats.input_bytes == len(data)
+
+
+def test_text_and_control_lengths():
+    stats = Stats()
+    stats.feed_bytes(TEXT.encode("utf-8"))
+
+    assert stats.text_length == sum(len(e.text) for e in Parser().feed(TEXT) if type(e) is Text)
+    assert stats.text_length + stats.control_length == len(TEXT)
+
+
+def test_top_sequences():
+    stats = Stats()
+    stats.feed_bytes(TEXT.encode("utf-8"))
+
+    assert stats.sequences.most_common(2) == [("\x1b[1m", 2), ("\x1b[0m", 2)]
+
+
+def test_top_counter_is_bounded():
+    counter = TopCounter(capacity=2)
+    for item in range(100):
+        counter.add(item)
+        counter.add("frequent")
+
+    assert len(counter._counts) <= 4
+    assert counter.most_common(1) == [("frequent", 100)]
@@ -0,0 +1,131 @@
+import io
+
+import pytest
+from outta import elements
+from outta.parser import Parser
+from outta.strip import WHITESPACE, Stripper, strip, strip_stream
+from corpus import random_chunks, random_corpus
+
+PIECES = (
+    "plain text",
+    " ",
+    "\r\n",
+    "\t",
+    "\x0b",
+    "\x0c",
+    "\x07",
+    "\x08",
+    "\x0e",
+    "\x0f",
+    "\x00",
+    "\x7f",
+    "\x18",
+    "\x1b[1;31m",
+    "\x1b[0m",
+    "\x1b[1\x18m",
+    "\x1b[2\x1a",
+    "\x1b[1\n2H",
+    "\x1b]2;title\x07",
+    "\x1b]2;esc \x1bx inside\x07",
+    "\x1bE",
+    "\x1b#8",
+    "\x1b%@",
+    "\x1b%G",
+    "\x1b(B",
+    "\x1b[",
+    "\x9b2J",
+    "caf\xe9",
+)
+
+
+# Pieces which are each plain text or a complete, well-formed sequence.
+CLEAN_PIECES = (
+    "plain text",
+    " ",
+    "\r\n",
+    "\t",
+    "\x0b",
+    "\x0c",
+    "\x07",
+    "\x08",
+    "\x18",
+    "\x1b[1;31m",
+    "\x1b[0m",
+    "\x1b]2;title\x07",
+    "\x1bE",
+    "\x1b#8",
+    "\x9b2J",
+    "caf\xe9",
+)
+
+
+def _expected(element_stream, substitute=""):
+    "Strip by going through the elements."
+    pieces = []
+    for element in element_stream:
+        if type(element) is elements.Text:
+            if not element.parameters:
+                pieces.append(element.text)
+            elif element.parameters[0] in "\x18\x1a":
+                pieces.append(substitute)
+            else:
+                pieces.append(element.parameters[0])
+        elif type(element) in WHITESPACE:
+            pieces.append(WHITESPACE[type(element)])
+    return "".join(pieces)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_strip_matches_elements(seed):
+    text = random_corpus(seed, 300, PIECES)
+    assert strip(text, substitute="?") == _expected(Parser().feed(text), substitute="?")
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_clean_strip_matches_elements(seed):
+    text = random_corpus(seed, 300, CLEAN_PIECES)
+    stripper = Stripper()
+    stripped = stripper._line_feed_pattern.sub("\n", stripper._sequence_pattern.sub("", text))
+    assert stripper._leftover_pattern.search(stripped) is None
+    assert stripper.feed(text) == _expected(Parser().feed(text))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_chunked_strip_matches_elements(seed):
+    text = random_corpus(seed, 300, PIECES)
+    stripper = Stripper()
+    actual = "".join(stripper.feed(chunk) for chunk in random_chunks(text, seed, 64))
+    assert actual == _expected(Parser().feed(text))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_chunked_bytes_strip_matches_elements(seed):
+    data = random_corpus(seed, 300, PIECES).encode("utf-8")
+    stripper = Stripper()
+    actual = "".join(stripper.feed_bytes(chunk) for chunk in random_chunks(data, seed, 64))
+
+    parser = Parser()
+    expected = _expected(element for chunk in random_chunks(data, seed, 64) for element in parser.feed_bytes(chunk))
+    assert actual == expected
+
+
+def test_strip():
+    assert strip("\x1b[1mbold\x1b[0m\tand\x1b]2;title\x07 \x1bEplain\x0c") == "bold\tand \nplain\n"
+
+
+def test_cancelled_sequence():
+    assert strip("a\x1b[1\x18b", substitute="�") == "a�b"
+    assert strip("a\x1b[1\x18b") == "ab"
+
+
+def test_whitespace_can_be_dropped():
+    assert strip("a\r\nb\tc", whitespace={}) == "abc"
+
+
+def test_strip_stream():
+    source = io.BytesIO("\x1b[1mcafé\x1b[0m\n".encode("utf-8") * 1000)
+    destination = io.StringIO()
+
+    strip_stream(source, destination, chunk_size=7)
+
+    assert destination.getvalue() == "café\n" * 1000
@@ -0,0 +1,169 @@
+import io
+import random
+
+import pytest
+from outta import elements
+from outta.parser import Parser
+from outta.transform import Transform, _nearest_indexed_color, downgrade_truecolor, transform_stream
+from corpus import random_chunks, random_corpus
+
+PIECES = (
+    "text ",
+    "café ",
+    "\r\n",
+    "\x1b[0m",
+    "\x1b[1;31m",
+    "\x1b[38;2;255;0;0m",
+    "\x1b[6n",
+    "\x1b]0;host\x07",
+    "\x1b]2;a longer title on host\x1b\\",
+    "\x1b]1;icon\x07",
+    "\x1b#8",
+    "\x1b%G",
+    "\x1b(B",
+    "\x1b[1\x18",
+    "\x00",
+)
+
+RULES = {
+    elements.SetTitle: "",
+    elements.SetIconName: "",
+    elements.ReportDeviceStatus: "",
+    elements.SelectGraphicRendition: lambda element: f"<{','.join(map(str, element.parameters))}>",
+    elements.Debug: "?",
+}
+
+
+def _expected(data):
+    "What the rules do, the slow way round, including the text of an unfinished sequence at the end."
+    parser = Parser()
+    pieces = []
+    for element in parser.feed(data):
+        rule = next((RULES[base] for base in type(element).__mro__ if base in RULES), None)
+        if rule is None:
+            pieces.append(element.text)
+        elif isinstance(rule, str):
+            pieces.append(rule)
+        else:
+            pieces.append(rule(element))
+    return "".join(pieces) + parser._buffer
+
+
+def _transform():
+    transform = Transform()
+    for element_type, rule in RULES.items():
+        if isinstance(rule, str):
+            transform.replace(element_type, rule)
+        else:
+            transform.map(element_type, rule)
+    return transform
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 100000])
+def test_transform_in_chunks(seed, chunk_size):
+    data = random_corpus(seed, 200, PIECES)
+    transform = _transform()
+    output = "".join(transform.feed(data[index : index + chunk_size]) for index in range(0, len(data), chunk_size))
+    output += transform.flush()
+    assert output == _expected(data)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_transform_bytes(seed):
+    data = random_corpus(seed, 200, PIECES)
+    encoded = data.encode("utf-8")
+    transform = _transform()
+    output = b"".join(transform.feed_bytes(encoded[index : index + 5]) for index in range(0, len(encoded), 5))
+    assert output + transform.flush_bytes() == _expected(data).encode("utf-8")
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_bytes_are_unchanged_without_rules(seed):
+    data = bytes(random.Random(seed).randrange(256) for _ in range(2000))
+    transform = Transform()
+    output = b"".join(transform.feed_bytes(chunk) for chunk in random_chunks(data, seed))
+    assert output + transform.flush_bytes() == data
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 100])
+def test_invalid_utf8_is_unchanged(chunk_size):
+    data = b"a\xff\xfe\x1b]2;t\x07b\xc3\x1b]2;\xe9\x07\xe2\x82"
+    transform = Transform().drop(elements.SetTitle)
+    chunks = (data[index : index + chunk_size] for index in range(0, len(data), chunk_size))
+    output = b"".join(transform.feed_bytes(chunk) for chunk in chunks)
+    assert output + transform.flush_bytes() == b"a\xff\xfeb\xc3\xe2\x82"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 100])
+def test_latin1_is_unchanged(chunk_size):
+    data = b"caf\xc3\xa9\x1b%@caf\xe9\x1b]2;t\x07\xff\x1b%Gcaf\xc3\xa9\x1b]2;t\x07"
+    transform = Transform().drop(elements.SetTitle)
+    chunks = (data[index : index + chunk_size] for index in range(0, len(data), chunk_size))
+    output = b"".join(transform.feed_bytes(chunk) for chunk in chunks)
+    assert output + transform.flush_bytes() == b"caf\xc3\xa9\x1b%@caf\xe9\xff\x1b%Gcaf\xc3\xa9"
+
+
+def test_latin1_replacement_is_encoded():
+    transform = Transform().replace(elements.SetTitle, "\xe9\u20ac")
+    assert transform.feed_bytes(b"\x1b%@\x1b]2;t\x07") == b"\x1b%@\xe9?"
+
+
+def test_nothing_is_changed_without_rules():
+    data = "".join(PIECES)
+    transform = Transform()
+    assert transform.feed(data) + transform.flush() == data
+
+
+def test_drop_applies_to_subclasses():
+    transform = Transform().drop(elements.SetTitle)
+    assert transform.feed("a\x1b]2;t\x07b\x1b]0;t\x07c\x1b]1;t\x07d") == "abc\x1b]1;t\x07d"
+
+
+def test_subclass_rules_take_precedence():
+    transform = Transform().drop(elements.SetTitle).replace(elements.SetTitleAndIconName, "!")
+    assert transform.feed("\x1b]2;t\x07\x1b]0;t\x07") == "!"
+
+
+def test_map_can_drop():
+    transform = Transform().map(elements.CursorUp, lambda element: None if element.parameters[0] > 1 else element.text)
+    assert transform.feed("\x1b[1A\x1b[2A") == "\x1b[1A"
+
+
+def test_unfinished_sequence_is_flushed():
+    transform = Transform().drop(elements.SetTitle)
+    assert transform.feed("a\x1b]2;ti") == "a"
+    assert transform.feed("tle") == ""
+    assert transform.flush() == "\x1b]2;title"
+
+
+def test_transform_stream():
+    source = io.BytesIO(b"a\x1b]2;host\x07b\x1b[6nc\x1b]2;x")
+    destination = io.BytesIO()
+    transform = Transform().drop(elements.SetTitle, elements.ReportDeviceStatus)
+    transform_stream(transform, source, destination, chunk_size=3)
+    assert destination.getvalue() == b"abc\x1b]2;x"
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("\x1b[38;2;255;0;0m", "\x1b[38;5;196m"),
+        ("\x1b[1;48;2;0;0;0;4m", "\x1b[1;48;5;16;4m"),
+        ("\x1b[38;2;128;128;128m", "\x1b[38;5;244m"),
+        ("\x1b[38;5;2;32m", "\x1b[38;5;2;32m"),
+        ("\x1b[2;31m", "\x1b[2;31m"),
+        ("\x9b38;2;0;0;255m", "\x9b38;5;21m"),
+    ],
+)
+def test_downgrade_truecolor(text, expected):
+    (element,) = Parser().feed(text)
+    assert downgrade_truecolor(element) == expected
+
+
+def test_nearest_indexed_color_of_indexed_colors():
+    levels = (0, 95, 135, 175, 215, 255)
+    cube = [(red, green, blue) for red in levels for green in levels for blue in levels]
+    assert [_nearest_indexed_color(*rgb) for rgb in cube] == list(range(16, 232))
+    grays = [(8 + 10 * gray,) * 3 for gray in range(24)]
+    assert [_nearest_indexed_color(*rgb) for rgb in grays] == list(range(232, 256))